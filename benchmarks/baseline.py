@@ -0,0 +1,80 @@
+# STANDARD LIBRARY IMPORTS
+import os
+import json
+
+# Phases / operations faster than this (in ms) are too noisy to flag as regressions
+NOISE_FLOOR_MS = 5
+# Results keys describing the fixture, baselines of other fixture sizes aren't comparable
+FIXTURE_KEYS = ["years", "users"]
+
+
+def save_baseline(baseline_path: str, results: dict) -> None:
+    """
+    Stores benchmark results as the new baseline.
+
+    Args:
+        baseline_path (str): Path of the baseline json file.
+        results (dict): Benchmark results with a 'median_ms' mapping.
+
+    Returns:
+        None
+    """
+    os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+    with open(baseline_path, "w") as f:
+        json.dump(results, f, indent=4)
+
+
+def compare_to_baseline(baseline_path: str, results: dict, tolerance: float) -> list:
+    """
+    Compares benchmark results to the stored baseline.
+
+    Args:
+        baseline_path (str): Path of the baseline json file.
+        results (dict): Benchmark results with a 'median_ms' mapping.
+        tolerance (float): Allowed relative slowdown, e.g. 0.25 for 25%.
+
+    Returns:
+        list: Descriptions of all regressions, None if there is no baseline for the results' fixture.
+    """
+    if not os.path.exists(baseline_path):
+        return None
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+    if any(baseline.get(key) != results.get(key) for key in FIXTURE_KEYS):
+        return None
+    return [
+        f"{name}: {milliseconds:.1f}ms (baseline {baseline['median_ms'][name]:.1f}ms)"
+        for name, milliseconds in results["median_ms"].items()
+        if name in baseline["median_ms"]
+        and milliseconds > baseline["median_ms"][name] * (1 + tolerance)
+        and milliseconds - baseline["median_ms"][name] > NOISE_FLOOR_MS
+    ]
+
+
+def check_baseline(
+    baseline_path: str, results: dict, tolerance: float, require_baseline: bool
+) -> int:
+    """
+    Compares benchmark results to the stored baseline and prints regressions or a missing baseline.
+
+    Args:
+        baseline_path (str): Path of the baseline json file.
+        results (dict): Benchmark results with a 'median_ms' mapping.
+        tolerance (float): Allowed relative slowdown, e.g. 0.25 for 25%.
+        require_baseline (bool): Whether a missing baseline fails the check.
+
+    Returns:
+        int: Process exit code (1 on a regression, or on a missing baseline if it is required).
+    """
+    regressions = compare_to_baseline(baseline_path, results, tolerance)
+    if regressions is None:
+        fixture = ", ".join(
+            f"{key} {results[key]}" for key in FIXTURE_KEYS if key in results
+        )
+        print(
+            f"⚠ No baseline recorded for this fixture ({fixture}) in {baseline_path}, run with --save-baseline."
+        )
+        return 1 if require_baseline else 0
+    for regression in regressions:
+        print(f"✗ Regression in {regression}")
+    return 1 if len(regressions) > 0 else 0
@@ -0,0 +1,102 @@
+# STANDARD LIBRARY IMPORTS
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+# Make the repository root importable when run as a script
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_PATH)
+
+# BENCHMARK IMPORTS
+from benchmarks.generate import write_fixture_config, fill_fixture_database
+from benchmarks.baseline import save_baseline, check_baseline
+
+BASELINE_PATH = os.path.join(ROOT_PATH, "benchmarks", "baselines", "cold_start.json")
+
+
+def profile_startup(res_path: str) -> dict:
+    """
+    Runs one cold start of main.py in --profile-startup mode against the fixture.
+
+    Args:
+        res_path (str): Fixture resource directory.
+
+    Returns:
+        dict: Per-phase and total wall times in milliseconds.
+    """
+    output = subprocess.run(
+        [
+            sys.executable,
+            os.path.join(ROOT_PATH, "main.py"),
+            "--profile-startup",
+            "--json",
+        ],
+        env={**os.environ, "TEMPS_RES_PATH": res_path},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    # The report is the last line, preceded by the rendered startup output
+    report = output.strip().splitlines()[-1]
+    return json.loads(report[report.index("{") :])
+
+
+def main() -> int:
+    """
+    Measures cold-start latency against a large fixture database and compares it to the stored baseline.
+
+    Args:
+        None
+
+    Returns:
+        int: Process exit code (1 if a regression was detected, see check_baseline).
+    """
+    parser = argparse.ArgumentParser(description="temps cold-start benchmark")
+    parser.add_argument("--years", type=int, default=20, help="Years of history.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold starts.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative slowdown against the baseline (default: 0.25).",
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Store results as new baseline."
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Also fail (exit 1) if no baseline is recorded for this fixture.",
+    )
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as res_path:
+        # First start creates the schema and imports the fixture user, then the fixture is filled
+        start_date = write_fixture_config(res_path, args.years)
+        profile_startup(res_path)
+        entries = fill_fixture_database(res_path, start_date)
+        runs = [profile_startup(res_path) for _ in range(args.runs)]
+    results = {
+        "years": args.years,
+        "entries": entries,
+        "runs": args.runs,
+        "median_ms": {
+            phase: round(statistics.median(run["phases_ms"][phase] for run in runs), 3)
+            for phase in runs[0]["phases_ms"]
+        },
+    }
+    results["median_ms"]["Total"] = round(
+        statistics.median(run["total_ms"] for run in runs), 3
+    )
+    print(json.dumps(results, indent=4))
+    if args.save_baseline:
+        save_baseline(BASELINE_PATH, results)
+        return 0
+    return check_baseline(BASELINE_PATH, results, args.tolerance, args.check)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+# STANDARD LIBRARY IMPORTS
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+
+# Make the repository root importable when run as a script
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_PATH)
+
+# UTIL IMPORTS
+from utils.config import DB_FILE_NAME
+from utils.db import DatabaseSession
+from utils.queries import get_entry_dates, get_entries, get_entry
+from utils.calendar_table import get_missing_dates
+from utils.stats import get_stats
+from utils.rollups import get_balance
+from utils.entries import insert_entry, update_entry
+from utils.writer import EntryWriter
+from utils.export import build_summary, export_timesheet
+from utils.user_config import load_config
+
+# BENCHMARK IMPORTS
+from benchmarks.generate import build_fixture_database
+from benchmarks.baseline import save_baseline, check_baseline
+
+BASELINE_PATH = os.path.join(ROOT_PATH, "benchmarks", "baselines", "core.json")
+
+
+def time_call(function: callable) -> float:
+    """
+    Calls a function once and measures its wall time.
+
+    Args:
+        function (callable): Function without arguments.
+
+    Returns:
+        float: Wall time in milliseconds.
+    """
+    started_at = time.perf_counter()
+    function()
+    return (time.perf_counter() - started_at) * 1000
+
+
+def benchmark_operations(res_path: str, user_ids: list, runs: int) -> dict:
+    """
+    Times the non-interactive cores of the menu actions against a fixture database.
+    Reads, stats and exports use the user in the middle of the fixture; writes spread
+    over users so that every add hits a date that is still missing.
+
+    Args:
+        res_path (str): Fixture resource directory.
+        user_ids (list): Ids of the fixture users.
+        runs (int): Number of runs per operation.
+
+    Returns:
+        dict: Wall times in milliseconds per operation, one per run.
+    """
+    session = DatabaseSession(os.path.join(res_path, DB_FILE_NAME))
+    connection = session.cursor()
+    writer = EntryWriter(session)
+    user_id = user_ids[len(user_ids) // 2]
+    config = load_config(connection, user_id)
+    # Missing (user, date) pairs to add, existing dates to edit
+    add_targets = []
+    for target_user_id in user_ids:
+        add_targets += [
+            (target_user_id, date)
+            for date in get_missing_dates(connection, target_user_id)
+        ]
+        if len(add_targets) >= runs:
+            break
+    edit_dates = [
+        row[0]
+        for row in connection.execute(
+            "SELECT strftime(date, '%Y-%m-%d') FROM times WHERE user_id = ? ORDER BY date DESC LIMIT ?;",
+            [user_id, runs],
+        ).fetchall()
+    ]
+    timings = {
+        "entry_dates": [],
+        "entry_lookup": [],
+        "entries_window": [],
+        "missing_dates": [],
+        "stats": [],
+        "add_entry": [],
+        "edit_entry": [],
+        "queued_edit_entry": [],
+        "export_timesheet": [],
+    }
+    for run in range(runs):
+        # ENTRIES (entry pickers of view_entry / edit_entry) --- --- --- --- ---
+        timings["entry_dates"].append(
+            time_call(lambda: get_entry_dates(connection, user_id))
+        )
+        timings["entry_lookup"].append(
+            time_call(
+                lambda: get_entry(
+                    connection, user_id, edit_dates[run % len(edit_dates)]
+                )
+            )
+        )
+        timings["entries_window"].append(
+            time_call(lambda: get_entries(connection, user_id, limit=20, offset=20))
+        )
+        # MISSING DATES --- --- --- --- ---
+        timings["missing_dates"].append(
+            time_call(lambda: get_missing_dates(connection, user_id))
+        )
+        # STATS (show_stats) --- --- --- --- ---
+        timings["stats"].append(
+            time_call(
+                lambda: (
+                    get_stats(connection, user_id),
+                    get_balance(connection, user_id),
+                )
+            )
+        )
+        # WRITES (add_entry / edit_entry) --- --- --- --- ---
+        if run < len(add_targets):
+            target_user_id, date = add_targets[run]
+            target_config = load_config(connection, target_user_id)
+            timings["add_entry"].append(
+                time_call(
+                    lambda: insert_entry(
+                        connection, date, "Vacation", None, None, target_config
+                    )
+                )
+            )
+        timings["edit_entry"].append(
+            time_call(
+                lambda: update_entry(
+                    connection,
+                    user_id,
+                    edit_dates[run % len(edit_dates)],
+                    "Work" if run % 2 == 0 else "Sick Leave",
+                    "08:00",
+                    "17:00",
+                )
+            )
+        )
+        # Time until the next prompt can be shown, the write itself runs in the background
+        timings["queued_edit_entry"].append(
+            time_call(
+                lambda: writer.submit(
+                    "update",
+                    edit_dates[run % len(edit_dates)],
+                    "Work" if run % 2 == 1 else "Sick Leave",
+                    "08:00",
+                    "17:00",
+                    config,
+                )
+            )
+        )
+        writer.flush()
+        # EXPORT (export_stats) --- --- --- --- ---
+        with tempfile.TemporaryDirectory() as out_path:
+            timings["export_timesheet"].append(
+                time_call(
+                    lambda: export_timesheet(
+                        connection,
+                        user_id,
+                        os.path.join(out_path, "timesheet.xlsx"),
+                        build_summary(
+                            config,
+                            get_stats(connection, user_id),
+                            len(get_missing_dates(connection, user_id)),
+                            get_balance(connection, user_id)["balance_minutes"],
+                        ),
+                    )
+                )
+            )
+    if len(writer.pop_failures()) > 0:
+        raise RuntimeError("Queued entry writes failed.")
+    connection.close()
+    session.close()
+    return timings
+
+
+def main() -> int:
+    """
+    Benchmarks the core operations against a generated fixture database and compares them to the stored baseline.
+
+    Args:
+        None
+
+    Returns:
+        int: Process exit code (1 if a regression was detected, see check_baseline).
+    """
+    parser = argparse.ArgumentParser(description="temps core operations benchmark")
+    parser.add_argument("--years", type=int, default=10, help="Years of history.")
+    parser.add_argument("--users", type=int, default=50, help="Number of users.")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per operation.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative slowdown against the baseline (default: 0.25).",
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Store results as new baseline."
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Also fail (exit 1) if no baseline is recorded for this fixture.",
+    )
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as res_path:
+        fixture = build_fixture_database(res_path, args.years, args.users)
+        timings = benchmark_operations(res_path, fixture["user_ids"], args.runs)
+    results = {
+        "years": args.years,
+        "users": args.users,
+        "entries": fixture["entries"],
+        "runs": args.runs,
+        "median_ms": {
+            operation: round(statistics.median(milliseconds), 3)
+            for operation, milliseconds in timings.items()
+            if len(milliseconds) > 0
+        },
+    }
+    print(json.dumps(results, indent=4))
+    if args.save_baseline:
+        save_baseline(BASELINE_PATH, results)
+        return 0
+    return check_baseline(BASELINE_PATH, results, args.tolerance, args.check)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+# STANDARD LIBRARY IMPORTS
+import os
+import sys
+import json
+from datetime import date
+
+# Make the repository root importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# THIRD PARTY IMPORTS
+import duckdb as ddb
+
+# UTIL IMPORTS
+from utils.config import DB_FILE_NAME, USER_CONFIG_FILE_NAME
+
+FIXTURE_CONFIG = {
+    "name": "Benchmark",
+    "weekly_work_minutes": 2400.0,
+    "work_days": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
+    "daily_break_minutes": 30,
+    "expected_daily_total_minutes": 510.0,
+}
+# Share of work days (per mille) left without an entry, so missing-date lookups have work to do
+MISSING_PER_MILLE = 5
+
+
+def get_fixture_start_date(years: int) -> str:
+    """
+    Returns the start date of a fixture with the given number of years of history.
+
+    Args:
+        years (int): Number of years of history.
+
+    Returns:
+        str: Start date formatted as YYYY-MM-DD.
+    """
+    today = date.today()
+    return today.replace(year=today.year - years, day=1).strftime("%Y-%m-%d")
+
+
+def generate_users(
+    connection: ddb.DuckDBPyConnection, users: int, start_date: str
+) -> list:
+    """
+    Creates the fixture users 'Benchmark 0001', 'Benchmark 0002', ... with the fixture configuration.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        users (int): Number of users.
+        start_date (str): Start date of all users formatted as YYYY-MM-DD.
+
+    Returns:
+        list: Ids of the created users.
+    """
+    return [
+        row[0]
+        for row in connection.execute(
+            """
+            INSERT INTO users (name, start_date, weekly_work_minutes, work_days, daily_break_minutes, expected_daily_total_minutes, created_at, updated_at)
+            SELECT
+                printf('%s %04d', ?, number),
+                CAST(? AS DATE),
+                ?,
+                ?,
+                ?,
+                ?,
+                CURRENT_TIMESTAMP,
+                CURRENT_TIMESTAMP
+            FROM range(1, ? + 1) AS numbers(number)
+            ORDER BY number
+            RETURNING user_id;
+            """,
+            [
+                FIXTURE_CONFIG["name"],
+                start_date,
+                FIXTURE_CONFIG["weekly_work_minutes"],
+                FIXTURE_CONFIG["work_days"],
+                FIXTURE_CONFIG["daily_break_minutes"],
+                FIXTURE_CONFIG["expected_daily_total_minutes"],
+                users,
+            ],
+        ).fetchall()
+    ]
+
+
+def generate_entries(
+    connection: ddb.DuckDBPyConnection, user_ids: list, start_date: str
+) -> int:
+    """
+    Fills the 'times' table with deterministic, realistic entries of the given users for every work day from the start date until today.
+    Event types and clock times are derived from a hash of user and date, so the same users and range always yield the same data.
+    A small share of work days is left without an entry.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_ids (list): User ids of the generated entries.
+        start_date (str): First date formatted as YYYY-MM-DD.
+
+    Returns:
+        int: Number of generated entries.
+    """
+    expected = int(FIXTURE_CONFIG["expected_daily_total_minutes"])
+    return connection.execute(
+        f"""
+        INSERT INTO times (user_id, date, event_type, clock_in, clock_out, break_time_minutes, expected_total_minutes, expected_total_minutes_work_default, actual_total_minutes, day_balance_minutes, created_at, updated_at)
+        WITH days AS (
+            SELECT
+                user_id,
+                CAST(day AS DATE) AS date,
+                CAST(hash(user_id, CAST(day AS DATE)) % 1000 AS BIGINT) AS seed,
+            FROM (SELECT unnest(?::INTEGER[]) AS user_id),
+                generate_series(DATE '{start_date}', current_date - 1, INTERVAL 1 DAY) AS days(day)
+            WHERE isodow(day) <= 5
+        ),
+        typed AS (
+            SELECT
+                *,
+                CASE
+                    WHEN seed < 880 THEN 'Work'
+                    WHEN seed < 940 THEN 'Vacation'
+                    WHEN seed < 965 THEN 'Public / Company Holiday'
+                    WHEN seed < 985 THEN 'Sick Leave'
+                    ELSE 'Overtime Compensation'
+                END AS event_type,
+                450 + seed % 120 AS clock_in_minute,
+                480 + (seed * 7) % 150 AS worked_minutes,
+            FROM days
+            WHERE seed < 1000 - {MISSING_PER_MILLE}
+        )
+        SELECT
+            user_id,
+            date,
+            event_type,
+            CASE WHEN event_type = 'Work' THEN clock_in_minute END,
+            CASE WHEN event_type = 'Work' THEN clock_in_minute + worked_minutes END,
+            CASE WHEN event_type = 'Work' THEN {FIXTURE_CONFIG["daily_break_minutes"]} END,
+            CASE WHEN event_type IN ('Work', 'Overtime Compensation') THEN {expected} END,
+            {expected},
+            CASE WHEN event_type = 'Work' THEN worked_minutes END,
+            CASE
+                WHEN event_type = 'Work' THEN worked_minutes - {expected}
+                WHEN event_type = 'Overtime Compensation' THEN -{expected}
+            END,
+            CAST(date AS TIMESTAMP) + INTERVAL 18 HOUR,
+            CAST(date AS TIMESTAMP) + INTERVAL 18 HOUR,
+        FROM typed
+        ORDER BY date, user_id;
+        """,
+        [user_ids],
+    ).fetchone()[0]
+
+
+def write_fixture_config(res_path: str, years: int) -> str:
+    """
+    Writes the fixture user configuration with a start date the given number of years ago.
+    It is imported as the only user on the first start.
+
+    Args:
+        res_path (str): Fixture resource directory.
+        years (int): Number of years of history.
+
+    Returns:
+        str: Start date formatted as YYYY-MM-DD.
+    """
+    start_date = get_fixture_start_date(years)
+    os.makedirs(res_path, exist_ok=True)
+    with open(os.path.join(res_path, USER_CONFIG_FILE_NAME), "w") as f:
+        json.dump({**FIXTURE_CONFIG, "start_date": start_date}, f, indent=4)
+    return start_date
+
+
+def fill_fixture_database(res_path: str, start_date: str) -> int:
+    """
+    Fills an initialized fixture database with generated entries of the fixture user and rebuilds derived tables.
+
+    Args:
+        res_path (str): Fixture resource directory containing an initialized database.
+        start_date (str): First date formatted as YYYY-MM-DD.
+
+    Returns:
+        int: Number of generated entries.
+    """
+    from utils.rollups import ensure_rollups, rebuild_rollups
+    from utils.user_config import resolve_user
+
+    connection = ddb.connect(os.path.join(res_path, DB_FILE_NAME))
+    try:
+        ensure_rollups(connection)
+        connection.execute("BEGIN TRANSACTION;")
+        generated = generate_entries(
+            connection, [resolve_user(connection, FIXTURE_CONFIG["name"])], start_date
+        )
+        rebuild_rollups(connection)
+        connection.execute("COMMIT;")
+        return generated
+    finally:
+        connection.close()
+
+
+def build_fixture_database(res_path: str, years: int, users: int) -> dict:
+    """
+    Creates a new fixture database with the given number of users and years of history,
+    including all derived tables (balance rollups, calendars).
+
+    Args:
+        res_path (str): Fixture resource directory, must not contain a database yet.
+        years (int): Number of years of history.
+        users (int): Number of users.
+
+    Returns:
+        dict: Start date, user ids and number of generated entries.
+    """
+    from utils.schema import migrate_schema
+    from utils.rollups import ensure_rollups, rebuild_rollups
+    from utils.calendar_table import refresh_calendar
+
+    start_date = get_fixture_start_date(years)
+    os.makedirs(res_path, exist_ok=True)
+    connection = ddb.connect(os.path.join(res_path, DB_FILE_NAME))
+    try:
+        # Not ensure_schema, it would import a user_config.json from the real RES_PATH
+        migrate_schema(connection)
+        ensure_rollups(connection)
+        connection.execute("BEGIN TRANSACTION;")
+        user_ids = generate_users(connection, users, start_date)
+        generated = generate_entries(connection, user_ids, start_date)
+        rebuild_rollups(connection)
+        connection.execute("COMMIT;")
+        for user_id in user_ids:
+            refresh_calendar(
+                connection, user_id, start_date, FIXTURE_CONFIG["work_days"]
+            )
+        return {"start_date": start_date, "user_ids": user_ids, "entries": generated}
+    finally:
+        connection.close()
@@ -2,14 +2,26 @@
 import sys
 import os
 import traceback
-import json
 import string
-import uuid
+import time
+import calendar
 from datetime import datetime
-from datetime import timedelta
+
+# Start of the import phase for --profile-startup
+_imports_started_at = time.perf_counter()
+
+# NON-INTERACTIVE FAST PATH
+# Subcommands (e.g. `main.py stats --json`) are dispatched before any of the
+# interactive dependencies below are imported, see utils/cli.py
+_INTERACTIVE_FLAGS = ["--profile-startup", "--json", "--trace"]
+if __name__ == "__main__" and any(
+    argument not in _INTERACTIVE_FLAGS for argument in sys.argv[1:]
+):
+    from utils.cli import run_cli
+
+    sys.exit(run_cli(sys.argv[1:]))
 
 # THIRD PARTY IMPORTS
-import pandas as pd
 import duckdb as ddb
 from InquirerPy import inquirer
 from InquirerPy.base.control import Choice
@@ -21,16 +33,48 @@ from utils.config import (
     VERSION_NUMBER,
     RES_PATH,
     DB_FILE_NAME,
-    USER_CONFIG_FILE_NAME,
+    USER_ENV_VAR,
     OUT_PATH,
-    GOLD_TABLE_SCHEMA,
+    DATE_PICKER_PAGE_SIZE,
+    ARROW_AVAILABLE,
 )
 from utils.error_log import log_error_to_file, LOG_PATH
-from utils.spinner import spawn_loading_spinner_thread, terminate_loading_spinner_thread
+from utils.spinner import start_spinner, stop_spinner
+from utils.db import DatabaseSession
+from utils.writer import EntryWriter
+from utils.daemon import is_daemon_running
+from utils.journal import compact_journal, describe_punch
+from utils.calendar_table import (
+    refresh_calendar,
+    get_missing_dates,
+    get_missing_months,
+)
+from utils.stats import get_stats
+from utils.queries import get_entry_dates, get_entry_months, get_entry
+from utils.rollups import ensure_rollups, get_balance
+from utils.importer import import_entries
+from utils.holidays import fill_holidays, HOLIDAY_REGIONS
+from utils.export import build_summary, export_timesheet, export_entries
+from utils.batch_export import prepare_batch_export, export_timesheets
+from utils.entries import parse_clock_time, format_clock_time
+from utils.schema import ensure_schema
+from utils.user_config import list_users, resolve_user, get_config, save_user
+from utils.profiling import StartupProfiler
+from utils.tracing import enable_tracing, set_action, span
 
 # GLOBAL VARS
-_threads = []
-_config = {}
+# Navigation choice values of the date picker, see prompt_date
+_DATE_PICKER_NEWER = "DATE_PICKER_NEWER"
+_DATE_PICKER_OLDER = "DATE_PICKER_OLDER"
+_DATE_PICKER_MONTH = "DATE_PICKER_MONTH"
+_DATE_PICKER_RECENT = "DATE_PICKER_RECENT"
+# Configuration of the current user (UserConfig), shared by all functions
+_config = None
+_session = DatabaseSession(os.path.join(RES_PATH, DB_FILE_NAME))
+# Entry saves are queued and applied in the background, see utils/writer.py
+_writer = EntryWriter(_session)
+_profiler = StartupProfiler(_imports_started_at)
+_profiler.lap("Imports")
 
 
 def clear_terminal() -> None:
@@ -61,21 +105,6 @@ def print_title() -> None:
     )
 
 
-def terminate_threads(threads: list = []) -> None:
-    """
-    Terminates all threads in the list.
-
-    Args:
-        threads (list): List of threads to terminate.
-
-    Returns:
-        None
-    """
-    if len(threads) > 0:
-        for thread in threads:
-            terminate_loading_spinner_thread(thread, False)
-
-
 def graceful_exit(success: bool) -> None:
     """
     Prints exit message and terminates script execution.
@@ -88,6 +117,10 @@ def graceful_exit(success: bool) -> None:
     """
     if not success:
         print(f"\n{bcolors.WARNING}→ Exiting...{bcolors.ENDC}")
+    # Apply queued entry writes before the session is closed
+    report_write_failures(should_continue=False)
+    # Close the long-lived database session
+    _session.close()
     sys.exit()
 
 
@@ -104,32 +137,106 @@ def prompt_continue() -> None:
     input(f"{bcolors.OKCYAN}\nPress ENTER to continue...{bcolors.ENDC}")
 
 
+def flush_writes() -> None:
+    """
+    Blocks until all queued entry writes have been applied.
+    A KeyboardInterrupt does not abort the flush, so queued entries are never lost on exit.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    while True:
+        try:
+            _writer.flush()
+            return
+        except KeyboardInterrupt:
+            continue
+
+
+def report_write_failures(should_continue: bool = True) -> bool:
+    """
+    Flushes queued entry writes and prints the ones that failed.
+
+    Args:
+        should_continue (bool): Whether to prompt the user to continue if any write failed.
+
+    Returns:
+        bool: True if any write failed.
+    """
+    flush_writes()
+    failures = _writer.pop_failures()
+    for write, error, details in failures:
+        print(
+            f"{bcolors.FAIL}✗ Failed to save entry for {write['date']} ({error}). Please enter it again.{bcolors.ENDC}"
+        )
+        log_error_to_file(details)
+    if len(failures) > 0 and should_continue:
+        prompt_continue()
+    return len(failures) > 0
+
+
+def compact_punches() -> bool:
+    """
+    Folds completed punches of the punch journal into entries and prints the punches that were dropped.
+
+    Args:
+        None
+
+    Returns:
+        bool: True if any punch was dropped.
+    """
+    try:
+        # Get a cursor on the DuckDB session
+        connection = get_db_connection()
+        result = compact_journal(connection)
+        # Close the cursor
+        connection.close()
+        for event, reason in result["rejected"]:
+            print(
+                f"{bcolors.WARNING}→ {describe_punch(event)} dropped: {reason}{bcolors.ENDC}"
+            )
+        return len(result["rejected"]) > 0
+    except Exception as e:
+        raise e
+
+
 def get_db_connection() -> ddb.DuckDBPyConnection:
     """
-    Returns a connection to the DuckDB database.
+    Returns a cursor on the long-lived DuckDB session.
+    Closing the returned cursor does not close the session connection.
+    Queued entry writes are flushed first, so reads always see them.
 
     Args:
         None
 
     Returns:
-        ddb.DuckDBPyConnection: Connection to the DuckDB database.
+        ddb.DuckDBPyConnection: Cursor on the DuckDB database.
     """
-    return ddb.connect(os.path.join(RES_PATH, DB_FILE_NAME))
+    flush_writes()
+    return _session.cursor()
 
 
-def save_config(config: dict) -> None:
+def save_config(config: dict) -> int:
     """
-    Saves the user configuration to a json file.
+    Saves the user configuration to the 'users' table.
+    Configurations without a 'user_id' create a new user.
 
     Args:
         config (dict): User configuration to save.
 
     Returns:
-        None
+        int: User id.
     """
     try:
-        with open(os.path.join(RES_PATH, USER_CONFIG_FILE_NAME), "w") as f:
-            json.dump(config, f, indent=4)
+        # Get a cursor on the DuckDB session
+        connection = get_db_connection()
+        user_id = save_user(connection, config)
+        # Close the cursor
+        connection.close()
+        return user_id
     except Exception as e:
         raise e
 
@@ -162,37 +269,39 @@ def prompt(input_type: str, *args, **kwargs) -> str:
     MANDATORY_MSG = "This field is required!"
     try:
         answer = None
-        match input_type:
-            case "text":
-                answer = inquirer.text(
-                    amark="✔", mandatory_message=MANDATORY_MSG, **kwargs
-                ).execute()
-            case "number":
-                answer = inquirer.number(
-                    amark="✔", mandatory_message=MANDATORY_MSG, **kwargs
-                ).execute()
-            case "number":
-                answer = inquirer.number(
-                    amark="✔", mandatory_message=MANDATORY_MSG, **kwargs
-                ).execute()
-            case "confirm":
-                answer = inquirer.confirm(
-                    amark="✔", mandatory_message=MANDATORY_MSG, **kwargs
-                ).execute()
-            case "select":
-                answer = inquirer.select(
-                    amark="✔", mandatory_message=MANDATORY_MSG, **kwargs
-                ).execute()
-            case "checkbox":
-                answer = inquirer.checkbox(
-                    amark="✔", mandatory_message=MANDATORY_MSG, **kwargs
-                ).execute()
-            case "fuzzy":
-                answer = inquirer.fuzzy(
-                    amark="✔", mandatory_message=MANDATORY_MSG, **kwargs
-                ).execute()
-            case _:
-                pass
+        # Prompt waits are traced, so user think time can be told apart from work
+        with span("prompt", input_type, message=kwargs.get("message")):
+            match input_type:
+                case "text":
+                    answer = inquirer.text(
+                        amark="✔", mandatory_message=MANDATORY_MSG, **kwargs
+                    ).execute()
+                case "number":
+                    answer = inquirer.number(
+                        amark="✔", mandatory_message=MANDATORY_MSG, **kwargs
+                    ).execute()
+                case "number":
+                    answer = inquirer.number(
+                        amark="✔", mandatory_message=MANDATORY_MSG, **kwargs
+                    ).execute()
+                case "confirm":
+                    answer = inquirer.confirm(
+                        amark="✔", mandatory_message=MANDATORY_MSG, **kwargs
+                    ).execute()
+                case "select":
+                    answer = inquirer.select(
+                        amark="✔", mandatory_message=MANDATORY_MSG, **kwargs
+                    ).execute()
+                case "checkbox":
+                    answer = inquirer.checkbox(
+                        amark="✔", mandatory_message=MANDATORY_MSG, **kwargs
+                    ).execute()
+                case "fuzzy":
+                    answer = inquirer.fuzzy(
+                        amark="✔", mandatory_message=MANDATORY_MSG, **kwargs
+                    ).execute()
+                case _:
+                    pass
         if answer is None:
             raise KeyboardInterrupt
         return answer
@@ -205,6 +314,82 @@ def prompt(input_type: str, *args, **kwargs) -> str:
         raise e
 
 
+def prompt_date(message: str, fetch_dates: callable, fetch_months: callable) -> str:
+    """
+    Prompts for a date, one page of dates at a time (newest first).
+    Pages are fetched from the database on demand; older pages and single months are reached via navigation choices,
+    so prompt construction and fuzzy filtering never touch more than one page of dates.
+
+    Args:
+        message (str): Prompt message.
+        fetch_dates (callable): Called as fetch_dates(start_date, end_date, limit, offset), returns dates formatted as YYYY-MM-DD, newest first.
+        fetch_months (callable): Returns (month formatted as YYYY-MM, number of dates) tuples, newest month first.
+
+    Returns:
+        str: Selected date formatted as YYYY-MM-DD, None if there are no dates to select from.
+    """
+    try:
+        month = None
+        start_date = None
+        end_date = None
+        offset = 0
+        while True:
+            # Fetch one date more than shown to know whether there is an older page
+            dates = fetch_dates(start_date, end_date, DATE_PICKER_PAGE_SIZE + 1, offset)
+            if len(dates) == 0 and month is None and offset == 0:
+                return None
+            has_older_page = len(dates) > DATE_PICKER_PAGE_SIZE
+            # Build choices of the current page plus navigation
+            choices = [Choice(date) for date in dates[:DATE_PICKER_PAGE_SIZE]]
+            if offset > 0:
+                choices.insert(0, Choice(_DATE_PICKER_NEWER, name="↑ Newer dates"))
+            if has_older_page:
+                choices.append(Choice(_DATE_PICKER_OLDER, name="↓ Older dates"))
+            choices.append(Choice(_DATE_PICKER_MONTH, name="→ Jump to month"))
+            if month is not None:
+                choices.append(Choice(_DATE_PICKER_RECENT, name="← Most recent dates"))
+            selection = prompt(
+                input_type="fuzzy",
+                message=message,
+                choices=choices,
+                instruction=f"({month})" if month is not None else "",
+                mandatory=True,
+                wrap_lines=True,
+                border=True,
+                cycle=True,
+            )
+            if selection == _DATE_PICKER_NEWER:
+                offset = max(0, offset - DATE_PICKER_PAGE_SIZE)
+            elif selection == _DATE_PICKER_OLDER:
+                offset += DATE_PICKER_PAGE_SIZE
+            elif selection == _DATE_PICKER_MONTH:
+                month = prompt(
+                    input_type="fuzzy",
+                    message="Select a month:",
+                    choices=[
+                        Choice(value, name=f"{value} ({count})")
+                        for value, count in fetch_months()
+                    ],
+                    mandatory=True,
+                    wrap_lines=True,
+                    border=True,
+                    cycle=True,
+                )
+                year, month_number = [int(part) for part in month.split("-")]
+                start_date = f"{month}-01"
+                end_date = f"{month}-{calendar.monthrange(year, month_number)[1]:02d}"
+                offset = 0
+            elif selection == _DATE_PICKER_RECENT:
+                month = None
+                start_date = None
+                end_date = None
+                offset = 0
+            else:
+                return selection
+    except Exception as e:
+        raise e
+
+
 def show_entry(entry: dict) -> None:
     """
     Shows the details of an entry.
@@ -223,7 +408,7 @@ def show_entry(entry: dict) -> None:
         print(f"{bcolors.ORANGE}‣ Type:            {bcolors.ENDC}{entry['event_type']}")
         if entry["event_type"] == "Work":
             print(
-                f"{bcolors.ORANGE}‣ Time Overview:   {bcolors.ENDC}{entry['clock_in']} → {entry['clock_out']} (incl. {entry['break_time_minutes']}min break)"
+                f"{bcolors.ORANGE}‣ Time Overview:   {bcolors.ENDC}{format_clock_time(entry['clock_in'])} → {format_clock_time(entry['clock_out'])} (incl. {entry['break_time_minutes']}min break)"
             )
             print(
                 f"{bcolors.ORANGE}‣ Time Worked:     {bcolors.ENDC}{entry['actual_total_minutes'] // 60}h {entry['actual_total_minutes'] % 60}min / {entry['expected_total_minutes'] // 60}h {entry['expected_total_minutes'] % 60}min ({(entry['actual_total_minutes']/entry['expected_total_minutes']*100):.0f}%)"
@@ -248,30 +433,32 @@ def show_config() -> None:
         None
     """
     try:
-        print(f"{bcolors.ORANGE}‣ Name:            {bcolors.ENDC}{_config['name']}")
+        print(f"{bcolors.ORANGE}‣ Name:            {bcolors.ENDC}{_config.name}")
+        print(f"{bcolors.ORANGE}‣ Start Date:      {bcolors.ENDC}{_config.start_date}")
         print(
-            f"{bcolors.ORANGE}‣ Start Date:      {bcolors.ENDC}{_config['start_date']}"
+            f"{bcolors.ORANGE}‣ Weekly Work:     {bcolors.ENDC}{(_config.weekly_work_minutes // 60):.0f}h {(_config.weekly_work_minutes % 60):.0f}min"
         )
         print(
-            f"{bcolors.ORANGE}‣ Weekly Work:     {bcolors.ENDC}{(_config['weekly_work_minutes'] // 60):.0f}h {(_config['weekly_work_minutes'] % 60):.0f}min"
+            f"{bcolors.ORANGE}‣ Work Days:       {bcolors.ENDC}{', '.join(_config.work_days)}"
         )
         print(
-            f"{bcolors.ORANGE}‣ Work Days:       {bcolors.ENDC}{', '.join(_config['work_days'])}"
+            f"{bcolors.ORANGE}‣ Daily Break:     {bcolors.ENDC}{_config.daily_break_minutes}min"
         )
         print(
-            f"{bcolors.ORANGE}‣ Daily Break:     {bcolors.ENDC}{_config['daily_break_minutes']}min"
+            f"{bcolors.ORANGE}‣ Holiday Region:  {bcolors.ENDC}{_config.holiday_region or 'None'}"
         )
         print()
     except Exception as e:
         raise e
 
 
-def create_config(default: dict = None) -> dict:
+def create_config(default: dict = None, taken_names: list = []) -> dict:
     """
     Creates a new user configuration.
 
     Args:
-        None
+        default (dict): Optional configuration to prefill the prompts with.
+        taken_names (list): Names of other users, which can't be used again.
 
     Returns:
         dict: User configuration.
@@ -288,8 +475,9 @@ def create_config(default: dict = None) -> dict:
         and all(
             character in string.ascii_letters + string.digits + string.punctuation + " "
             for character in text
-        ),
-        invalid_message="Name must be between 1 and 50 characters and can only consist of alphanumerics, spaces, and punctuation.",
+        )
+        and text not in taken_names,
+        invalid_message="Name must be between 1 and 50 characters, can only consist of alphanumerics, spaces, and punctuation, and must not be used by another user.",
     )
     config["start_date"] = prompt(
         input_type="text",
@@ -383,55 +571,57 @@ def create_config(default: dict = None) -> dict:
         config["weekly_work_minutes"] / len(config["work_days"])
         + config["daily_break_minutes"]
     )
+    config["holiday_region"] = prompt(
+        input_type="select",
+        message="Select your public holiday region:",
+        choices=[Choice("", name="None")] + list(HOLIDAY_REGIONS),
+        default=default["holiday_region"] if default else "",
+        mandatory=True,
+        wrap_lines=True,
+        show_cursor=False,
+        border=True,
+        filter=lambda region: region or None,
+    )
     return config
 
 
-def load_validate_config() -> None:
+def load_validate_config(user_id: int) -> None:
     """
-    Loads and validates the user configuration.
+    Loads and validates the configuration of a user and makes it the current user.
 
     Args:
-        None
+        user_id (int): User id.
 
     Returns:
         None
     """
     try:
-        thread_init_config = spawn_loading_spinner_thread(
+        start_spinner(
             "Loading & validating user configuration",
             "Successfully loaded & validated user configuration.\n",
             "Failed to load & validate user configuration.",
         )
-        _threads.append(thread_init_config)
-        # Load config into global variable to make it accessible across entire script
+        # Load config into global variable to make it accessible across entire script,
+        # it is only rebuilt if the user was updated since it was last loaded
         global _config
-        _config = json.load(open(os.path.join(RES_PATH, USER_CONFIG_FILE_NAME), "r"))
-        # Validate config
-        # Check if all required fields are present in the config
-        if not all(
-            key in _config
-            for key in [
-                "name",
-                "start_date",
-                "weekly_work_minutes",
-                "work_days",
-                "daily_break_minutes",
-            ]
-        ):
-            raise ValueError(
-                "User config file is missing required fields. Please delete the config file and re-launch the program."
-            )
-        terminate_loading_spinner_thread(thread_init_config, True)
+        connection = get_db_connection()
+        _config = get_config(connection, user_id)
+        # Regenerate the user's calendar rows if the config changed
+        refresh_calendar(
+            connection, _config.user_id, _config.start_date, _config.work_days
+        )
+        connection.close()
+        stop_spinner(True)
     except Exception as e:
         raise e
 
 
-def initialize() -> None:
+def initialize(interactive: bool = True) -> None:
     """
     Initializes the database, creates the necessary tables, loads and validates the user config, creates folder structure.
 
     Args:
-        None
+        interactive (bool): Whether the user may be prompted (config creation, continue prompt).
 
     Returns:
         None
@@ -439,108 +629,282 @@ def initialize() -> None:
     try:
         # FOLDER STRUCTURE --- --- --- --- ---
         # Create the necessary directories if they don't exist
-        thread_init_folders = spawn_loading_spinner_thread(
+        start_spinner(
             "Creating folder structure",
             "Successfully created folder structure.\n",
             "Failed to create folder structure.",
         )
-        _threads.append(thread_init_folders)
         os.makedirs(RES_PATH, exist_ok=True)
         os.makedirs(OUT_PATH, exist_ok=True)
-        terminate_loading_spinner_thread(thread_init_folders, True)
+        stop_spinner(True)
+        _profiler.lap("Folder creation")
+        # DAEMON --- --- --- --- ---
+        # A running `temps serve` daemon holds the database lock
+        if is_daemon_running():
+            print(
+                f"{bcolors.WARNING}→ The database is in use by the temps daemon (main.py serve). Stop it to use the interactive menu, subcommands are answered by the daemon.{bcolors.ENDC}"
+            )
+            graceful_exit(success=False)
         # DATABASE --- --- --- --- ---
-        thread_init_database = spawn_loading_spinner_thread(
+        start_spinner(
             "Validating database",
             "Successfully validated database.\n",
             "Failed to validate database.",
         )
-        _threads.append(thread_init_database)
-        # Create a connection to the DuckDB database
+        # Get a cursor on the DuckDB session
         connection = get_db_connection()
-        # Create the 'times' table if it doesn't exist
-        result = connection.execute("SHOW ALL TABLES;").fetchall()
-        table_exists = len(result) > 0
-        if not table_exists:
-            connection.execute(
-                """
-                CREATE TABLE IF NOT EXISTS times (
-                    uuid VARCHAR NOT NULL PRIMARY KEY,
-                    date DATE NOT NULL UNIQUE,
-                    day_of_week VARCHAR NOT NULL,
-                    event_type VARCHAR NOT NULL,
-                    clock_in VARCHAR,
-                    clock_out VARCHAR,
-                    break_time_minutes INT,
-                    expected_total_minutes INT,
-                    expected_total_minutes_work_default INT, 
-                    actual_total_minutes INT,
-                    day_balance_minutes INT,
-                    created_at TIMESTAMP NOT NULL,
-                    updated_at TIMESTAMP NOT NULL,
-                );
-            """
-            )
-        # Check if the table schema matches the expected schema
-        table_schema = connection.execute("DESCRIBE times;").fetchall()
-        # When table schema is not matched, export all data as backup and advise to delete the database file
-        if table_schema != GOLD_TABLE_SCHEMA:
-            df = connection.execute("SELECT * FROM times;").fetchdf()
-            df.to_excel(os.path.join(OUT_PATH, "backup.xlsx"), index=False)
-            raise ValueError(
-                "Table schema does not match the expected schema. Delete the database file and re-lauch the program. This will delete all your entries."
-            )
-        # Close the connection
+        # Upgrade the database in place to the latest schema version
+        ensure_schema(connection)
+        # Create & populate materialized balance tables if they don't exist
+        ensure_rollups(connection)
+        # Close the cursor
         connection.close()
-        terminate_loading_spinner_thread(thread_init_database, True)
+        stop_spinner(True)
+        _profiler.lap("Schema check")
+        # PUNCH JOURNAL --- --- --- --- ---
+        compact_punches()
         # USER CONFIG --- --- --- --- ---
-        # Check if user config file exists
-        config = {}
-        config_exists = os.path.exists(os.path.join(RES_PATH, USER_CONFIG_FILE_NAME))
-        # Prompt for config creation if it doesn't exist
-        if not config_exists:
-            print(
-                f"{bcolors.WARNING}→ User config file not found. Creating new config..{bcolors.ENDC}"
+        # Select the user (or create the first one), then read, validate & apply its config
+        load_validate_config(select_user(interactive))
+        _profiler.lap("Config load")
+        if interactive:
+            prompt_continue()
+    except Exception as e:
+        raise e
+
+
+def select_user(interactive: bool = True, switching: bool = False) -> int:
+    """
+    Selects the user to work as.
+    The user named by the TEMPS_USER environment variable or the only existing user is selected
+    without prompting, otherwise the user is prompted to pick an existing user or create a new one.
+
+    Args:
+        interactive (bool): Whether the user may be prompted.
+        switching (bool): Always prompt, even if the user could be selected without prompting.
+
+    Returns:
+        int: User id.
+    """
+    try:
+        # Get a cursor on the DuckDB session
+        connection = get_db_connection()
+        users = list_users(connection)
+        if not switching and (
+            os.environ.get(USER_ENV_VAR) or len(users) == 1 or not interactive
+        ):
+            user_id = resolve_user(connection, os.environ.get(USER_ENV_VAR))
+            connection.close()
+            return user_id
+        connection.close()
+        user_id = "NEW_USER"
+        if len(users) > 0:
+            user_id = prompt(
+                input_type="fuzzy",
+                message="Select a user:",
+                choices=[Choice(user_id, name=name) for user_id, name in users]
+                + [Choice("NEW_USER", name="+ New user")],
+                mandatory=True,
+                wrap_lines=True,
+                border=True,
+                cycle=True,
+            )
+        # Create a new user if none exists yet or creation was selected
+        if user_id == "NEW_USER":
+            print(f"{bcolors.WARNING}→ Creating new user configuration..{bcolors.ENDC}")
+            user_id = save_config(
+                create_config(taken_names=[name for _, name in users])
             )
-            config = create_config()
-            # Write config to json file
-            save_config(config)
             print(
                 f"{bcolors.OKGREEN}✔ Successfully created user configuration.{bcolors.ENDC}"
             )
-        # Read, validate & apply config
-        load_validate_config()
-        prompt_continue()
+        return user_id
     except Exception as e:
         raise e
 
 
-def get_existing_entries() -> any:
+def get_existing_dates(
+    start_date: str = None, end_date: str = None, limit: int = None, offset: int = 0
+) -> list:
     """
-    Returns all existing entries from the database.
+    Returns the dates of existing entries (newest first), without loading the entries themselves.
 
     Args:
-        None
+        start_date (str): Optional first date (inclusive) formatted as YYYY-MM-DD.
+        end_date (str): Optional last date (inclusive) formatted as YYYY-MM-DD.
+        limit (int): Maximum number of dates, None for all dates.
+        offset (int): Number of (newest) dates to skip.
 
     Returns:
-        any: All existing entries from the database.
+        list: Dates formatted as YYYY-MM-DD, in descending order.
     """
     try:
         # Print loading spinner
-        thread_get_existing_entries = spawn_loading_spinner_thread(
+        start_spinner(
             "Loading existing entries",
             "Successfully loaded existing entries.\n",
             "Failed to load existing entries.",
         )
-        _threads.append(thread_get_existing_entries)
-        # Create a connection to the DuckDB database
+        # Get a cursor on the DuckDB session
+        connection = get_db_connection()
+        # Dates-only projection of the user's entries
+        existing_dates = get_entry_dates(
+            connection, _config.user_id, start_date, end_date, limit, offset
+        )
+        # Close the cursor
+        connection.close()
+        # Stop loading spinner
+        stop_spinner(True)
+        return existing_dates
+    except Exception as e:
+        raise e
+
+
+def get_existing_months() -> list:
+    """
+    Returns the months with existing entries.
+
+    Args:
+        None
+
+    Returns:
+        list: (month formatted as YYYY-MM, entries) tuples, newest month first.
+    """
+    try:
+        # Get a cursor on the DuckDB session
+        connection = get_db_connection()
+        existing_months = get_entry_months(connection, _config.user_id)
+        # Close the cursor
+        connection.close()
+        return existing_months
+    except Exception as e:
+        raise e
+
+
+def get_existing_entry(date: str) -> dict:
+    """
+    Returns a single existing entry.
+
+    Args:
+        date (str): Entry date formatted as YYYY-MM-DD.
+
+    Returns:
+        dict: Entry, None if no entry exists for the date.
+    """
+    try:
+        # Get a cursor on the DuckDB session
+        connection = get_db_connection()
+        # Point lookup of the entry
+        entry = get_entry(connection, _config.user_id, date)
+        # Close the cursor
+        connection.close()
+        return entry
+    except Exception as e:
+        raise e
+
+
+def get_missing_entries(
+    start_date: str = None,
+    end_date: str = None,
+    limit: int = None,
+    offset: int = 0,
+    descending: bool = False,
+) -> list:
+    """
+    Returns work days between start date and today that have no entry in the database.
+
+    Args:
+        start_date (str): Optional first date (inclusive) formatted as YYYY-MM-DD.
+        end_date (str): Optional last date (inclusive) formatted as YYYY-MM-DD.
+        limit (int): Maximum number of dates, None for all dates.
+        offset (int): Number of dates to skip.
+        descending (bool): Whether to return the newest dates first.
+
+    Returns:
+        list: Missing dates formatted as YYYY-MM-DD, in ascending order (unless descending).
+    """
+    try:
+        # Get a cursor on the DuckDB session
+        connection = get_db_connection()
+        # Anti-join the user's calendar work days against their existing entries
+        missing_entries = get_missing_dates(
+            connection,
+            _config.user_id,
+            start_date,
+            end_date,
+            limit,
+            offset,
+            descending,
+        )
+        # Close the cursor
+        connection.close()
+        return missing_entries
+    except Exception as e:
+        raise e
+
+
+def get_missing_entry_months() -> list:
+    """
+    Returns the months with missing entries.
+
+    Args:
+        None
+
+    Returns:
+        list: (month formatted as YYYY-MM, missing days) tuples, newest month first.
+    """
+    try:
+        # Get a cursor on the DuckDB session
         connection = get_db_connection()
-        # Get all existing entries
-        existing_entries = connection.execute("SELECT * FROM times;").df()
-        # Close the connection
+        missing_months = get_missing_months(connection, _config.user_id)
+        # Close the cursor
         connection.close()
-        # Terminate loading spinner
-        terminate_loading_spinner_thread(thread_get_existing_entries, True)
-        return existing_entries
+        return missing_months
+    except Exception as e:
+        raise e
+
+
+def get_entry_stats(start_date: str = None, end_date: str = None) -> dict:
+    """
+    Returns aggregated statistics of the entries in the database, optionally limited to a date range.
+
+    Args:
+        start_date (str): Optional first date (inclusive) formatted as YYYY-MM-DD.
+        end_date (str): Optional last date (inclusive) formatted as YYYY-MM-DD.
+
+    Returns:
+        dict: Entry statistics as returned by utils.stats.get_stats.
+    """
+    try:
+        # Get a cursor on the DuckDB session
+        connection = get_db_connection()
+        # Aggregate counts, balance and times in a single query
+        stats = get_stats(connection, _config.user_id, start_date, end_date)
+        # Close the cursor
+        connection.close()
+        return stats
+    except Exception as e:
+        raise e
+
+
+def get_total_balance() -> int:
+    """
+    Returns the total overtime balance from the materialized balance table.
+
+    Args:
+        None
+
+    Returns:
+        int: Total balance in minutes.
+    """
+    try:
+        # Get a cursor on the DuckDB session
+        connection = get_db_connection()
+        # Look up the running total instead of summing all entries
+        total_balance = get_balance(connection, _config.user_id)["balance_minutes"]
+        # Close the cursor
+        connection.close()
+        return total_balance
     except Exception as e:
         raise e
 
@@ -562,55 +926,24 @@ def add_entry() -> None:
             clear_terminal()
             print_title()
             print(f"{bcolors.OKCYAN}{bcolors.UNDERLINE}→ ADD NEW ENTRY{bcolors.ENDC}\n")
-            # Get all existing entries
-            existing_entries = get_existing_entries()
-            # Get all existing dates from database entries formatted as YYYY-MM-DD
-            existing_dates = [
-                date.strftime("%Y-%m-%d") for date in existing_entries["date"].tolist()
-            ]
-            # Get all valid dates from start date to today, excluding existing dates
-            valid_dates = sorted(
-                [
-                    date.strftime("%Y-%m-%d")
-                    for date in (
-                        datetime.strptime(_config["start_date"], "%Y-%m-%d")
-                        + timedelta(days=i)
-                        for i in range(
-                            (
-                                datetime.now()
-                                - datetime.strptime(_config["start_date"], "%Y-%m-%d")
-                            ).days
-                            + 1
-                        )
-                    )
-                    if date.strftime("%A") in _config["work_days"]
-                    and date.strftime("%Y-%m-%d") not in set(existing_dates)
-                ],
-                reverse=True,
+            # Report previously queued writes that failed
+            report_write_failures()
+            # Prompt for an entry date, missing dates are fetched one page at a time
+            date = prompt_date(
+                "Select an entry date:",
+                lambda start_date, end_date, limit, offset: get_missing_entries(
+                    start_date, end_date, limit, offset, descending=True
+                ),
+                get_missing_entry_months,
             )
             # No dates available -> entries are up-to-date, nothing to do
-            if len(valid_dates) == 0:
+            if date is None:
                 print(
                     f"{bcolors.OKGREEN}✔ Entries are up-to-date. There are currently no missing entries.{bcolors.ENDC}"
                 )
                 should_exit = True
                 prompt_continue()
                 continue
-            # Prompts for entry details below
-            date = prompt(
-                input_type="fuzzy",
-                message="Select an entry date:",
-                choices=[Choice(date) for date in valid_dates],
-                default=valid_dates[0] if len(valid_dates) > 0 else "",
-                mandatory=True,
-                wrap_lines=True,
-                validate=lambda text: len(text) == 10
-                and datetime.strptime(text, "%Y-%m-%d"),
-                invalid_message="Start date must be in format YYYY-MM-DD.",
-                border=True,
-                cycle=True,
-            )
-            day_of_week = datetime.strptime(date, "%Y-%m-%d").strftime("%A")
             event_type = prompt(
                 input_type="select",
                 message="Select an event type:",
@@ -630,13 +963,6 @@ def add_entry() -> None:
             # Set default values
             clock_in = None
             clock_out = None
-            actual_total_minutes = None
-            expected_total_minutes = None
-            balance = None
-            # Overtime compensation specifics
-            if event_type == "Overtime Compensation":
-                expected_total_minutes = _config["expected_daily_total_minutes"]
-                balance = -_config["expected_daily_total_minutes"]
             # Work specifics
             if event_type == "Work":
                 clock_in = prompt(
@@ -645,10 +971,7 @@ def add_entry() -> None:
                     mandatory=True,
                     wrap_lines=True,
                     validate=lambda text: len(text) == 5
-                    and datetime.strptime(text, "%H:%M")
-                    >= datetime.strptime("00:00", "%H:%M")
-                    and datetime.strptime(text, "%H:%M")
-                    <= datetime.strptime("23:59", "%H:%M"),
+                    and parse_clock_time(text) is not None,
                     invalid_message="Clock in time must be in format HH:MM, between 00:00 and 23:59.",
                 )
                 clock_out = prompt(
@@ -657,68 +980,12 @@ def add_entry() -> None:
                     mandatory=True,
                     wrap_lines=True,
                     validate=lambda text: len(text) == 5
-                    and datetime.strptime(text, "%H:%M")
-                    > datetime.strptime(clock_in, "%H:%M")
-                    and datetime.strptime(text, "%H:%M")
-                    >= datetime.strptime("00:00", "%H:%M")
-                    and datetime.strptime(text, "%H:%M")
-                    <= datetime.strptime("23:59", "%H:%M"),
+                    and parse_clock_time(text) is not None
+                    and parse_clock_time(text) > parse_clock_time(clock_in),
                     invalid_message="Clock out time must be in format HH:MM, between 00:00 and 23:59, and after clock in time.",
                 )
-                expected_total_minutes = _config["expected_daily_total_minutes"]
-                # Get difference between clock in and clock out
-                clock_in_time = datetime.strptime(clock_in, "%H:%M")
-                clock_out_time = datetime.strptime(clock_out, "%H:%M")
-                actual_total_minutes = (
-                    clock_out_time.hour * 60 + clock_out_time.minute
-                ) - (clock_in_time.hour * 60 + clock_in_time.minute)
-                # Calculate balance
-                balance = actual_total_minutes - expected_total_minutes
-            # Write entry to database
-            thread_add_entry = spawn_loading_spinner_thread(
-                "Adding new entry",
-                "Successfully added new entry.\n",
-                "Failed to add new entry.",
-            )
-            _threads.append(thread_add_entry)
-            # Create a connection to the DuckDB database
-            connection = get_db_connection()
-            # Insert the new entry into the database
-            query = """
-                INSERT INTO times (uuid, date, day_of_week, event_type, clock_in, clock_out, break_time_minutes, expected_total_minutes, expected_total_minutes_work_default, actual_total_minutes, day_balance_minutes, created_at, updated_at)
-                VALUES (
-                    ?,
-                    ?,
-                    ?,
-                    ?,
-                    ?,
-                    ?,
-                    ?,
-                    ?,
-                    ?,
-                    ?,
-                    ?,
-                    CURRENT_TIMESTAMP,
-                    CURRENT_TIMESTAMP
-                )
-            """
-            values = [
-                str(uuid.uuid4()),
-                date,
-                day_of_week,
-                event_type,
-                clock_in,
-                clock_out,
-                int(_config["daily_break_minutes"]) if event_type in ["Work"] else None,
-                int(expected_total_minutes) if expected_total_minutes else None,
-                int(_config["expected_daily_total_minutes"]),
-                int(actual_total_minutes) if actual_total_minutes else None,
-                int(balance) if balance is not None else None,
-            ]
-            connection.execute(query, values)
-            # Close the connection
-            connection.close()
-            terminate_loading_spinner_thread(thread_add_entry, True)
+            # Queue entry insert, it is written in the background while the next prompt is shown
+            _writer.submit("insert", date, event_type, clock_in, clock_out, _config)
             print()
             # Prompt for another entry
             should_exit = not prompt(
@@ -749,40 +1016,22 @@ def edit_entry() -> None:
             clear_terminal()
             print_title()
             print(f"{bcolors.OKCYAN}{bcolors.UNDERLINE}→ EDIT ENTRY{bcolors.ENDC}\n")
-            # Get all existing entries
-            existing_entries = get_existing_entries()
-            # Get all existing dates from database entries formatted as YYYY-MM-DD
-            existing_dates = sorted(
-                [
-                    date.strftime("%Y-%m-%d")
-                    for date in existing_entries["date"].tolist()
-                ],
-                reverse=True,
+            # Report previously queued writes that failed
+            report_write_failures()
+            # Prompt for date selection, existing dates are fetched one page at a time
+            date = prompt_date(
+                "Select an entry:", get_existing_dates, get_existing_months
             )
             # No dates available -> nothing to edit
-            if len(existing_dates) == 0:
+            if date is None:
                 print(
                     f"{bcolors.WARNING}→ No entries available for editing. Most likely no entries have been made yet, once entries exist, they will be shown here.{bcolors.ENDC}"
                 )
                 should_exit = True
                 prompt_continue()
                 continue
-            # Prompt for date selection from list of entries
-            date = prompt(
-                input_type="fuzzy",
-                message="Select an entry:",
-                choices=[Choice(date) for date in existing_dates],
-                default=existing_dates[0] if len(existing_dates) > 0 else "",
-                mandatory=True,
-                wrap_lines=True,
-                validate=lambda text: len(text) == 10
-                and datetime.strptime(text, "%Y-%m-%d"),
-                invalid_message="Start date must be in format YYYY-MM-DD.",
-                border=True,
-                cycle=True,
-            )
             # Get selected entry by date
-            entry = existing_entries[existing_entries["date"] == date].iloc[0]
+            entry = get_existing_entry(date)
             # Print entry details
             clear_terminal()
             print_title()
@@ -820,88 +1069,31 @@ def edit_entry() -> None:
                 # Set default values
                 clock_in = None
                 clock_out = None
-                actual_total_minutes = None
-                balance = None
-                expected_total_minutes = None
-                # Overtime compensation specifics
-                if event_type == "Overtime Compensation":
-                    balance = -entry["expected_total_minutes_work_default"]
-                    expected_total_minutes = entry[
-                        "expected_total_minutes_work_default"
-                    ]
                 # Work specifics
                 if event_type == "Work":
                     clock_in = prompt(
                         input_type="text",
                         message="Enter clock in time (HH:MM): ",
-                        default=entry["clock_in"],
+                        default=format_clock_time(entry["clock_in"]) or "",
                         mandatory=True,
                         wrap_lines=True,
                         validate=lambda text: len(text) == 5
-                        and datetime.strptime(text, "%H:%M")
-                        >= datetime.strptime("00:00", "%H:%M")
-                        and datetime.strptime(text, "%H:%M")
-                        <= datetime.strptime("23:59", "%H:%M"),
+                        and parse_clock_time(text) is not None,
                         invalid_message="Clock in time must be in format HH:MM, between 00:00 and 23:59.",
                     )
                     clock_out = prompt(
                         input_type="text",
                         message="Enter clock out time (HH:MM): ",
-                        default=entry["clock_out"],
+                        default=format_clock_time(entry["clock_out"]) or "",
                         mandatory=True,
                         wrap_lines=True,
                         validate=lambda text: len(text) == 5
-                        and datetime.strptime(text, "%H:%M")
-                        > datetime.strptime(clock_in, "%H:%M")
-                        and datetime.strptime(text, "%H:%M")
-                        >= datetime.strptime("00:00", "%H:%M")
-                        and datetime.strptime(text, "%H:%M")
-                        <= datetime.strptime("23:59", "%H:%M"),
+                        and parse_clock_time(text) is not None
+                        and parse_clock_time(text) > parse_clock_time(clock_in),
                         invalid_message="Clock out time must be in format HH:MM, between 00:00 and 23:59, and after clock in time.",
                     )
-                    expected_total_minutes = entry[
-                        "expected_total_minutes_work_default"
-                    ]
-                    # Get difference between clock in and clock out
-                    clock_in_time = datetime.strptime(clock_in, "%H:%M")
-                    clock_out_time = datetime.strptime(clock_out, "%H:%M")
-                    actual_total_minutes = (
-                        clock_out_time.hour * 60 + clock_out_time.minute
-                    ) - (clock_in_time.hour * 60 + clock_in_time.minute)
-                    # Calculate balance
-                    balance = actual_total_minutes - entry["expected_total_minutes"]
-                # Update entry in database
-                thread_edit_entry = spawn_loading_spinner_thread(
-                    "Updating entry",
-                    "Successfully updated entry.\n",
-                    "Failed to update entry.",
-                )
-                connection = get_db_connection()
-                query = """
-                    UPDATE times
-                    SET 
-                        event_type = ?,
-                        clock_in = ?,
-                        clock_out = ?,
-                        expected_total_minutes = ?,
-                        actual_total_minutes = ?,
-                        day_balance_minutes = ?,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE date = ?;
-                """
-                values = [
-                    event_type,
-                    clock_in,
-                    clock_out,
-                    int(expected_total_minutes) if expected_total_minutes else None,
-                    int(actual_total_minutes) if actual_total_minutes else None,
-                    int(balance) if balance is not None else None,
-                    date,
-                ]
-                connection.execute(query, values)
-                # Close the connection
-                connection.close()
-                terminate_loading_spinner_thread(thread_edit_entry, True)
+                # Queue entry update, it is written in the background while the next prompt is shown
+                _writer.submit("update", date, event_type, clock_in, clock_out, _config)
                 print()
                 # prompt for another entry
                 should_exit = not prompt(
@@ -930,46 +1122,26 @@ def view_entry() -> None:
         clear_terminal()
         print_title()
         print(f"{bcolors.OKCYAN}{bcolors.UNDERLINE}→ VIEW ENTRY{bcolors.ENDC}\n")
-        # Get all existing entries
-        existing_entries = get_existing_entries()
         should_exit = False
         while not should_exit:
             # Print header
             clear_terminal()
             print_title()
             print(f"{bcolors.OKCYAN}{bcolors.UNDERLINE}→ VIEW ENTRY{bcolors.ENDC}\n")
-            # Get all existing dates
-            existing_dates = sorted(
-                [
-                    date.strftime("%Y-%m-%d")
-                    for date in existing_entries["date"].tolist()
-                ],
-                reverse=True,
+            # Prompt for date selection, existing dates are fetched one page at a time
+            date = prompt_date(
+                "Select an entry:", get_existing_dates, get_existing_months
             )
             # No dates available -> nothing to view
-            if len(existing_dates) == 0:
+            if date is None:
                 print(
                     f"{bcolors.WARNING}→ No entries available for viewing. Most likely no entries have been made yet, once entries exist, they will be shown here.{bcolors.ENDC}"
                 )
                 should_exit = True
                 prompt_continue()
                 continue
-            # Prompt for date selection from entries
-            date = prompt(
-                input_type="fuzzy",
-                message="Select an entry:",
-                choices=[Choice(date) for date in existing_dates],
-                default=existing_dates[0],
-                mandatory=True,
-                wrap_lines=True,
-                validate=lambda text: len(text) == 10
-                and datetime.strptime(text, "%Y-%m-%d"),
-                invalid_message="Start date must be in format YYYY-MM-DD.",
-                border=True,
-                cycle=True,
-            )
             # Get entry by date
-            entry = existing_entries[existing_entries["date"] == date].iloc[0]
+            entry = get_existing_entry(date)
             # Print entry details
             clear_terminal()
             print_title()
@@ -986,112 +1158,120 @@ def view_entry() -> None:
         raise e
 
 
-def show_stats() -> None:
+def add_holidays() -> None:
     """
-    Shows statistics of the existing entries in the database.
+    Adds holiday entries for all public holidays of a region since the start date.
 
     Args:
         None
 
     Returns:
         None
-
     """
     try:
         # Print header
         clear_terminal()
         print_title()
-        print(f"{bcolors.OKCYAN}{bcolors.UNDERLINE}→ SHOW STATS{bcolors.ENDC}\n")
-        # Get all existing entries
-        existing_entries = get_existing_entries()
-        # Get all existing dates formatted as YYYY-MM-DD from existing entries
-        existing_dates = sorted(
-            [date.strftime("%Y-%m-%d") for date in existing_entries["date"].tolist()],
-            reverse=True,
-        )
-        # Get missing dates, i.e. dates between start date and today that are not in the database
-        missing_entries = [
-            date.strftime("%Y-%m-%d")
-            for date in (
-                datetime.strptime(_config["start_date"], "%Y-%m-%d") + timedelta(days=i)
-                for i in range(
-                    (
-                        datetime.now()
-                        - datetime.strptime(_config["start_date"], "%Y-%m-%d")
-                    ).days
-                    + 1
-                )
-            )
-            if date.strftime("%A") in _config["work_days"]
-            and date.strftime("%Y-%m-%d") not in set(existing_dates)
-        ]
-        # Entries by category
-        entries_by_category_work = len(
-            existing_entries[existing_entries["event_type"] == "Work"]
-        )
-        entries_by_category_work_percentage = round(
-            entries_by_category_work / len(existing_entries) * 100
-        )
-        entries_by_category_vacation = len(
-            existing_entries[existing_entries["event_type"] == "Vacation"]
-        )
-        entries_by_category_vacation_percentage = round(
-            entries_by_category_vacation / len(existing_entries) * 100
-        )
-        entries_by_category_public_holiday = len(
-            existing_entries[
-                existing_entries["event_type"] == "Public / Company Holiday"
-            ]
+        print(
+            f"{bcolors.OKCYAN}{bcolors.UNDERLINE}→ ADD PUBLIC HOLIDAYS{bcolors.ENDC}\n"
         )
-        entries_by_category_public_holiday_percentage = round(
-            entries_by_category_public_holiday / len(existing_entries) * 100
+        print(
+            f"{bcolors.WARNING}→ Holidays on work days without an entry are added as '{bcolors.ENDC}Public / Company Holiday{bcolors.WARNING}' entries.{bcolors.ENDC}\n"
         )
-        entries_by_category_sick_leave = len(
-            existing_entries[existing_entries["event_type"] == "Sick Leave"]
+        region = prompt(
+            input_type="select",
+            message="Select a public holiday region:",
+            choices=list(HOLIDAY_REGIONS),
+            default=_config.holiday_region,
+            mandatory=True,
+            wrap_lines=True,
+            show_cursor=False,
+            border=True,
         )
-        entries_by_category_sick_leave_percentage = round(
-            entries_by_category_sick_leave / len(existing_entries) * 100
+        start_spinner(
+            "Adding holidays",
+            "Successfully added holidays.\n",
+            "Failed to add holidays.",
         )
-        entries_by_category_overtime_compensation = len(
-            existing_entries[existing_entries["event_type"] == "Overtime Compensation"]
+        # Get a cursor on the DuckDB session
+        connection = get_db_connection()
+        # Compute holidays & insert all missing ones in a single transaction
+        result = fill_holidays(connection, _config, datetime.now().date(), region)
+        # Close the cursor
+        connection.close()
+        stop_spinner(True)
+        # Print summary
+        print(
+            f"{bcolors.ORANGE}‣ Added Holidays:        {bcolors.ENDC}{bcolors.OKGREEN}{len(result['added'])}{bcolors.ENDC}"
         )
-        entries_by_category_overtime_compensation_percentage = round(
-            entries_by_category_overtime_compensation / len(existing_entries) * 100
+        for date, name in result["added"]:
+            print(f"   - {date} ({name})")
+        print(
+            f"{bcolors.ORANGE}‣ Existing Entries:      {bcolors.ENDC}{len(result['existing'])}"
         )
-        # Total balance
-        total_balance = existing_entries["day_balance_minutes"].sum()
+        for date, name in result["existing"]:
+            print(f"   - {date} ({name})")
+        prompt_continue()
+    except Exception as e:
+        raise e
+
+
+def show_stats() -> None:
+    """
+    Shows statistics of the existing entries in the database.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    try:
+        # Print header
+        clear_terminal()
+        print_title()
+        print(f"{bcolors.OKCYAN}{bcolors.UNDERLINE}→ SHOW STATS{bcolors.ENDC}\n")
+        # Get aggregated statistics
+        stats = get_entry_stats()
+        # Get missing dates, i.e. dates between start date and today that are not in the database
+        missing_entries = get_missing_entries()
+        # Entries by category
+        entries_by_category = stats["entries_by_event_type"]
+        # Total balance (materialized, O(1) lookup)
+        total_balance = get_total_balance()
         # Total times
-        total_time_worked = existing_entries["actual_total_minutes"].sum()
-        total_time_expected = existing_entries["expected_total_minutes"].sum()
+        total_time_worked = stats["total_worked_minutes"]
+        total_time_expected = stats["total_expected_minutes"]
         # Print statistics
         print()
         print(
-            f"{bcolors.ORANGE}‣ User:                  {bcolors.ENDC}{bcolors.OKCYAN}{_config['name']}{bcolors.ENDC}"
+            f"{bcolors.ORANGE}‣ User:                  {bcolors.ENDC}{bcolors.OKCYAN}{_config.name}{bcolors.ENDC}"
         )
-        print(" ------------------------" + "-" * len(_config["name"]))
+        print(" ------------------------" + "-" * len(_config.name))
         print(
-            f"{bcolors.ORANGE}‣ Total Entries:         {bcolors.ENDC}{bcolors.OKGREEN if len(missing_entries) == 0 else bcolors.ORANGE}{len(existing_entries)}{bcolors.ENDC} since {bcolors.WARNING}{_config['start_date']}{bcolors.ENDC}"
+            f"{bcolors.ORANGE}‣ Total Entries:         {bcolors.ENDC}{bcolors.OKGREEN if len(missing_entries) == 0 else bcolors.ORANGE}{stats['total_entries']}{bcolors.ENDC} since {bcolors.WARNING}{_config.start_date}{bcolors.ENDC}"
         )
         print(
             f"{bcolors.ORANGE}‣ Missing Entries:       {bcolors.ENDC}{bcolors.FAIL if len(missing_entries) != 0 else ""}{len(missing_entries)}{bcolors.ENDC}"
         )
         print(f"{bcolors.ORANGE}‣ Entries by Category    {bcolors.ENDC}")
         print(
-            f"{bcolors.ORANGE}   - Work:               {bcolors.ENDC}{entries_by_category_work} ({entries_by_category_work_percentage}%)"
+            f"{bcolors.ORANGE}   - Work:               {bcolors.ENDC}{entries_by_category['Work']['count']} ({entries_by_category['Work']['percentage']}%)"
         )
         print(
-            f"{bcolors.ORANGE}   - Vacation:           {bcolors.ENDC}{entries_by_category_vacation} ({entries_by_category_vacation_percentage}%)"
+            f"{bcolors.ORANGE}   - Vacation:           {bcolors.ENDC}{entries_by_category['Vacation']['count']} ({entries_by_category['Vacation']['percentage']}%)"
         )
         print(
-            f"{bcolors.ORANGE}   - Public Holiday:     {bcolors.ENDC}{entries_by_category_public_holiday} ({entries_by_category_public_holiday_percentage}%)"
+            f"{bcolors.ORANGE}   - Public Holiday:     {bcolors.ENDC}{entries_by_category['Public / Company Holiday']['count']} ({entries_by_category['Public / Company Holiday']['percentage']}%)"
         )
         print(
-            f"{bcolors.ORANGE}   - Sick Leave:         {bcolors.ENDC}{entries_by_category_sick_leave} ({entries_by_category_sick_leave_percentage}%)"
+            f"{bcolors.ORANGE}   - Sick Leave:         {bcolors.ENDC}{entries_by_category['Sick Leave']['count']} ({entries_by_category['Sick Leave']['percentage']}%)"
         )
         print(
-            f"{bcolors.ORANGE}   - Overtime Comp.:     {bcolors.ENDC}{entries_by_category_overtime_compensation} ({entries_by_category_overtime_compensation_percentage}%)"
+            f"{bcolors.ORANGE}   - Overtime Comp.:     {bcolors.ENDC}{entries_by_category['Overtime Compensation']['count']} ({entries_by_category['Overtime Compensation']['percentage']}%)"
         )
-        print(" ------------------------" + "-" * len(_config["name"]))
+        print(" ------------------------" + "-" * len(_config.name))
         print(
             f"{bcolors.ORANGE}‣ Total Balance:         {bcolors.ENDC}{bcolors.OKGREEN if total_balance >= 0 else bcolors.FAIL}{total_balance // 60}h {total_balance % 60}min"
         )
@@ -1150,19 +1330,50 @@ def edit_config() -> None:
             print_title()
             print(f"{bcolors.OKCYAN}{bcolors.UNDERLINE}→ EDIT CONFIG{bcolors.ENDC}\n")
             # Edit config with default values
-            config = create_config(_config)
-            # Write config to json file
+            connection = get_db_connection()
+            taken_names = [
+                name
+                for user_id, name in list_users(connection)
+                if user_id != _config.user_id
+            ]
+            connection.close()
+            config = create_config(_config.as_dict(), taken_names)
+            config["user_id"] = _config.user_id
+            # Write config to the 'users' table
             save_config(config)
             print(
                 f"{bcolors.OKGREEN}✔ Successfully updated user configuration.{bcolors.ENDC}"
             )
             # Load and validate config
-            load_validate_config()
+            load_validate_config(_config.user_id)
             prompt_continue()
     except Exception as e:
         raise e
 
 
+def switch_user() -> None:
+    """
+    Switches to another user or creates a new one.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    try:
+        # Print header
+        clear_terminal()
+        print_title()
+        print(f"{bcolors.OKCYAN}{bcolors.UNDERLINE}→ SWITCH USER{bcolors.ENDC}\n")
+        print(f"{bcolors.ORANGE}‣ Current User:    {bcolors.ENDC}{_config.name}\n")
+        # Select and apply the user's config
+        load_validate_config(select_user(switching=True))
+        prompt_continue()
+    except Exception as e:
+        raise e
+
+
 def export_stats() -> None:
     """
     Exports the statistics to a file.
@@ -1178,94 +1389,262 @@ def export_stats() -> None:
         clear_terminal()
         print_title()
         print(f"{bcolors.OKCYAN}{bcolors.UNDERLINE}→ EXPORT STATS{bcolors.ENDC}\n")
-        thread_export_stats = spawn_loading_spinner_thread(
+        start_spinner(
             "Exporting stats",
             "Successfully exported stats.\n",
             "Failed to export stats.",
         )
-        _threads.append(thread_export_stats)
-        # Get all existing entries
-        existing_entries = get_existing_entries()
-        # Get all existing dates formatted as YYYY-MM-DD from existing entries
-        existing_dates = sorted(
-            [date.strftime("%Y-%m-%d") for date in existing_entries["date"].tolist()],
-            reverse=True,
-        )
         # Get missing dates between start date and today that are not in the database
-        missing_entries = [
-            date.strftime("%Y-%m-%d")
-            for date in (
-                datetime.strptime(_config["start_date"], "%Y-%m-%d") + timedelta(days=i)
-                for i in range(
-                    (
-                        datetime.now()
-                        - datetime.strptime(_config["start_date"], "%Y-%m-%d")
-                    ).days
-                    + 1
-                )
-            )
-            if date.strftime("%A") in _config["work_days"]
-            and date.strftime("%Y-%m-%d") not in set(existing_dates)
-        ]
+        missing_entries = get_missing_entries()
         # Prepare data for export
-        # Entries --- --- --- --- ---
-        existing_entries["date"].apply(lambda x: x.strftime("%Y-%m-%d"))
-        existing_entries = existing_entries.sort_values(by=["date"], ascending=True)
-        existing_entries = existing_entries.drop(
-            columns=[
-                "uuid",
-                "day_of_week",
-                "expected_total_minutes_work_default",
-                "created_at",
-                "updated_at",
-            ]
-        )
-        existing_entries = existing_entries.rename(
-            columns={
-                "date": "Date",
-                "event_type": "Event Type",
-                "clock_in": "Clock In",
-                "clock_out": "Clock Out",
-                "break_time_minutes": "Break Time (minutes)",
-                "expected_total_minutes": "Expected Total (minutes)",
-                "actual_total_minutes": "Actual Total (minutes)",
-                "day_balance_minutes": "Balance (minutes)",
-            }
-        )
         # Summary --- --- --- --- ---
-        total_balance = existing_entries["Balance (minutes)"].sum()
-        summary = pd.DataFrame(
-            {
-                "Name": [_config["name"]],
-                "Start Date": [_config["start_date"]],
-                "Work Days": [", ".join(_config["work_days"])],
-                "Weekly Work (hours)": [_config["weekly_work_minutes"] / 60],
-                "Daily Break (minutes)": [_config["daily_break_minutes"]],
-                "Total Entries": [len(existing_entries)],
-                "Missing Entries": [len(missing_entries)],
-                "Total Balance (hours)": [
-                    f"{total_balance // 60}h {total_balance % 60}min"
-                ],
-                "Timesheet Generated": [datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
-            }
-        )
-        summary = summary.transpose()
-        # Export to Excel
-        with pd.ExcelWriter(
+        stats = get_entry_stats()
+        total_balance = get_total_balance()
+        summary = build_summary(_config, stats, len(missing_entries), total_balance)
+        # Export to Excel, streaming entries from the database in batches
+        connection = get_db_connection()
+        export_timesheet(
+            connection,
+            _config.user_id,
             os.path.join(
                 OUT_PATH,
                 f"timesheet_{datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}.xlsx",
             ),
-            engine="openpyxl",
-        ) as writer:
-            summary.to_excel(writer, sheet_name="Summary", header=False, index=True)
-            existing_entries.to_excel(writer, sheet_name="Entries", index=False)
-        terminate_loading_spinner_thread(thread_export_stats, True)
+            summary,
+        )
+        # Close the cursor
+        connection.close()
+        stop_spinner(True)
+        prompt_continue()
+    except Exception as e:
+        raise e
+
+
+def export_all_stats() -> None:
+    """
+    Exports one timesheet per user to the output folder, in parallel worker processes.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    try:
+        # Print header
+        clear_terminal()
+        print_title()
+        print(
+            f"{bcolors.OKCYAN}{bcolors.UNDERLINE}→ EXPORT STATS (ALL USERS){bcolors.ENDC}\n"
+        )
+        # Bring calendars & balance rollups of all users up-to-date
+        connection = get_db_connection()
+        users = dict(list_users(connection))
+        prepare_batch_export(connection, list(users.keys()))
+        connection.close()
+        # Workers open read-only connections, which DuckDB only allows without a writer.
+        # The session reconnects on the next use.
+        _session.close()
+
+        def print_progress(done, total, user_id, result, error):
+            if error is None:
+                print(
+                    f"{bcolors.OKGREEN}✔ [{done}/{total}]{bcolors.ENDC} {result[0]} ({result[2]} entries)"
+                )
+            else:
+                print(
+                    f"{bcolors.FAIL}✗ [{done}/{total}]{bcolors.ENDC} {users[user_id]}: {error}"
+                )
+
+        result = export_timesheets(
+            os.path.join(RES_PATH, DB_FILE_NAME),
+            list(users.keys()),
+            OUT_PATH,
+            on_progress=print_progress,
+        )
+        # Print export summary
+        print()
+        print(
+            f"{bcolors.ORANGE}‣ Exported Timesheets:   {bcolors.ENDC}{bcolors.OKGREEN}{len(result['exported'])}{bcolors.ENDC} → {OUT_PATH}"
+        )
+        print(
+            f"{bcolors.ORANGE}‣ Failed Timesheets:     {bcolors.ENDC}{bcolors.FAIL if len(result['failed']) > 0 else ''}{len(result['failed'])}{bcolors.ENDC}"
+        )
+        for user_id, error in result["failed"].items():
+            print(f"   - {users[user_id]}: {error}")
+        prompt_continue()
+    except Exception as e:
+        raise e
+
+
+def import_data() -> None:
+    """
+    Bulk imports entries from a CSV, Excel or Parquet file.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    try:
+        # Print header
+        clear_terminal()
+        print_title()
+        print(f"{bcolors.OKCYAN}{bcolors.UNDERLINE}→ IMPORT ENTRIES{bcolors.ENDC}\n")
+        print(
+            f"{bcolors.WARNING}→ Expected columns: date, event_type and (for Work entries) clock_in, clock_out.{bcolors.ENDC}\n"
+        )
+        file_path = prompt(
+            input_type="text",
+            message="Enter the path of the file to import (.csv, .xlsx, .parquet): ",
+            mandatory=True,
+            wrap_lines=True,
+            filter=lambda text: os.path.expanduser(text.strip()),
+            validate=lambda text: os.path.isfile(os.path.expanduser(text.strip())),
+            invalid_message="File does not exist.",
+        )
+        start_spinner(
+            "Importing entries",
+            "Successfully imported entries.\n",
+            "Failed to import entries.",
+        )
+        # Get a cursor on the DuckDB session
+        connection = get_db_connection()
+        # Validate, compute & insert all rows in a single transaction
+        result = import_entries(connection, file_path, _config)
+        # Close the cursor
+        connection.close()
+        stop_spinner(True)
+        # Print import summary
+        print()
+        print(
+            f"{bcolors.ORANGE}‣ Imported Entries:      {bcolors.ENDC}{bcolors.OKGREEN}{result['imported']}{bcolors.ENDC}"
+        )
+        print(
+            f"{bcolors.ORANGE}‣ Duplicate Dates:       {bcolors.ENDC}{bcolors.WARNING if len(result['duplicate_dates']) > 0 else ''}{len(result['duplicate_dates'])}{bcolors.ENDC}"
+        )
+        for date in result["duplicate_dates"]:
+            print(f"   - {date}")
+        print(
+            f"{bcolors.ORANGE}‣ Invalid Rows:          {bcolors.ENDC}{bcolors.FAIL if len(result['invalid_rows']) > 0 else ''}{len(result['invalid_rows'])}{bcolors.ENDC}"
+        )
+        for row_number, raw_date, error in result["invalid_rows"]:
+            print(f"   - Row {row_number} ({raw_date}): {error}")
         prompt_continue()
     except Exception as e:
         raise e
 
 
+def export_data() -> None:
+    """
+    Exports entries (optionally filtered by date range) to a Parquet, CSV or Arrow IPC file.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    try:
+        # Print header
+        clear_terminal()
+        print_title()
+        print(f"{bcolors.OKCYAN}{bcolors.UNDERLINE}→ EXPORT ENTRIES{bcolors.ENDC}\n")
+        file_format = prompt(
+            input_type="select",
+            message="Select an export format:",
+            choices=[
+                Choice("parquet", name="Parquet (zstd compressed)"),
+                Choice("csv", name="CSV"),
+            ]
+            # Arrow IPC needs the optional pyarrow package
+            + ([Choice("arrow", name="Arrow IPC")] if ARROW_AVAILABLE else []),
+            default="parquet",
+            mandatory=True,
+            wrap_lines=True,
+            show_cursor=False,
+            border=True,
+        )
+        start_date = prompt(
+            input_type="text",
+            message="Enter the first date to export (YYYY-MM-DD, empty for all): ",
+            wrap_lines=True,
+            validate=lambda text: len(text) == 0
+            or (len(text) == 10 and datetime.strptime(text, "%Y-%m-%d")),
+            invalid_message="Date must be in format YYYY-MM-DD.",
+        )
+        end_date = prompt(
+            input_type="text",
+            message="Enter the last date to export (YYYY-MM-DD, empty for all): ",
+            wrap_lines=True,
+            validate=lambda text: len(text) == 0
+            or (len(text) == 10 and datetime.strptime(text, "%Y-%m-%d")),
+            invalid_message="Date must be in format YYYY-MM-DD.",
+        )
+        start_spinner(
+            "Exporting entries",
+            "Successfully exported entries.\n",
+            "Failed to export entries.",
+        )
+        file_path = os.path.join(
+            OUT_PATH,
+            f"entries_{datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}.{file_format}",
+        )
+        # Get a cursor on the DuckDB session
+        connection = get_db_connection()
+        # Write file directly from DuckDB
+        exported = export_entries(
+            connection,
+            _config.user_id,
+            file_path,
+            file_format,
+            start_date or None,
+            end_date or None,
+        )
+        # Close the cursor
+        connection.close()
+        stop_spinner(True)
+        print(
+            f"{bcolors.ORANGE}‣ Exported Entries:      {bcolors.ENDC}{bcolors.OKGREEN}{exported}{bcolors.ENDC} → {file_path}"
+        )
+        prompt_continue()
+    except Exception as e:
+        raise e
+
+
+def get_main_menu_choices() -> list:
+    """
+    Returns the choices of the main menu.
+
+    Args:
+        None
+
+    Returns:
+        list: Main menu choices.
+    """
+    return [
+        Choice("ENTRY_NEW", name="Entry - New"),
+        Choice("ENTRY_EDIT", name="Entry - Edit"),
+        Choice("ENTRY_VIEW", name="Entry - View"),
+        Choice("ENTRY_HOLIDAYS", name="Entry - Add Holidays"),
+        Separator(),
+        Choice("STATS_SHOW", name="Stats - Show"),
+        Choice("STATS_EXPORT", name="Stats - Export"),
+        Choice("STATS_EXPORT_ALL", name="Stats - Export All Users"),
+        Separator(),
+        Choice("DATA_IMPORT", name="Data - Import"),
+        Choice("DATA_EXPORT", name="Data - Export"),
+        Separator(),
+        Choice("CONFIG_EDIT", name="Config - Edit"),
+        Choice("CONFIG_SWITCH_USER", name="Config - Switch User"),
+        Separator(),
+        # Choice("DANGER", name="DANGER ZONE"),
+        # Separator(),
+        Choice("EXIT", name="Exit"),
+    ]
+
+
 def main_menu_loop() -> None:
     """
     Trigger main menu loop.
@@ -1282,28 +1661,24 @@ def main_menu_loop() -> None:
         while not should_exit:
             clear_terminal()
             print_title()
+            set_action("MAIN_MENU")
+            # Report queued writes of the last action that failed
+            report_write_failures()
+            # Fold punches made while the menu was open into entries
+            if compact_punches():
+                prompt_continue()
+                continue
             selection = prompt(
                 input_type="select",
                 message="Select an option:",
-                choices=[
-                    Choice("ENTRY_NEW", name="Entry - New"),
-                    Choice("ENTRY_EDIT", name="Entry - Edit"),
-                    Choice("ENTRY_VIEW", name="Entry - View"),
-                    Separator(),
-                    Choice("STATS_SHOW", name="Stats - Show"),
-                    Choice("STATS_EXPORT", name="Stats - Export"),
-                    Separator(),
-                    Choice("CONFIG_EDIT", name="Config - Edit"),
-                    Separator(),
-                    # Choice("DANGER", name="DANGER ZONE"),
-                    # Separator(),
-                    Choice("EXIT", name="Exit"),
-                ],
+                choices=get_main_menu_choices(),
                 mandatory=True,
                 wrap_lines=True,
                 show_cursor=False,
                 border=True,
             )
+            # Tag all spans of the selected action
+            set_action(selection)
             match selection:
                 case "ENTRY_NEW":
                     add_entry()
@@ -1311,12 +1686,22 @@ def main_menu_loop() -> None:
                     edit_entry()
                 case "ENTRY_VIEW":
                     view_entry()
+                case "ENTRY_HOLIDAYS":
+                    add_holidays()
                 case "STATS_SHOW":
                     show_stats()
                 case "STATS_EXPORT":
                     export_stats()
+                case "STATS_EXPORT_ALL":
+                    export_all_stats()
+                case "DATA_IMPORT":
+                    import_data()
+                case "DATA_EXPORT":
+                    export_data()
                 case "CONFIG_EDIT":
                     edit_config()
+                case "CONFIG_SWITCH_USER":
+                    switch_user()
                 # @TODO: Implement DANGER ZONE (db imports, exports, deletes, etc.)
                 # case "DANGER":
                 #     clear_terminal()
@@ -1334,21 +1719,35 @@ def main_menu_loop() -> None:
 
 if __name__ == "__main__":
     try:
+        # OPT-IN TRACING (spans are written as JSON lines to LOG_PATH)
+        if "--trace" in sys.argv:
+            enable_tracing()
         # CLEAR TERMINAL
         clear_terminal()
         # PRINT TITLE
         print_title()
-        # INITIALIZE DATABASE & CONFIGURATION
-        initialize()
-        # PRINT MAIN MENU
-        main_menu_loop()
+        _profiler.lap("Title render")
+        # STARTUP PROFILING MODE (non-interactive, prints per-phase wall times)
+        if "--profile-startup" in sys.argv:
+            initialize(interactive=False)
+            # Build (but don't run) the main menu prompt
+            inquirer.select(
+                message="Select an option:", choices=get_main_menu_choices()
+            )
+            _profiler.lap("Menu render")
+            _profiler.report(as_json="--json" in sys.argv)
+        else:
+            # INITIALIZE DATABASE & CONFIGURATION
+            initialize()
+            # PRINT MAIN MENU
+            main_menu_loop()
     # Catch CTRL + C and exit gracefully
     except KeyboardInterrupt:
-        terminate_threads(_threads)
+        stop_spinner(False)
         graceful_exit(success=False)
     # Catch all other exceptions
     except Exception:
-        terminate_threads(_threads)
+        stop_spinner(False)
         print(
             f"{bcolors.FAIL}\n✗ Check {LOG_PATH} for additional details.{bcolors.ENDC}"
         )
@@ -0,0 +1,48 @@
+# STANDARD LIBRARY IMPORTS
+import os
+import tempfile
+
+# Resources (database, legacy config, punch journal) of the tests live in a temporary folder,
+# set before any util module reads RES_PATH
+os.environ["TEMPS_RES_PATH"] = tempfile.mkdtemp(prefix="temps-tests-")
+
+# THIRD PARTY IMPORTS
+import duckdb as ddb
+import pytest
+
+# UTIL IMPORTS
+from utils.schema import ensure_schema
+from utils.rollups import ensure_rollups
+from utils.calendar_table import refresh_calendar
+from utils.user_config import save_user, load_config
+
+TEST_USER = {
+    "name": "Tester",
+    "start_date": "2026-09-01",
+    "weekly_work_minutes": 2400.0,
+    "work_days": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
+    "daily_break_minutes": 30,
+    "expected_daily_total_minutes": 510,
+}
+
+
+@pytest.fixture
+def connection() -> ddb.DuckDBPyConnection:
+    """
+    In-memory database at the latest schema version with balance rollups.
+    """
+    connection = ddb.connect()
+    ensure_schema(connection)
+    ensure_rollups(connection)
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def config(connection: ddb.DuckDBPyConnection) -> any:
+    """
+    Configuration of a test user with an up-to-date calendar.
+    """
+    config = load_config(connection, save_user(connection, TEST_USER))
+    refresh_calendar(connection, config.user_id, config.start_date, config.work_days)
+    return config
@@ -0,0 +1,33 @@
+# THIRD PARTY IMPORTS
+import pytest
+
+# UTIL IMPORTS
+from utils.calendar_table import refresh_calendar
+
+
+def test_calendar_is_regenerated_when_work_days_change(connection, config):
+    assert not refresh_calendar(
+        connection, config.user_id, config.start_date, config.work_days
+    )
+    assert refresh_calendar(
+        connection, config.user_id, "2026-09-07", ["Monday", "Wednesday"]
+    )
+
+    assert (
+        connection.execute(
+            f"""
+        SELECT min(date), count(*) FILTER (WHERE is_work_day AND date < DATE '2026-09-14')
+        FROM calendar
+        WHERE user_id = {config.user_id};
+        """
+        ).fetchone()
+        == (config.start_date.replace(day=7), 2)
+    )
+    assert connection.execute(
+        "SELECT start_date, work_days FROM calendar_meta;"
+    ).fetchone() == (config.start_date.replace(day=7), ["Monday", "Wednesday"])
+
+
+def test_unknown_work_day(connection, config):
+    with pytest.raises(ValueError):
+        refresh_calendar(connection, config.user_id, config.start_date, ["Someday"])
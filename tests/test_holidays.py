@@ -0,0 +1,100 @@
+# STANDARD LIBRARY IMPORTS
+from datetime import date
+
+# THIRD PARTY IMPORTS
+import pytest
+
+# UTIL IMPORTS
+from utils.holidays import (
+    get_easter_sunday,
+    get_nth_weekday,
+    get_holidays,
+    fill_holidays,
+)
+from utils.importer import import_entries
+from utils.rollups import rebuild_rollups
+
+
+@pytest.mark.parametrize(
+    "year, easter_sunday",
+    [
+        (2019, date(2019, 4, 21)),
+        (2024, date(2024, 3, 31)),
+        (2025, date(2025, 4, 20)),
+        (2038, date(2038, 4, 25)),
+    ],
+)
+def test_easter_sunday(year, easter_sunday):
+    assert get_easter_sunday(year) == easter_sunday
+
+
+@pytest.mark.parametrize(
+    "month, weekday, nth, day",
+    [
+        (5, 0, -1, date(2025, 5, 26)),
+        (11, 3, 4, date(2025, 11, 27)),
+        (12, 0, -1, date(2025, 12, 29)),
+        (9, 0, 1, date(2025, 9, 1)),
+    ],
+)
+def test_nth_weekday(month, weekday, nth, day):
+    assert get_nth_weekday(2025, month, weekday, nth) == day
+
+
+def test_easter_offset_rules():
+    holidays = dict(get_holidays("DE", 2025))
+
+    assert holidays[date(2025, 4, 18)] == "Good Friday"
+    assert holidays[date(2025, 5, 29)] == "Ascension Day"
+    assert holidays[date(2025, 6, 9)] == "Whit Monday"
+
+
+def test_next_weekday_skips_other_observed_holidays():
+    holidays_2021 = dict(get_holidays("GB-ENG", 2021))
+    holidays_2022 = dict(get_holidays("GB-ENG", 2022))
+
+    assert holidays_2021[date(2021, 12, 27)] == "Christmas Day (observed)"
+    assert holidays_2021[date(2021, 12, 28)] == "Boxing Day (observed)"
+    assert holidays_2022[date(2022, 1, 3)] == "New Year's Day (observed)"
+    assert holidays_2022[date(2022, 12, 26)] == "Boxing Day"
+    assert holidays_2022[date(2022, 12, 27)] == "Christmas Day (observed)"
+
+
+def test_nearest_weekday_and_first_year():
+    holidays_2021 = dict(get_holidays("US", 2021))
+
+    assert holidays_2021[date(2021, 6, 18)] == "Juneteenth (observed)"
+    assert dict(get_holidays("US", 2022))[date(2021, 12, 31)] == (
+        "New Year's Day (observed)"
+    )
+    assert "Juneteenth" not in dict(get_holidays("US", 2020)).values()
+
+
+def test_unknown_region():
+    with pytest.raises(ValueError):
+        get_holidays("XX", 2025)
+
+
+def test_fill_holidays_maintains_rollups(connection, config, tmp_path):
+    # Labor Day already has an entry, Columbus Day is added
+    file_path = tmp_path / "entries.csv"
+    file_path.write_text("date,event_type\n2026-09-07,Vacation\n2026-09-08,Vacation\n")
+    import_entries(connection, str(file_path), config)
+
+    result = fill_holidays(connection, config, date(2026, 11, 1), "US")
+    again = fill_holidays(connection, config, date(2026, 11, 1), "US")
+
+    assert result["added"] == [("2026-10-12", "Columbus Day")]
+    assert result["existing"] == [("2026-09-07", "Labor Day")]
+    assert again["added"] == []
+    rollups = connection.execute(
+        "SELECT * FROM balance_rollups ORDER BY ALL;"
+    ).fetchall()
+    total = connection.execute("SELECT * FROM balance_total;").fetchall()
+    assert total[0][1] == 3
+    rebuild_rollups(connection)
+    assert (
+        connection.execute("SELECT * FROM balance_rollups ORDER BY ALL;").fetchall()
+        == rollups
+    )
+    assert connection.execute("SELECT * FROM balance_total;").fetchall() == total
@@ -0,0 +1,62 @@
+# THIRD PARTY IMPORTS
+import pytest
+
+# UTIL IMPORTS
+from utils.importer import import_entries
+
+
+def test_invalid_row_does_not_shadow_valid_row_of_same_date(
+    connection, config, tmp_path
+):
+    file_path = tmp_path / "entries.csv"
+    file_path.write_text("date,event_type\n2026-09-03,Bogus\n2026-09-03,Vacation\n")
+
+    result = import_entries(connection, str(file_path), config)
+
+    assert result["imported"] == 1
+    assert result["duplicate_dates"] == []
+    assert [row[0] for row in result["invalid_rows"]] == [1]
+    assert connection.execute(
+        "SELECT event_type FROM times WHERE date = DATE '2026-09-03';"
+    ).fetchall() == [("Vacation",)]
+
+
+def test_second_valid_row_of_same_date_is_duplicate(connection, config, tmp_path):
+    file_path = tmp_path / "entries.csv"
+    file_path.write_text(
+        "date,event_type,clock_in,clock_out\n"
+        "2026-09-03,Work,08:00,16:30\n"
+        "2026-09-03,Vacation,,\n"
+    )
+
+    result = import_entries(connection, str(file_path), config)
+
+    assert result["imported"] == 1
+    assert result["duplicate_dates"] == ["2026-09-03"]
+    assert connection.execute(
+        "SELECT entries, balance_minutes FROM balance_total;"
+    ).fetchall() == [(1, 0)]
+
+
+def test_import_leaves_no_catalog_objects(connection, config, tmp_path):
+    file_path = tmp_path / "entries.csv"
+    file_path.write_text("date,event_type\n2026-09-03,Vacation\n")
+    invalid_file_path = tmp_path / "invalid.csv"
+    invalid_file_path.write_text("day\n2026-09-04\n")
+
+    import_entries(connection, str(file_path), config)
+    with pytest.raises(ValueError):
+        import_entries(connection, str(invalid_file_path), config)
+
+    assert (
+        connection.execute(
+            "SELECT view_name FROM duckdb_views() WHERE NOT internal;"
+        ).fetchall()
+        == []
+    )
+    assert (
+        connection.execute(
+            "SELECT table_name FROM duckdb_tables() WHERE temporary;"
+        ).fetchall()
+        == []
+    )
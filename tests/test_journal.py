@@ -0,0 +1,35 @@
+# STANDARD LIBRARY IMPORTS
+import os
+from datetime import datetime
+
+# UTIL IMPORTS
+import utils.entries
+from utils.journal import append_punch, compact_journal, get_journal_path, read_journal
+
+
+def test_punch_during_compaction_is_kept(connection, config, monkeypatch):
+    if os.path.exists(get_journal_path()):
+        os.remove(get_journal_path())
+    append_punch("in", at=datetime(2026, 9, 3, 8, 0))
+    append_punch("out", at=datetime(2026, 9, 3, 16, 30))
+    write_entries = utils.entries.write_entries
+
+    def write_entries_and_punch(connection, writes):
+        # Journal is not locked during the transaction, so punching doesn't block
+        append_punch("in", at=datetime(2026, 9, 4, 8, 0))
+        write_entries(connection, writes)
+
+    monkeypatch.setattr(utils.entries, "write_entries", write_entries_and_punch)
+
+    result = compact_journal(connection)
+
+    assert result == {"compacted": 1, "rejected": []}
+    assert connection.execute(
+        "SELECT clock_in, clock_out FROM times WHERE date = DATE '2026-09-03';"
+    ).fetchall() == [(480, 990)]
+    descriptor = os.open(get_journal_path(), os.O_RDONLY)
+    try:
+        assert b'"2026-09-04T08:00:00"' in read_journal(descriptor)
+        assert b"2026-09-03" not in read_journal(descriptor)
+    finally:
+        os.close(descriptor)
@@ -0,0 +1,24 @@
+# UTIL IMPORTS
+from utils.user_config import load_config, save_user
+from conftest import TEST_USER
+
+
+def test_expected_minutes_are_rounded_and_saved_unchanged(connection):
+    expected_daily_total_minutes = 2000 / 3 + 30
+    user_id = save_user(
+        connection,
+        {
+            **TEST_USER,
+            "weekly_work_minutes": 2000.0,
+            "work_days": ["Monday", "Wednesday", "Friday"],
+            "expected_daily_total_minutes": expected_daily_total_minutes,
+        },
+    )
+    config = load_config(connection, user_id)
+
+    assert config.expected_entry_minutes == 697
+    save_user(connection, config.as_dict())
+    assert (
+        load_config(connection, user_id).expected_daily_total_minutes
+        == expected_daily_total_minutes
+    )
@@ -0,0 +1,159 @@
+# STANDARD LIBRARY IMPORTS
+import os
+import re
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+# THIRD PARTY IMPORTS
+import duckdb as ddb
+
+# UTIL IMPORTS
+from utils.tracing import traced, get_action, set_action
+from utils.calendar_table import refresh_calendar, get_missing_dates
+from utils.rollups import ensure_rollups, get_balance
+from utils.stats import get_stats
+from utils.export import build_summary, export_timesheet
+from utils.user_config import UserConfig, load_config
+
+# Read-only connection of the current worker process, see _init_worker
+_worker_connection = None
+
+
+@traced("db")
+def prepare_batch_export(connection: ddb.DuckDBPyConnection, user_ids: list) -> None:
+    """
+    Brings all derived tables the timesheets are built from up-to-date.
+    Workers only hold read-only connections, so this has to happen before they are started.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Read-write connection to the DuckDB database.
+        user_ids (list): Ids of the users to export.
+
+    Returns:
+        None
+    """
+    ensure_rollups(connection)
+    for user_id in user_ids:
+        config = load_config(connection, user_id)
+        refresh_calendar(connection, user_id, config.start_date, config.work_days)
+
+
+def get_timesheet_file_path(out_path: str, config: UserConfig, timestamp: str) -> str:
+    """
+    Returns the path of a user's timesheet within a batch.
+
+    Args:
+        out_path (str): Output directory.
+        config (UserConfig): User configuration.
+        timestamp (str): Timestamp shared by all timesheets of the batch.
+
+    Returns:
+        str: Path of the .xlsx file.
+    """
+    # User names may contain punctuation (e.g. '/'), keep file names portable
+    name = re.sub(r"[^A-Za-z0-9]+", "-", config.name).strip("-")
+    return os.path.join(out_path, f"timesheet_{config.user_id}_{name}_{timestamp}.xlsx")
+
+
+def _init_worker(database_path: str, action: str) -> None:
+    """
+    Opens the read-only connection that a worker process uses for all of its timesheets.
+
+    Args:
+        database_path (str): Path to the DuckDB database file.
+        action (str): Menu action of the parent process, spans of the worker are tagged with it.
+
+    Returns:
+        None
+    """
+    global _worker_connection
+    set_action(action)
+    _worker_connection = ddb.connect(database_path, read_only=True)
+
+
+@traced("file")
+def _export_user_timesheet(user_id: int, out_path: str, timestamp: str) -> tuple:
+    """
+    Builds and writes the timesheet of a single user (runs in a worker process).
+
+    Args:
+        user_id (int): User id.
+        out_path (str): Output directory.
+        timestamp (str): Timestamp shared by all timesheets of the batch.
+
+    Returns:
+        tuple: (user name, file path, number of exported entries).
+    """
+    connection = _worker_connection.cursor()
+    try:
+        config = load_config(connection, user_id)
+        summary = build_summary(
+            config,
+            get_stats(connection, user_id),
+            len(get_missing_dates(connection, user_id)),
+            get_balance(connection, user_id)["balance_minutes"],
+        )
+        file_path = get_timesheet_file_path(out_path, config, timestamp)
+        exported = export_timesheet(connection, user_id, file_path, summary)
+        return config.name, file_path, exported
+    finally:
+        connection.close()
+
+
+def export_timesheets(
+    database_path: str,
+    user_ids: list,
+    out_path: str,
+    max_workers: int = None,
+    on_progress: callable = None,
+) -> dict:
+    """
+    Writes one timesheet per user into the output directory, fanned out across a process pool.
+
+    Every worker process opens its own read-only connection, so no process may hold a
+    read-write connection to the database while the batch runs. Call prepare_batch_export
+    and close all other connections first. A failing user does not abort the batch.
+
+    Args:
+        database_path (str): Path to the DuckDB database file.
+        user_ids (list): Ids of the users to export.
+        out_path (str): Output directory.
+        max_workers (int): Number of worker processes, defaults to the number of CPUs.
+        on_progress (callable): Called as on_progress(done, total, user_id, result, error) after each user.
+
+    Returns:
+        dict: Exported timesheets {user_id: (name, file path, entries)} and failures {user_id: error message}.
+    """
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    exported = {}
+    failed = {}
+    if len(user_ids) == 0:
+        return {"exported": exported, "failed": failed}
+    max_workers = min(max_workers or os.cpu_count() or 1, len(user_ids))
+    # Spawn fresh workers instead of forking, DuckDB's thread pool is not fork-safe
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(database_path, get_action()),
+    ) as executor:
+        futures = {
+            executor.submit(_export_user_timesheet, user_id, out_path, timestamp): (
+                user_id
+            )
+            for user_id in user_ids
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            user_id = futures[future]
+            result = None
+            error = None
+            try:
+                result = future.result()
+                exported[user_id] = result
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                failed[user_id] = error
+            if on_progress is not None:
+                on_progress(done, len(user_ids), user_id, result, error)
+    return {"exported": exported, "failed": failed}
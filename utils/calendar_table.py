@@ -0,0 +1,195 @@
+# STANDARD LIBRARY IMPORTS
+from datetime import date
+
+# THIRD PARTY IMPORTS
+import duckdb as ddb
+
+# UTIL IMPORTS
+from utils.tracing import traced
+from utils.queries import build_date_conditions, build_window
+from utils.user_config import WEEKDAYS
+
+
+@traced("db")
+def refresh_calendar(
+    connection: ddb.DuckDBPyConnection, user_id: int, start_date: any, work_days: list
+) -> bool:
+    """
+    Creates or regenerates a user's rows of the 'calendar' date dimension table.
+
+    The table holds one row per user and day from the user's start date until
+    the end of the current year, including the weekday and whether the day is
+    a work day. A user's rows are only regenerated when the start date or work
+    days differ from the ones they were built with, or when the current date
+    is past their last day.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_id (int): User id.
+        start_date (any): Start date, as date or formatted as YYYY-MM-DD.
+        work_days (list): Names of the configured work days, e.g. ["Monday"].
+
+    Returns:
+        bool: True if the calendar was regenerated, False if it was up-to-date.
+    """
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS calendar_meta (
+            user_id INTEGER NOT NULL PRIMARY KEY,
+            start_date DATE NOT NULL,
+            work_days VARCHAR[] NOT NULL,
+            end_date DATE NOT NULL,
+        );
+        CREATE TABLE IF NOT EXISTS calendar (
+            user_id INTEGER NOT NULL,
+            date DATE NOT NULL,
+            day_of_week VARCHAR NOT NULL,
+            is_work_day BOOLEAN NOT NULL,
+        );
+        """
+    )
+    # User id is embedded as an integer literal; binding query parameters
+    # makes the DuckDB client import pandas, which the fast CLI path avoids
+    meta = connection.execute(
+        f"SELECT start_date, work_days, end_date FROM calendar_meta WHERE user_id = {int(user_id)};"
+    ).fetchone()
+    is_current = (
+        meta is not None
+        and meta[0].strftime("%Y-%m-%d") == str(start_date)
+        and sorted(meta[1]) == sorted(work_days)
+        and date.today() <= meta[2]
+    )
+    if is_current:
+        return False
+    # Values are validated and embedded as literals; binding query parameters
+    # makes the DuckDB client import pandas, which the fast CLI path avoids
+    if any(day not in WEEKDAYS for day in work_days):
+        raise ValueError(f"Work days must be day names, e.g. {WEEKDAYS[0]}.")
+    user_id = int(user_id)
+    start_literal = f"DATE '{date.fromisoformat(str(start_date)).isoformat()}'"
+    work_days_literal = (
+        "[" + ", ".join(f"'{day}'" for day in work_days) + "]::VARCHAR[]"
+    )
+    # Regenerate the user's calendar rows and metadata in a single transaction.
+    # Rows are written per user in one block, so scans filtered by user_id can
+    # skip other users' row groups via min/max zonemaps.
+    connection.execute("BEGIN TRANSACTION;")
+    try:
+        connection.execute(f"DELETE FROM calendar WHERE user_id = {user_id};")
+        connection.execute(
+            f"""
+            INSERT INTO calendar
+            SELECT
+                {user_id} AS user_id,
+                CAST(day AS DATE) AS date,
+                dayname(day) AS day_of_week,
+                list_contains({work_days_literal}, dayname(day)) AS is_work_day
+            FROM generate_series(
+                {start_literal},
+                CAST(date_trunc('year', current_date) + INTERVAL 1 YEAR - INTERVAL 1 DAY AS DATE),
+                INTERVAL 1 DAY
+            ) AS days(day);
+            """
+        )
+        connection.execute(f"DELETE FROM calendar_meta WHERE user_id = {user_id};")
+        connection.execute(
+            f"""
+            INSERT INTO calendar_meta
+            SELECT {user_id}, {start_literal}, {work_days_literal}, coalesce(max(date), {start_literal})
+            FROM calendar
+            WHERE user_id = {user_id};
+            """
+        )
+        connection.execute("COMMIT;")
+    except Exception as e:
+        connection.execute("ROLLBACK;")
+        raise e
+    return True
+
+
+@traced("db")
+def get_missing_dates(
+    connection: ddb.DuckDBPyConnection,
+    user_id: int,
+    start_date: str = None,
+    end_date: str = None,
+    limit: int = None,
+    offset: int = 0,
+    descending: bool = False,
+) -> list:
+    """
+    Returns work days of a user up to today that have no entry, via an anti-join of 'calendar' against 'times'.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_id (int): User id.
+        start_date (str): Optional first date (inclusive) formatted as YYYY-MM-DD.
+        end_date (str): Optional last date (inclusive) formatted as YYYY-MM-DD.
+        limit (int): Maximum number of dates, None for all dates.
+        offset (int): Number of dates to skip.
+        descending (bool): Whether to return the newest dates first.
+
+    Returns:
+        list: Missing dates formatted as YYYY-MM-DD, in ascending order (unless descending).
+    """
+    return [
+        row[0]
+        for row in connection.execute(
+            f"""
+            SELECT strftime(calendar.date, '%Y-%m-%d')
+            FROM calendar
+            ANTI JOIN (
+                SELECT date FROM times WHERE user_id = {int(user_id)}
+            ) AS entries ON entries.date = calendar.date
+            WHERE {" AND ".join(get_missing_date_conditions(user_id, start_date, end_date))}
+            ORDER BY calendar.date{" DESC" if descending else ""}{build_window(limit, offset)};
+            """
+        ).fetchall()
+    ]
+
+
+@traced("db")
+def get_missing_months(connection: ddb.DuckDBPyConnection, user_id: int) -> list:
+    """
+    Returns the months that have missing work days, with the number of missing days per month.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_id (int): User id.
+
+    Returns:
+        list: (month formatted as YYYY-MM, missing days) tuples, newest month first.
+    """
+    return connection.execute(
+        f"""
+        SELECT strftime(calendar.date, '%Y-%m') AS month, count(*)
+        FROM calendar
+        ANTI JOIN (
+            SELECT date FROM times WHERE user_id = {int(user_id)}
+        ) AS entries ON entries.date = calendar.date
+        WHERE {" AND ".join(get_missing_date_conditions(user_id))}
+        GROUP BY month
+        ORDER BY month DESC;
+        """
+    ).fetchall()
+
+
+def get_missing_date_conditions(
+    user_id: int, start_date: str = None, end_date: str = None
+) -> list:
+    """
+    Builds the conditions selecting the calendar work days up to today that entries are expected for.
+
+    Args:
+        user_id (int): User id.
+        start_date (str): Optional first date (inclusive) formatted as YYYY-MM-DD.
+        end_date (str): Optional last date (inclusive) formatted as YYYY-MM-DD.
+
+    Returns:
+        list: SQL conditions.
+    """
+    return [
+        f"calendar.user_id = {int(user_id)}",
+        "calendar.is_work_day",
+        "calendar.date <= current_date",
+    ] + build_date_conditions("calendar.date", start_date, end_date)
@@ -0,0 +1,650 @@
+# STANDARD LIBRARY IMPORTS
+import os
+import sys
+import json
+import argparse
+import traceback
+from datetime import datetime
+
+# UTIL IMPORTS
+from utils.colors import bcolors
+from utils.tracing import SPAN_KINDS, enable_tracing, set_action
+from utils.config import (
+    RES_PATH,
+    DB_FILE_NAME,
+    USER_ENV_VAR,
+    OUT_PATH,
+    LOG_PATH,
+    EVENT_TYPES,
+    ARROW_AVAILABLE,
+)
+
+# Heavy third party packages (duckdb, openpyxl, pandas) are only imported by the
+# command handlers that need them, so e.g. `stats --json` never imports pandas.
+
+
+def build_parser(
+    default_user: str = os.environ.get(USER_ENV_VAR),
+) -> argparse.ArgumentParser:
+    """
+    Builds the argument parser for the non-interactive subcommands.
+
+    Args:
+        default_user (str): User name used without --user, defaults to $TEMPS_USER.
+
+    Returns:
+        argparse.ArgumentParser: Argument parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="temps",
+        description="Simple time tracking CLI. Run without arguments for the interactive menu.",
+    )
+    parser.add_argument(
+        "--user",
+        default=default_user,
+        help=f"User name (default: ${USER_ENV_VAR}, or the only existing user).",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Write timed spans as JSON lines to the logs folder (or set TEMPS_TRACE=1).",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    # ADD / EDIT --- --- --- --- ---
+    for command, help_text in [
+        ("add", "Add a new entry."),
+        ("edit", "Edit an existing entry."),
+    ]:
+        subparser = subparsers.add_parser(command, help=help_text)
+        subparser.add_argument("date", help="Entry date (YYYY-MM-DD).")
+        subparser.add_argument(
+            "--type",
+            dest="event_type",
+            default="Work",
+            choices=EVENT_TYPES,
+            help="Event type (default: Work).",
+        )
+        subparser.add_argument(
+            "--in", dest="clock_in", help="Clock in time (HH:MM), Work only."
+        )
+        subparser.add_argument(
+            "--out", dest="clock_out", help="Clock out time (HH:MM), Work only."
+        )
+    # PUNCH --- --- --- --- ---
+    subparser = subparsers.add_parser(
+        "punch", help="Punch in or out, without opening the database."
+    )
+    subparser.add_argument("event", choices=["in", "out"], help="Punch event.")
+    subparser.add_argument(
+        "--at", help="Time of today (HH:MM) to punch at (default: now)."
+    )
+    # STATS --- --- --- --- ---
+    subparser = subparsers.add_parser("stats", help="Show entry statistics.")
+    subparser.add_argument("--json", action="store_true", help="Print as JSON.")
+    subparser.add_argument("--from", dest="start_date", help="First date (YYYY-MM-DD).")
+    subparser.add_argument("--to", dest="end_date", help="Last date (YYYY-MM-DD).")
+    # EXPORT --- --- --- --- ---
+    subparser = subparsers.add_parser("export", help="Export entries to a file.")
+    subparser.add_argument(
+        "--format",
+        dest="file_format",
+        default="xlsx",
+        choices=["xlsx", "parquet", "csv"] + (["arrow"] if ARROW_AVAILABLE else []),
+        help="Export format (default: xlsx timesheet).",
+    )
+    subparser.add_argument("--from", dest="start_date", help="First date (YYYY-MM-DD).")
+    subparser.add_argument("--to", dest="end_date", help="Last date (YYYY-MM-DD).")
+    subparser.add_argument(
+        "--output", help="Output file path (output directory with --all-users)."
+    )
+    subparser.add_argument(
+        "--all-users",
+        action="store_true",
+        help="Write one xlsx timesheet per user, in parallel.",
+    )
+    subparser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of worker processes for --all-users (default: number of CPUs).",
+    )
+    # MISSING --- --- --- --- ---
+    subparser = subparsers.add_parser("missing", help="List missing entries.")
+    subparser.add_argument("--json", action="store_true", help="Print as JSON.")
+    # IMPORT --- --- --- --- ---
+    subparser = subparsers.add_parser(
+        "import", help="Bulk import entries from a CSV, Excel or Parquet file."
+    )
+    subparser.add_argument("file_path", help="File to import.")
+    # HOLIDAYS --- --- --- --- ---
+    subparser = subparsers.add_parser(
+        "holidays",
+        help="Add entries for the public holidays since the start date.",
+    )
+    subparser.add_argument(
+        "--region",
+        help="Holiday region, e.g. DE-BY (default: the user's holiday region).",
+    )
+    # TRACE REPORT --- --- --- --- ---
+    subparser = subparsers.add_parser(
+        "trace-report", help="Summarize recorded spans by action and kind."
+    )
+    subparser.add_argument(
+        "file_paths",
+        nargs="*",
+        help="Trace files (default: all trace files in the logs folder).",
+    )
+    # SERVE --- --- --- --- ---
+    subparsers.add_parser(
+        "serve",
+        help="Keep the database open and answer subcommands over a local socket.",
+    )
+    return parser
+
+
+def open_database(user_name: str = None, load_user: bool = True) -> tuple:
+    """
+    Opens the database session and loads the configuration of the selected user.
+
+    Args:
+        user_name (str): Optional user name, required if multiple users exist.
+        load_user (bool): Whether to load a user configuration, commands across all users don't need one.
+
+    Returns:
+        tuple: (DatabaseSession, user configuration dict or None).
+    """
+    if not os.path.exists(os.path.join(RES_PATH, DB_FILE_NAME)):
+        raise ValueError(
+            "No database found. Run temps without arguments once to set it up."
+        )
+    from utils.db import DatabaseSession
+    from utils.schema import ensure_schema
+    from utils.journal import compact_journal
+    from utils.user_config import resolve_user, load_config
+
+    session = DatabaseSession(os.path.join(RES_PATH, DB_FILE_NAME))
+    connection = session.cursor()
+    try:
+        # Single-row schema version read, databases of earlier versions are upgraded in place
+        ensure_schema(connection)
+        # Fold completed punches into entries
+        report_compaction(compact_journal(connection))
+        config = (
+            load_config(connection, resolve_user(connection, user_name))
+            if load_user
+            else None
+        )
+    except Exception as e:
+        connection.close()
+        session.close()
+        raise e
+    connection.close()
+    return session, config
+
+
+def report_compaction(result: dict) -> None:
+    """
+    Prints the punches that a journal compaction dropped.
+
+    Args:
+        result (dict): Result of compact_journal.
+
+    Returns:
+        None
+    """
+    from utils.journal import describe_punch
+
+    for event, reason in result["rejected"]:
+        print(
+            f"{bcolors.WARNING}→ {describe_punch(event)} dropped: {reason}{bcolors.ENDC}",
+            file=sys.stderr,
+        )
+
+
+def command_punch(args: argparse.Namespace) -> None:
+    """
+    Handles the 'punch' subcommand. Only appends to the punch journal, entries are written on the next compaction.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+
+    Returns:
+        None
+    """
+    from utils.journal import append_punch
+
+    at = None
+    if args.at:
+        try:
+            at = datetime.combine(
+                datetime.now().date(), datetime.strptime(args.at, "%H:%M").time()
+            )
+        except ValueError:
+            raise ValueError("--at must be in format HH:MM.")
+    at = append_punch(args.event, args.user, at)
+    print(f"✔ Punched {args.event} at {at.strftime('%H:%M')}.")
+
+
+def command_add_edit(args: argparse.Namespace, connection: any, config: any) -> None:
+    """
+    Handles the 'add' and 'edit' subcommands.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        config (UserConfig): User configuration.
+
+    Returns:
+        None
+    """
+    from utils.rollups import ensure_rollups
+    from utils.entries import validate_entry, insert_entry, update_entry
+
+    validate_entry(args.date, args.event_type, args.clock_in, args.clock_out)
+    ensure_rollups(connection)
+    if args.command == "add":
+        if not config.is_work_day(datetime.strptime(args.date, "%Y-%m-%d").date()):
+            raise ValueError(f"{args.date} is not a work day since the start date.")
+        if connection.execute(
+            "SELECT count(*) FROM times WHERE user_id = ? AND date = ?;",
+            [config.user_id, args.date],
+        ).fetchone()[0]:
+            raise ValueError(
+                f"An entry for {args.date} already exists. Use 'edit' instead."
+            )
+        insert_entry(
+            connection,
+            args.date,
+            args.event_type,
+            args.clock_in,
+            args.clock_out,
+            config,
+        )
+        print(f"✔ Added {args.event_type} entry for {args.date}.")
+    else:
+        update_entry(
+            connection,
+            config.user_id,
+            args.date,
+            args.event_type,
+            args.clock_in,
+            args.clock_out,
+        )
+        print(f"✔ Updated entry for {args.date}.")
+
+
+def command_stats(args: argparse.Namespace, connection: any, config: any) -> None:
+    """
+    Handles the 'stats' subcommand.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        config (UserConfig): User configuration.
+
+    Returns:
+        None
+    """
+    from utils.calendar_table import refresh_calendar, get_missing_dates
+    from utils.stats import get_stats
+
+    refresh_calendar(connection, config.user_id, config.start_date, config.work_days)
+    stats = get_stats(connection, config.user_id, args.start_date, args.end_date)
+    stats = {
+        "name": config.name,
+        "start_date": config.start_date.strftime("%Y-%m-%d"),
+        "missing_entries": len(get_missing_dates(connection, config.user_id)),
+        **stats,
+    }
+    if args.json:
+        print(json.dumps(stats))
+        return
+    print(f"User:                {stats['name']}")
+    print(f"Total Entries:       {stats['total_entries']}")
+    print(f"Missing Entries:     {stats['missing_entries']}")
+    for event_type, entries in stats["entries_by_event_type"].items():
+        print(f"  {event_type + ':':<26}{entries['count']} ({entries['percentage']}%)")
+    balance = stats["total_balance_minutes"]
+    print(f"Total Balance:       {balance // 60}h {balance % 60}min")
+    print(f"Total Time Worked:   {stats['total_worked_minutes']}min")
+    print(f"Total Time Expected: {stats['total_expected_minutes']}min")
+
+
+def command_export(args: argparse.Namespace, connection: any, config: any) -> None:
+    """
+    Handles the 'export' subcommand.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        config (UserConfig): User configuration.
+
+    Returns:
+        None
+    """
+    from utils.export import export_entries
+
+    os.makedirs(OUT_PATH, exist_ok=True)
+    prefix = "timesheet" if args.file_format == "xlsx" else "entries"
+    file_path = args.output or os.path.join(
+        OUT_PATH,
+        f"{prefix}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.{args.file_format}",
+    )
+    if args.file_format == "xlsx":
+        if args.start_date or args.end_date:
+            raise ValueError("--from/--to are only supported for columnar formats.")
+        from utils.calendar_table import refresh_calendar, get_missing_dates
+        from utils.rollups import ensure_rollups, get_balance
+        from utils.stats import get_stats
+        from utils.export import build_summary, export_timesheet
+
+        refresh_calendar(
+            connection, config.user_id, config.start_date, config.work_days
+        )
+        ensure_rollups(connection)
+        summary = build_summary(
+            config,
+            get_stats(connection, config.user_id),
+            len(get_missing_dates(connection, config.user_id)),
+            get_balance(connection, config.user_id)["balance_minutes"],
+        )
+        exported = export_timesheet(connection, config.user_id, file_path, summary)
+    else:
+        exported = export_entries(
+            connection,
+            config.user_id,
+            file_path,
+            args.file_format,
+            args.start_date,
+            args.end_date,
+        )
+    print(f"✔ Exported {exported} entries to {file_path}.")
+
+
+def command_export_all_users(args: argparse.Namespace, session: any) -> None:
+    """
+    Handles 'export --all-users', writing one timesheet per user with a process pool.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+        session (DatabaseSession): Database session, closed before the workers start.
+
+    Returns:
+        None
+    """
+    from utils.user_config import list_users
+    from utils.batch_export import prepare_batch_export, export_timesheets
+
+    if args.file_format != "xlsx" or args.start_date or args.end_date:
+        raise ValueError("--all-users only supports xlsx timesheets of all entries.")
+    if args.workers is not None and args.workers < 1:
+        raise ValueError("--workers must be at least 1.")
+    out_path = args.output or OUT_PATH
+    os.makedirs(out_path, exist_ok=True)
+    connection = session.cursor()
+    user_ids = [user_id for user_id, _ in list_users(connection)]
+    prepare_batch_export(connection, user_ids)
+    connection.close()
+    # Workers open read-only connections, which DuckDB only allows without a writer
+    session.close()
+
+    def print_progress(done, total, user_id, result, error):
+        if error is None:
+            print(f"[{done}/{total}] ✔ {result[0]}: {result[2]} entries → {result[1]}")
+        else:
+            print(f"[{done}/{total}] ✗ User {user_id}: {error}", file=sys.stderr)
+
+    result = export_timesheets(
+        os.path.join(RES_PATH, DB_FILE_NAME),
+        user_ids,
+        out_path,
+        args.workers,
+        print_progress,
+    )
+    print(
+        f"✔ Exported {len(result['exported'])} of {len(user_ids)} timesheets to {out_path}."
+    )
+    if len(result["failed"]) > 0:
+        raise ValueError(f"{len(result['failed'])} timesheets failed.")
+
+
+def command_missing(args: argparse.Namespace, connection: any, config: any) -> None:
+    """
+    Handles the 'missing' subcommand.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        config (UserConfig): User configuration.
+
+    Returns:
+        None
+    """
+    from utils.calendar_table import refresh_calendar, get_missing_dates
+
+    refresh_calendar(connection, config.user_id, config.start_date, config.work_days)
+    missing_dates = get_missing_dates(connection, config.user_id)
+    if args.json:
+        print(json.dumps(missing_dates))
+        return
+    for date in missing_dates:
+        print(date)
+
+
+def command_import(args: argparse.Namespace, connection: any, config: any) -> None:
+    """
+    Handles the 'import' subcommand.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        config (UserConfig): User configuration.
+
+    Returns:
+        None
+    """
+    from utils.calendar_table import refresh_calendar
+    from utils.rollups import ensure_rollups
+    from utils.importer import import_entries
+
+    refresh_calendar(connection, config.user_id, config.start_date, config.work_days)
+    ensure_rollups(connection)
+    result = import_entries(connection, args.file_path, config)
+    print(f"✔ Imported {result['imported']} entries.")
+    for date in result["duplicate_dates"]:
+        print(f"  Duplicate date: {date}")
+    for row_number, raw_date, error in result["invalid_rows"]:
+        print(f"  Invalid row {row_number} ({raw_date}): {error}")
+
+
+def command_holidays(args: argparse.Namespace, connection: any, config: any) -> None:
+    """
+    Handles the 'holidays' subcommand.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        config (UserConfig): User configuration.
+
+    Returns:
+        None
+    """
+    from utils.rollups import ensure_rollups
+    from utils.holidays import fill_holidays
+
+    ensure_rollups(connection)
+    result = fill_holidays(connection, config, datetime.now().date(), args.region)
+    print(f"✔ Added {len(result['added'])} holiday entries.")
+    for date, name in result["added"]:
+        print(f"  {date} {name}")
+
+
+def command_trace_report(args: argparse.Namespace) -> None:
+    """
+    Handles the 'trace-report' subcommand, aggregating recorded spans per action and kind.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+
+    Returns:
+        None
+    """
+    import duckdb as ddb
+
+    file_paths = args.file_paths or [os.path.join(LOG_PATH, "trace_*.jsonl")]
+    connection = ddb.connect()
+    try:
+        rows = connection.execute(
+            """
+            SELECT
+                action,
+                kind,
+                count(*) AS spans,
+                round(sum(duration_ms), 1) AS total_ms,
+                round(max(duration_ms), 1) AS max_ms,
+            FROM read_json_auto(?, union_by_name = true)
+            WHERE list_contains(?::VARCHAR[], kind)
+            GROUP BY ALL
+            ORDER BY action, total_ms DESC;
+            """,
+            [file_paths, SPAN_KINDS],
+        ).fetchall()
+    except ddb.IOException:
+        raise ValueError("No trace files found. Run temps with --trace first.")
+    finally:
+        connection.close()
+    print(f"{'Action':<22}{'Kind':<11}{'Spans':>7}{'Total (ms)':>13}{'Max (ms)':>11}")
+    for action, kind, spans, total_ms, max_ms in rows:
+        print(f"{action:<22}{kind:<11}{spans:>7}{total_ms:>13.1f}{max_ms:>11.1f}")
+
+
+COMMANDS = {
+    "add": command_add_edit,
+    "edit": command_add_edit,
+    "stats": command_stats,
+    "export": command_export,
+    "missing": command_missing,
+    "import": command_import,
+    "holidays": command_holidays,
+}
+
+
+def dispatch_command(args: argparse.Namespace, session: any, config: any) -> None:
+    """
+    Runs a parsed database subcommand on an open database session.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+        session (DatabaseSession): Database session.
+        config (UserConfig): User configuration, None for commands across all users.
+
+    Returns:
+        None
+    """
+    if getattr(args, "all_users", False):
+        command_export_all_users(args, session)
+        return
+    connection = session.cursor()
+    try:
+        COMMANDS[args.command](args, connection, config)
+    finally:
+        connection.close()
+
+
+def run_guarded(function: callable) -> int:
+    """
+    Runs a subcommand and maps its errors to an exit code.
+    Validation errors are printed, unexpected errors are logged to LOG_PATH.
+
+    Args:
+        function (callable): Subcommand without arguments.
+
+    Returns:
+        int: Process exit code.
+    """
+    try:
+        function()
+        return 0
+    except ValueError as e:
+        print(f"{bcolors.FAIL}✗ {e}{bcolors.ENDC}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # Not an error of the subcommand, handled by run_cli
+        raise
+    except Exception:
+        from utils.error_log import log_error_to_file
+
+        print(
+            f"{bcolors.FAIL}✗ An unexpected error occurred. Check {LOG_PATH} for additional details.{bcolors.ENDC}",
+            file=sys.stderr,
+        )
+        log_error_to_file(traceback.format_exc())
+        return 1
+
+
+def run_cli(argv: list) -> int:
+    """
+    Runs a non-interactive subcommand, exiting quietly when the reader of its output goes away.
+
+    Args:
+        argv (list): Command line arguments (without program name).
+
+    Returns:
+        int: Process exit code.
+    """
+    try:
+        exit_code = run_subcommand(argv)
+        # Buffered output is written here instead of at interpreter exit, where a closed pipe can't be handled
+        sys.stdout.flush()
+        return exit_code
+    except BrokenPipeError:
+        # E.g. `temps stats --json | head -c 100`, the remaining output is discarded
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+
+
+def run_subcommand(argv: list) -> int:
+    """
+    Parses the arguments and runs the requested non-interactive subcommand.
+    Database subcommands are forwarded to the `temps serve` daemon if it is running.
+
+    Args:
+        argv (list): Command line arguments (without program name).
+
+    Returns:
+        int: Process exit code.
+    """
+    args = build_parser().parse_args(argv)
+    if args.trace:
+        enable_tracing()
+    set_action(f"CLI_{args.command.upper().replace('-', '_')}")
+    if args.command == "serve":
+        from utils.daemon import serve
+
+        return run_guarded(serve)
+    if args.command == "trace-report":
+        return run_guarded(lambda: command_trace_report(args))
+    # Punches never wait for the database (or the daemon)
+    if args.command == "punch":
+        return run_guarded(lambda: command_punch(args))
+    # Thin client mode, the daemon already holds the database, config and caches
+    from utils.daemon import send_request
+
+    response = send_request(argv)
+    if response is not None:
+        sys.stdout.write(response["stdout"])
+        sys.stderr.write(response["stderr"])
+        return response["exit_code"]
+    session = None
+
+    def run() -> None:
+        nonlocal session
+        all_users = getattr(args, "all_users", False)
+        session, config = open_database(args.user, load_user=not all_users)
+        dispatch_command(args, session, config)
+
+    try:
+        return run_guarded(run)
+    finally:
+        if session is not None:
+            session.close()
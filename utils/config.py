@@ -1,25 +1,30 @@
 import pathlib
 import os
+import importlib.util
 
 VERSION_NUMBER = "0.0.1"
 
-RES_PATH = os.path.join(f"{pathlib.Path(__file__).parent.parent.resolve()}", "res")
+RES_PATH = os.environ.get(
+    "TEMPS_RES_PATH",
+    os.path.join(f"{pathlib.Path(__file__).parent.parent.resolve()}", "res"),
+)
 DB_FILE_NAME = "temps.duckdb"
+# Unix domain socket of the `temps serve` daemon, in RES_PATH
+DAEMON_SOCKET_FILE_NAME = "temps.sock"
+# Append-only journal of punch in / punch out events, in RES_PATH
+PUNCH_JOURNAL_FILE_NAME = "punch_journal.jsonl"
 USER_CONFIG_FILE_NAME = "user_config.json"
+USER_ENV_VAR = "TEMPS_USER"
 LOG_PATH = os.path.join(f"{pathlib.Path(__file__).parent.parent.resolve()}", "logs")
 OUT_PATH = os.path.join(f"{pathlib.Path(__file__).parent.parent.resolve()}", "out")
-GOLD_TABLE_SCHEMA = [
-    ("uuid", "VARCHAR", "NO", "PRI", None, None),
-    ("date", "DATE", "NO", "UNI", None, None),
-    ("day_of_week", "VARCHAR", "NO", None, None, None),
-    ("event_type", "VARCHAR", "NO", None, None, None),
-    ("clock_in", "VARCHAR", "YES", None, None, None),
-    ("clock_out", "VARCHAR", "YES", None, None, None),
-    ("break_time_minutes", "INTEGER", "YES", None, None, None),
-    ("expected_total_minutes", "INTEGER", "YES", None, None, None),
-    ("expected_total_minutes_work_default", "INTEGER", "YES", None, None, None),
-    ("actual_total_minutes", "INTEGER", "YES", None, None, None),
-    ("day_balance_minutes", "INTEGER", "YES", None, None, None),
-    ("created_at", "TIMESTAMP", "NO", None, None, None),
-    ("updated_at", "TIMESTAMP", "NO", None, None, None),
+# Dates shown per page of the interactive date picker
+DATE_PICKER_PAGE_SIZE = 50
+# Arrow IPC exports need the optional pyarrow package (`uv sync --extra arrow`)
+ARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+EVENT_TYPES = [
+    "Work",
+    "Vacation",
+    "Public / Company Holiday",
+    "Sick Leave",
+    "Overtime Compensation",
 ]
@@ -0,0 +1,381 @@
+# STANDARD LIBRARY IMPORTS
+import os
+import io
+import json
+import time
+import signal
+import socket
+import importlib
+import contextlib
+
+# UTIL IMPORTS
+from utils.colors import bcolors
+from utils.tracing import enable_tracing, set_action
+from utils.journal import compact_journal
+from utils.config import RES_PATH, DB_FILE_NAME, DAEMON_SOCKET_FILE_NAME, USER_ENV_VAR
+from utils.cli import (
+    build_parser,
+    dispatch_command,
+    run_guarded,
+    report_compaction,
+    COMMANDS,
+)
+
+# The client side of this module only needs the standard library, duckdb and
+# the command modules are imported by the daemon when it starts.
+
+SOCKET_PATH = os.path.join(RES_PATH, DAEMON_SOCKET_FILE_NAME)
+# Maximum size of a single request or response line
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+# Command modules the daemon imports up front, so no request pays their import
+WARM_MODULES = [
+    "utils.calendar_table",
+    "utils.rollups",
+    "utils.stats",
+    "utils.entries",
+    "utils.export",
+    "utils.importer",
+    "utils.holidays",
+]
+
+
+def send_message(connection: socket.socket, message: dict) -> None:
+    """
+    Sends a message as a single JSON line.
+
+    Args:
+        connection (socket.socket): Connected socket.
+        message (dict): Message to send.
+
+    Returns:
+        None
+    """
+    connection.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def receive_message(connection: socket.socket) -> dict:
+    """
+    Receives a message sent with send_message.
+
+    Args:
+        connection (socket.socket): Connected socket.
+
+    Returns:
+        dict: Received message, None if the peer closed the connection without sending one.
+    """
+    with connection.makefile("rb") as stream:
+        line = stream.readline(MAX_MESSAGE_BYTES)
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def connect_daemon(socket_path: str = SOCKET_PATH) -> socket.socket:
+    """
+    Connects to the running daemon.
+
+    Args:
+        socket_path (str): Path of the daemon's Unix domain socket.
+
+    Returns:
+        socket.socket: Connected socket, None if no daemon is running.
+    """
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+        return client
+    except OSError:
+        # Socket file of a daemon that did not shut down cleanly
+        client.close()
+        return None
+
+
+def is_daemon_running(socket_path: str = SOCKET_PATH) -> bool:
+    """
+    Returns whether a daemon is answering on the socket.
+
+    Args:
+        socket_path (str): Path of the daemon's Unix domain socket.
+
+    Returns:
+        bool: True if a daemon is running.
+    """
+    client = connect_daemon(socket_path)
+    if client is None:
+        return False
+    client.close()
+    return True
+
+
+def send_request(argv: list, socket_path: str = SOCKET_PATH) -> dict:
+    """
+    Runs a subcommand on the running daemon (thin client).
+
+    Args:
+        argv (list): Command line arguments (without program name).
+        socket_path (str): Path of the daemon's Unix domain socket.
+
+    Returns:
+        dict: Response with 'exit_code', 'stdout' and 'stderr', None if no daemon is running.
+    """
+    client = connect_daemon(socket_path)
+    if client is None:
+        return None
+    response = None
+    try:
+        # Relative paths and the default user are resolved as seen by the client
+        send_message(
+            client,
+            {
+                "argv": argv,
+                "cwd": os.getcwd(),
+                "user": os.environ.get(USER_ENV_VAR),
+            },
+        )
+        response = receive_message(client)
+    except (OSError, ValueError):
+        pass
+    finally:
+        client.close()
+    if response is None:
+        return {
+            "exit_code": 1,
+            "stdout": "",
+            "stderr": f"{bcolors.FAIL}✗ Lost connection to the temps daemon.{bcolors.ENDC}\n",
+        }
+    return response
+
+
+class TempsDaemon:
+    """
+    Long-running process that answers subcommands of thin clients over a Unix domain socket.
+
+    The daemon holds the database session, the user configurations and the
+    imported command modules, so a request only pays for its own queries.
+    Requests are answered one at a time: a request is a single JSON line with
+    the client's arguments, working directory and default user, the response a
+    single JSON line with the exit code and the captured output. The socket is
+    only accessible to the user running the daemon. While the daemon runs, it
+    holds the database lock, so the interactive menu cannot be used.
+    """
+
+    def __init__(self, socket_path: str = SOCKET_PATH) -> None:
+        """
+        Creates a new (not yet listening) daemon.
+
+        Args:
+            socket_path (str): Path of the Unix domain socket to listen on.
+
+        Returns:
+            None
+        """
+        from utils.db import DatabaseSession
+
+        self._socket_path = socket_path
+        self._session = DatabaseSession(os.path.join(RES_PATH, DB_FILE_NAME))
+        self._server = None
+
+    def start(self) -> None:
+        """
+        Upgrades and warms up the database, then starts listening on the socket.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        from utils.schema import ensure_schema
+        from utils.rollups import ensure_rollups
+        from utils.calendar_table import refresh_calendar
+        from utils.user_config import list_users, load_config
+
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError("Daemon mode requires Unix domain sockets.")
+        if is_daemon_running(self._socket_path):
+            raise ValueError(
+                f"A temps daemon is already running on {self._socket_path}."
+            )
+        if not os.path.exists(os.path.join(RES_PATH, DB_FILE_NAME)):
+            raise ValueError(
+                "No database found. Run temps without arguments once to set it up."
+            )
+        for module in WARM_MODULES:
+            importlib.import_module(module)
+        # Bring schema, rollups and all users' calendars up-to-date once
+        connection = self._session.cursor()
+        try:
+            ensure_schema(connection)
+            ensure_rollups(connection)
+            for user_id, _ in list_users(connection):
+                config = load_config(connection, user_id)
+                refresh_calendar(
+                    connection, user_id, config.start_date, config.work_days
+                )
+        finally:
+            connection.close()
+        # Remove the socket file of a daemon that did not shut down cleanly
+        if os.path.exists(self._socket_path):
+            os.unlink(self._socket_path)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Create the socket file accessible to the current user only
+        previous_umask = os.umask(0o177)
+        try:
+            self._server.bind(self._socket_path)
+        finally:
+            os.umask(previous_umask)
+        self._server.listen()
+
+    def serve_forever(self) -> None:
+        """
+        Answers requests until the process is interrupted.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        while True:
+            connection, _ = self._server.accept()
+            with connection:
+                try:
+                    request = receive_message(connection)
+                    # Connections without a request are liveness probes, see is_daemon_running
+                    if request is None:
+                        continue
+                    started_at = time.perf_counter()
+                    response = self.handle_request(request)
+                    send_message(connection, response)
+                    print(
+                        f"{bcolors.ORANGE}‣ {' '.join(request['argv'])}{bcolors.ENDC} → {response['exit_code']} ({(time.perf_counter() - started_at) * 1000:.1f} ms)"
+                    )
+                # Client went away or sent a malformed request
+                except (OSError, ValueError, KeyError, TypeError):
+                    continue
+
+    def close(self) -> None:
+        """
+        Stops listening, removes the socket file and closes the database session.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            if os.path.exists(self._socket_path):
+                os.unlink(self._socket_path)
+        self._session.close()
+
+    def load_user_config(self, user_name: str) -> any:
+        """
+        Returns the configuration of a user.
+        Configurations are built once and only rebuilt after the user was updated, see get_config.
+
+        Args:
+            user_name (str): User name, None for the only existing user.
+
+        Returns:
+            UserConfig: User configuration.
+        """
+        from utils.user_config import resolve_user, get_config
+
+        connection = self._session.cursor()
+        try:
+            return get_config(connection, resolve_user(connection, user_name))
+        finally:
+            connection.close()
+
+    def handle_request(self, request: dict) -> dict:
+        """
+        Runs the subcommand of a request with the client's working directory and captures its output.
+
+        Args:
+            request (dict): Request with 'argv', 'cwd' and 'user'.
+
+        Returns:
+            dict: Response with 'exit_code', 'stdout' and 'stderr'.
+        """
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        previous_cwd = os.getcwd()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                os.chdir(request["cwd"])
+                exit_code = self.run(request["argv"], request.get("user"))
+            except SystemExit as e:
+                # Argument errors and --help exit the parser
+                exit_code = e.code if isinstance(e.code, int) else 1
+            finally:
+                os.chdir(previous_cwd)
+        return {
+            "exit_code": exit_code,
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+        }
+
+    def run(self, argv: list, default_user: str) -> int:
+        """
+        Runs a subcommand on the daemon's database session.
+
+        Args:
+            argv (list): Command line arguments of the client (without program name).
+            default_user (str): Value of the client's TEMPS_USER environment variable.
+
+        Returns:
+            int: Exit code for the client.
+        """
+        args = build_parser(default_user).parse_args(argv)
+        if args.trace:
+            enable_tracing()
+        set_action(f"CLI_{args.command.upper().replace('-', '_')}")
+
+        def run_command() -> None:
+            if args.command not in COMMANDS:
+                raise ValueError(f"'{args.command}' is not supported by the daemon.")
+            # Fold punches made since the last request into entries
+            connection = self._session.cursor()
+            try:
+                report_compaction(compact_journal(connection))
+            finally:
+                connection.close()
+            all_users = getattr(args, "all_users", False)
+            dispatch_command(
+                args,
+                self._session,
+                None if all_users else self.load_user_config(args.user),
+            )
+
+        return run_guarded(run_command)
+
+
+def serve() -> None:
+    """
+    Runs the daemon in the foreground until it is interrupted (CTRL + C) or terminated.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    daemon = TempsDaemon()
+    # Terminate like an interrupt, so the socket file is removed
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        daemon.start()
+        print(
+            f"{bcolors.OKGREEN}✔ Serving temps on {SOCKET_PATH}. Press CTRL + C to stop.{bcolors.ENDC}",
+            flush=True,
+        )
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{bcolors.WARNING}→ Stopping daemon...{bcolors.ENDC}")
+    finally:
+        daemon.close()
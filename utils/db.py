@@ -0,0 +1,81 @@
+# STANDARD LIBRARY IMPORTS
+import threading
+
+# THIRD PARTY IMPORTS
+import duckdb as ddb
+
+
+class DatabaseSession:
+    """
+    Long-lived session around a single DuckDB database file.
+
+    The underlying connection is opened lazily on first use and kept for the
+    lifetime of the process. Callers receive lightweight cursors that share the
+    already loaded database instance instead of re-opening the file, so file
+    open, WAL replay and catalog load are only paid once per process.
+    """
+
+    def __init__(self, database_path: str) -> None:
+        """
+        Creates a new (not yet connected) database session.
+
+        Args:
+            database_path (str): Path to the DuckDB database file.
+
+        Returns:
+            None
+        """
+        self._database_path = database_path
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def connect(self) -> ddb.DuckDBPyConnection:
+        """
+        Returns the session connection, opening it if necessary.
+
+        Args:
+            None
+
+        Returns:
+            ddb.DuckDBPyConnection: Connection to the DuckDB database.
+        """
+        with self._lock:
+            if self._connection is None:
+                self._connection = ddb.connect(self._database_path)
+            return self._connection
+
+    def cursor(self) -> ddb.DuckDBPyConnection:
+        """
+        Returns a new cursor on the session connection.
+        If the session connection is broken or was closed, it is re-established once.
+
+        Args:
+            None
+
+        Returns:
+            ddb.DuckDBPyConnection: Cursor on the DuckDB database.
+        """
+        try:
+            return self.connect().cursor()
+        except ddb.ConnectionException:
+            # Connection is no longer usable -> drop it and reconnect
+            self.close()
+            return self.connect().cursor()
+
+    def close(self) -> None:
+        """
+        Closes the session connection, if open. Safe to call multiple times.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if self._connection is not None:
+                try:
+                    self._connection.close()
+                except ddb.Error:
+                    pass
+                self._connection = None
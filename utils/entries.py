@@ -0,0 +1,349 @@
+# STANDARD LIBRARY IMPORTS
+import numbers
+from datetime import datetime
+
+# THIRD PARTY IMPORTS
+import duckdb as ddb
+
+# UTIL IMPORTS
+from utils.tracing import traced
+from utils.config import EVENT_TYPES
+from utils.rollups import apply_entry_change
+from utils.user_config import UserConfig
+
+
+def parse_clock_time(value: any) -> int:
+    """
+    Parses a clock time into its minute of the day, the way clock times are stored.
+
+    Args:
+        value (any): Clock time formatted as HH:MM, or a minute of the day as read from the database.
+
+    Returns:
+        int: Minute of the day, None if the value is not a valid clock time.
+    """
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if not isinstance(value, str):
+        return None
+    hours, separator, minutes = value.partition(":")
+    if (
+        separator != ":"
+        or not (1 <= len(hours) <= 2 and hours.isdigit())
+        or not (len(minutes) == 2 and minutes.isdigit())
+        or int(hours) > 23
+        or int(minutes) > 59
+    ):
+        return None
+    return int(hours) * 60 + int(minutes)
+
+
+def format_clock_time(value: any) -> str:
+    """
+    Formats a clock time as read from the database.
+
+    Args:
+        value (any): Minute of the day, None (or NA) for entries without clock times.
+
+    Returns:
+        str: Clock time formatted as HH:MM, None for entries without clock times.
+    """
+    if not isinstance(value, numbers.Integral):
+        return None
+    return f"{int(value) // 60:02d}:{int(value) % 60:02d}"
+
+
+def validate_entry(date: str, event_type: str, clock_in: str, clock_out: str) -> None:
+    """
+    Validates entry values the same way the interactive prompts do.
+
+    Args:
+        date (str): Entry date formatted as YYYY-MM-DD.
+        event_type (str): Event type, one of EVENT_TYPES.
+        clock_in (str): Clock in time formatted as HH:MM (Work entries only).
+        clock_out (str): Clock out time formatted as HH:MM (Work entries only).
+
+    Returns:
+        None
+    """
+    try:
+        entry_date = datetime.strptime(date, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        raise ValueError("Date must be in format YYYY-MM-DD.")
+    if entry_date > datetime.now():
+        raise ValueError("Entries for future days are not allowed.")
+    if event_type not in EVENT_TYPES:
+        raise ValueError(f"Event type must be one of: {', '.join(EVENT_TYPES)}.")
+    if event_type == "Work":
+        clock_in_minute = parse_clock_time(clock_in)
+        clock_out_minute = parse_clock_time(clock_out)
+        if clock_in_minute is None or clock_out_minute is None:
+            raise ValueError(
+                "Clock in and clock out times must be in format HH:MM, between 00:00 and 23:59."
+            )
+        if clock_out_minute <= clock_in_minute:
+            raise ValueError("Clock out time must be after clock in time.")
+
+
+def compute_entry_minutes(
+    event_type: str, clock_in: any, clock_out: any, expected_daily_total_minutes: int
+) -> tuple:
+    """
+    Computes expected, actual and balance minutes of an entry.
+
+    Args:
+        event_type (str): Event type, one of EVENT_TYPES.
+        clock_in (any): Clock in time formatted as HH:MM or minute of the day (Work entries only).
+        clock_out (any): Clock out time formatted as HH:MM or minute of the day (Work entries only).
+        expected_daily_total_minutes (int): Expected minutes of a regular work day.
+
+    Returns:
+        tuple: (expected, actual, balance) minutes, None where not applicable.
+    """
+    expected_total_minutes = None
+    actual_total_minutes = None
+    balance = None
+    # Overtime compensation specifics
+    if event_type == "Overtime Compensation":
+        expected_total_minutes = expected_daily_total_minutes
+        balance = -expected_daily_total_minutes
+    # Work specifics
+    if event_type == "Work":
+        expected_total_minutes = expected_daily_total_minutes
+        # Get difference between clock in and clock out
+        actual_total_minutes = parse_clock_time(clock_out) - parse_clock_time(clock_in)
+        # Calculate balance
+        balance = actual_total_minutes - expected_total_minutes
+    return (
+        int(expected_total_minutes) if expected_total_minutes is not None else None,
+        int(actual_total_minutes) if actual_total_minutes is not None else None,
+        int(balance) if balance is not None else None,
+    )
+
+
+def _insert_entry(
+    connection: ddb.DuckDBPyConnection,
+    date: str,
+    event_type: str,
+    clock_in: str,
+    clock_out: str,
+    config: UserConfig,
+) -> None:
+    """
+    Inserts a new entry and updates the balance rollups, within the caller's transaction.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        date (str): Entry date formatted as YYYY-MM-DD.
+        event_type (str): Event type, one of EVENT_TYPES.
+        clock_in (str): Clock in time formatted as HH:MM (Work entries only).
+        clock_out (str): Clock out time formatted as HH:MM (Work entries only).
+        config (UserConfig): User configuration of the user the entry belongs to.
+
+    Returns:
+        None
+    """
+    # Clock times are stored as minute of the day
+    clock_in = parse_clock_time(clock_in) if event_type == "Work" else None
+    clock_out = parse_clock_time(clock_out) if event_type == "Work" else None
+    expected_total_minutes, actual_total_minutes, balance = compute_entry_minutes(
+        event_type, clock_in, clock_out, config.expected_entry_minutes
+    )
+    query = """
+        INSERT INTO times (user_id, date, event_type, clock_in, clock_out, break_time_minutes, expected_total_minutes, expected_total_minutes_work_default, actual_total_minutes, day_balance_minutes, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP);
+    """
+    values = [
+        int(config.user_id),
+        date,
+        event_type,
+        clock_in,
+        clock_out,
+        int(config.daily_break_minutes) if event_type in ["Work"] else None,
+        expected_total_minutes,
+        int(config.expected_entry_minutes),
+        actual_total_minutes,
+        balance,
+    ]
+    connection.execute(query, values)
+    apply_entry_change(
+        connection,
+        int(config.user_id),
+        date,
+        None,
+        (balance, actual_total_minutes, expected_total_minutes),
+    )
+
+
+def _update_entry(
+    connection: ddb.DuckDBPyConnection,
+    user_id: int,
+    date: str,
+    event_type: str,
+    clock_in: str,
+    clock_out: str,
+) -> None:
+    """
+    Updates an existing entry and the balance rollups, within the caller's transaction.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_id (int): User id of the entry to update.
+        date (str): Date of the entry to update, formatted as YYYY-MM-DD.
+        event_type (str): Event type, one of EVENT_TYPES.
+        clock_in (str): Clock in time formatted as HH:MM (Work entries only).
+        clock_out (str): Clock out time formatted as HH:MM (Work entries only).
+
+    Returns:
+        None
+    """
+    # Clock times are stored as minute of the day
+    clock_in = parse_clock_time(clock_in) if event_type == "Work" else None
+    clock_out = parse_clock_time(clock_out) if event_type == "Work" else None
+    previous_values = connection.execute(
+        "SELECT day_balance_minutes, actual_total_minutes, expected_total_minutes, expected_total_minutes_work_default FROM times WHERE user_id = ? AND date = ?;",
+        [user_id, date],
+    ).fetchone()
+    if previous_values is None:
+        raise ValueError(f"No entry exists for {date}.")
+    expected_total_minutes, actual_total_minutes, balance = compute_entry_minutes(
+        event_type, clock_in, clock_out, previous_values[3]
+    )
+    connection.execute(
+        """
+        UPDATE times
+        SET
+            event_type = ?,
+            clock_in = ?,
+            clock_out = ?,
+            expected_total_minutes = ?,
+            actual_total_minutes = ?,
+            day_balance_minutes = ?,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE user_id = ? AND date = ?;
+        """,
+        [
+            event_type,
+            clock_in,
+            clock_out,
+            expected_total_minutes,
+            actual_total_minutes,
+            balance,
+            user_id,
+            date,
+        ],
+    )
+    apply_entry_change(
+        connection,
+        user_id,
+        date,
+        previous_values[:3],
+        (balance, actual_total_minutes, expected_total_minutes),
+    )
+
+
+@traced("db")
+def insert_entry(
+    connection: ddb.DuckDBPyConnection,
+    date: str,
+    event_type: str,
+    clock_in: str,
+    clock_out: str,
+    config: UserConfig,
+) -> None:
+    """
+    Inserts a new entry and updates the balance rollups in the same transaction.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        date (str): Entry date formatted as YYYY-MM-DD.
+        event_type (str): Event type, one of EVENT_TYPES.
+        clock_in (str): Clock in time formatted as HH:MM (Work entries only).
+        clock_out (str): Clock out time formatted as HH:MM (Work entries only).
+        config (UserConfig): User configuration of the user the entry belongs to.
+
+    Returns:
+        None
+    """
+    connection.execute("BEGIN TRANSACTION;")
+    try:
+        _insert_entry(connection, date, event_type, clock_in, clock_out, config)
+        connection.execute("COMMIT;")
+    except Exception as e:
+        connection.execute("ROLLBACK;")
+        raise e
+
+
+@traced("db")
+def update_entry(
+    connection: ddb.DuckDBPyConnection,
+    user_id: int,
+    date: str,
+    event_type: str,
+    clock_in: str,
+    clock_out: str,
+) -> None:
+    """
+    Updates an existing entry and the balance rollups in the same transaction.
+    Expected minutes are based on the work day default stored with the entry.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_id (int): User id of the entry to update.
+        date (str): Date of the entry to update, formatted as YYYY-MM-DD.
+        event_type (str): Event type, one of EVENT_TYPES.
+        clock_in (str): Clock in time formatted as HH:MM (Work entries only).
+        clock_out (str): Clock out time formatted as HH:MM (Work entries only).
+
+    Returns:
+        None
+    """
+    connection.execute("BEGIN TRANSACTION;")
+    try:
+        _update_entry(connection, user_id, date, event_type, clock_in, clock_out)
+        connection.execute("COMMIT;")
+    except Exception as e:
+        connection.execute("ROLLBACK;")
+        raise e
+
+
+@traced("db")
+def write_entries(connection: ddb.DuckDBPyConnection, writes: list) -> None:
+    """
+    Applies a batch of entry writes (see utils/writer.py) in a single transaction.
+    Either all writes of the batch are applied or, if any of them fails, none is.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        writes (list): Writes as dicts with 'operation' ("insert" or "update"), 'date', 'event_type', 'clock_in', 'clock_out' and the user's 'config'.
+
+    Returns:
+        None
+    """
+    connection.execute("BEGIN TRANSACTION;")
+    try:
+        for write in writes:
+            if write["operation"] == "insert":
+                _insert_entry(
+                    connection,
+                    write["date"],
+                    write["event_type"],
+                    write["clock_in"],
+                    write["clock_out"],
+                    write["config"],
+                )
+            elif write["operation"] == "update":
+                _update_entry(
+                    connection,
+                    int(write["config"].user_id),
+                    write["date"],
+                    write["event_type"],
+                    write["clock_in"],
+                    write["clock_out"],
+                )
+            else:
+                raise ValueError(f"Unknown entry write operation: {write['operation']}")
+        connection.execute("COMMIT;")
+    except Exception as e:
+        connection.execute("ROLLBACK;")
+        raise e
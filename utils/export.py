@@ -0,0 +1,195 @@
+# STANDARD LIBRARY IMPORTS
+from datetime import datetime
+
+# THIRD PARTY IMPORTS
+import duckdb as ddb
+
+# UTIL IMPORTS
+from utils.tracing import traced, span
+from utils.queries import build_entry_conditions
+from utils.user_config import UserConfig
+
+# 'times' column -> exported column name, in export order
+EXPORT_COLUMN_NAMES = {
+    "date": "Date",
+    "event_type": "Event Type",
+    "clock_in": "Clock In",
+    "clock_out": "Clock Out",
+    "break_time_minutes": "Break Time (minutes)",
+    "expected_total_minutes": "Expected Total (minutes)",
+    "actual_total_minutes": "Actual Total (minutes)",
+    "day_balance_minutes": "Balance (minutes)",
+}
+# 'times' column -> SELECT expression, for columns exported in a different type than they are stored in
+EXPORT_COLUMN_EXPRESSIONS = {
+    "event_type": "CAST(event_type AS VARCHAR)",
+    "clock_in": "printf('%02d:%02d', clock_in // 60, clock_in % 60)",
+    "clock_out": "printf('%02d:%02d', clock_out // 60, clock_out % 60)",
+}
+EXPORT_BATCH_SIZE = 10000
+# Columnar export format -> DuckDB COPY options (None = written via Arrow record batches)
+EXPORT_FORMATS = {
+    "parquet": "(FORMAT parquet, COMPRESSION zstd)",
+    "csv": "(FORMAT csv, HEADER true)",
+    "arrow": None,
+}
+
+
+def build_summary(
+    config: UserConfig, stats: dict, missing_entries: int, total_balance: int
+) -> dict:
+    """
+    Builds the rows of the timesheet Summary sheet.
+
+    Args:
+        config (UserConfig): User configuration.
+        stats (dict): Entry statistics as returned by utils.stats.get_stats.
+        missing_entries (int): Number of missing entries.
+        total_balance (int): Total balance in minutes.
+
+    Returns:
+        dict: Summary sheet rows as label -> value.
+    """
+    return {
+        "Name": config.name,
+        "Start Date": config.start_date.strftime("%Y-%m-%d"),
+        "Work Days": ", ".join(config.work_days),
+        "Weekly Work (hours)": config.weekly_work_minutes / 60,
+        "Daily Break (minutes)": config.daily_break_minutes,
+        "Total Entries": stats["total_entries"],
+        "Missing Entries": missing_entries,
+        "Total Balance (hours)": f"{total_balance // 60}h {total_balance % 60}min",
+        "Timesheet Generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+@traced("file")
+def export_timesheet(
+    connection: ddb.DuckDBPyConnection,
+    user_id: int,
+    file_path: str,
+    summary: dict,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> int:
+    """
+    Writes the Excel timesheet (Summary & Entries sheets) of a user with constant memory.
+    Entries are streamed from DuckDB in batches into a write-only workbook, so the
+    full workbook object model is never held in memory.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_id (int): User id.
+        file_path (str): Path of the .xlsx file to write.
+        summary (dict): Summary sheet rows as label -> value.
+        batch_size (int): Number of entries fetched from the database per batch.
+
+    Returns:
+        int: Number of exported entries.
+    """
+    # Lazy import, openpyxl is only needed for Excel exports
+    with span("file", "openpyxl.import"):
+        from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    # Summary --- --- --- --- ---
+    summary_sheet = workbook.create_sheet("Summary")
+    for label, value in summary.items():
+        summary_sheet.append([label, value])
+    # Entries --- --- --- --- ---
+    entries_sheet = workbook.create_sheet("Entries")
+    entries_sheet.append(list(EXPORT_COLUMN_NAMES.values()))
+    # Fetch (DuckDB) and row serialisation (openpyxl) are traced separately per batch
+    with span("db", "export_timesheet.query"):
+        connection.execute(
+            f"SELECT {', '.join(EXPORT_COLUMN_EXPRESSIONS.get(column, column) for column in EXPORT_COLUMN_NAMES)} FROM times WHERE user_id = {int(user_id)} ORDER BY date;"
+        )
+    exported = 0
+    while True:
+        with span("db", "export_timesheet.fetch_batch"):
+            rows = connection.fetchmany(batch_size)
+        if len(rows) == 0:
+            break
+        with span("file", "openpyxl.append_rows", rows=len(rows)):
+            for row in rows:
+                entries_sheet.append(row)
+        exported += len(rows)
+    with span("file", "openpyxl.save", path=file_path):
+        workbook.save(file_path)
+    return exported
+
+
+def build_export_query(
+    user_id: int, start_date: str = None, end_date: str = None
+) -> str:
+    """
+    Builds the query selecting all exported columns (with export column names) of a user's entries, optionally limited to a date range.
+
+    Args:
+        user_id (int): User id.
+        start_date (str): Optional first date (inclusive) formatted as YYYY-MM-DD.
+        end_date (str): Optional last date (inclusive) formatted as YYYY-MM-DD.
+
+    Returns:
+        str: SQL query.
+    """
+    return (
+        "SELECT "
+        + ", ".join(
+            f'{EXPORT_COLUMN_EXPRESSIONS.get(column, column)} AS "{name}"'
+            for column, name in EXPORT_COLUMN_NAMES.items()
+        )
+        + " FROM times WHERE "
+        + build_entry_conditions(user_id, start_date, end_date)
+        + " ORDER BY date"
+    )
+
+
+@traced("file")
+def export_entries(
+    connection: ddb.DuckDBPyConnection,
+    user_id: int,
+    file_path: str,
+    file_format: str,
+    start_date: str = None,
+    end_date: str = None,
+) -> int:
+    """
+    Exports a user's entries to a columnar file without going through pandas.
+    Parquet (zstd compressed) and CSV are written by DuckDB's COPY ... TO, Arrow IPC
+    files are streamed from Arrow record batches (requires the optional pyarrow package).
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_id (int): User id.
+        file_path (str): Path of the file to write.
+        file_format (str): One of "parquet", "csv" or "arrow".
+        start_date (str): Optional first date (inclusive) formatted as YYYY-MM-DD.
+        end_date (str): Optional last date (inclusive) formatted as YYYY-MM-DD.
+
+    Returns:
+        int: Number of exported entries.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(
+            f"Unsupported export format '{file_format}'. Supported formats are {', '.join(EXPORT_FORMATS)}."
+        )
+    query = build_export_query(user_id, start_date, end_date)
+    if EXPORT_FORMATS[file_format] is not None:
+        escaped_file_path = file_path.replace("'", "''")
+        return connection.execute(
+            f"COPY ({query}) TO '{escaped_file_path}' {EXPORT_FORMATS[file_format]};"
+        ).fetchone()[0]
+    # Lazy import, pyarrow is only needed for Arrow IPC exports
+    try:
+        import pyarrow.ipc
+    except ImportError:
+        raise ValueError(
+            "Arrow IPC export requires the 'pyarrow' package, install it with `uv sync --extra arrow`."
+        )
+    reader = connection.execute(query).fetch_record_batch(EXPORT_BATCH_SIZE)
+    exported = 0
+    with pyarrow.ipc.new_file(file_path, reader.schema) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+            exported += batch.num_rows
+    return exported
@@ -0,0 +1,286 @@
+# STANDARD LIBRARY IMPORTS
+from datetime import date, timedelta
+
+# THIRD PARTY IMPORTS
+import duckdb as ddb
+
+# UTIL IMPORTS
+from utils.tracing import traced
+from utils.rollups import apply_entry_inserts
+from utils.user_config import UserConfig
+
+HOLIDAY_EVENT_TYPE = "Public / Company Holiday"
+
+# Holiday rules, one dict per holiday with a 'name' and one of:
+#   - 'month' and 'day': fixed date, e.g. Christmas Day
+#   - 'easter_offset': days after Easter Sunday, e.g. -2 for Good Friday
+#   - 'month', 'weekday' (0 = Monday) and 'nth': nth weekday of the month, negative counts from the end
+# Optional keys: 'observed' moves a fixed date on a weekend to the "nearest_weekday" (Saturday -> Friday,
+# Sunday -> Monday) or to the "next_weekday" that isn't a holiday yet, 'first_year' is the first year
+# the holiday applies to.
+_DE_RULES = [
+    {"name": "New Year's Day", "month": 1, "day": 1},
+    {"name": "Good Friday", "easter_offset": -2},
+    {"name": "Easter Monday", "easter_offset": 1},
+    {"name": "Labour Day", "month": 5, "day": 1},
+    {"name": "Ascension Day", "easter_offset": 39},
+    {"name": "Whit Monday", "easter_offset": 50},
+    {"name": "German Unity Day", "month": 10, "day": 3},
+    {"name": "Christmas Day", "month": 12, "day": 25},
+    {"name": "St. Stephen's Day", "month": 12, "day": 26},
+]
+_EPIPHANY = {"name": "Epiphany", "month": 1, "day": 6}
+_CORPUS_CHRISTI = {"name": "Corpus Christi", "easter_offset": 60}
+_ALL_SAINTS_DAY = {"name": "All Saints' Day", "month": 11, "day": 1}
+# Region code (ISO 3166) -> holiday rules
+HOLIDAY_REGIONS = {
+    "AT": [
+        {"name": "New Year's Day", "month": 1, "day": 1},
+        _EPIPHANY,
+        {"name": "Easter Monday", "easter_offset": 1},
+        {"name": "National Holiday", "month": 5, "day": 1},
+        {"name": "Ascension Day", "easter_offset": 39},
+        {"name": "Whit Monday", "easter_offset": 50},
+        _CORPUS_CHRISTI,
+        {"name": "Assumption Day", "month": 8, "day": 15},
+        {"name": "National Day", "month": 10, "day": 26},
+        _ALL_SAINTS_DAY,
+        {"name": "Immaculate Conception", "month": 12, "day": 8},
+        {"name": "Christmas Day", "month": 12, "day": 25},
+        {"name": "St. Stephen's Day", "month": 12, "day": 26},
+    ],
+    "CH-ZH": [
+        {"name": "New Year's Day", "month": 1, "day": 1},
+        {"name": "Berchtold's Day", "month": 1, "day": 2},
+        {"name": "Good Friday", "easter_offset": -2},
+        {"name": "Easter Monday", "easter_offset": 1},
+        {"name": "Labour Day", "month": 5, "day": 1},
+        {"name": "Ascension Day", "easter_offset": 39},
+        {"name": "Whit Monday", "easter_offset": 50},
+        {"name": "Swiss National Day", "month": 8, "day": 1},
+        {"name": "Christmas Day", "month": 12, "day": 25},
+        {"name": "St. Stephen's Day", "month": 12, "day": 26},
+    ],
+    "DE": _DE_RULES,
+    "DE-BE": _DE_RULES
+    + [{"name": "International Women's Day", "month": 3, "day": 8, "first_year": 2019}],
+    "DE-BW": _DE_RULES + [_EPIPHANY, _CORPUS_CHRISTI, _ALL_SAINTS_DAY],
+    # Assumption Day is only a holiday in parts of Bavaria, add it manually where it applies
+    "DE-BY": _DE_RULES + [_EPIPHANY, _CORPUS_CHRISTI, _ALL_SAINTS_DAY],
+    "DE-HH": _DE_RULES
+    + [{"name": "Reformation Day", "month": 10, "day": 31, "first_year": 2018}],
+    "DE-NW": _DE_RULES + [_CORPUS_CHRISTI, _ALL_SAINTS_DAY],
+    "GB-ENG": [
+        {"name": "New Year's Day", "month": 1, "day": 1, "observed": "next_weekday"},
+        {"name": "Good Friday", "easter_offset": -2},
+        {"name": "Easter Monday", "easter_offset": 1},
+        {"name": "Early May Bank Holiday", "month": 5, "weekday": 0, "nth": 1},
+        {"name": "Spring Bank Holiday", "month": 5, "weekday": 0, "nth": -1},
+        {"name": "Summer Bank Holiday", "month": 8, "weekday": 0, "nth": -1},
+        {"name": "Christmas Day", "month": 12, "day": 25, "observed": "next_weekday"},
+        {"name": "Boxing Day", "month": 12, "day": 26, "observed": "next_weekday"},
+    ],
+    "US": [
+        {"name": "New Year's Day", "month": 1, "day": 1, "observed": "nearest_weekday"},
+        {"name": "Martin Luther King Jr. Day", "month": 1, "weekday": 0, "nth": 3},
+        {"name": "Washington's Birthday", "month": 2, "weekday": 0, "nth": 3},
+        {"name": "Memorial Day", "month": 5, "weekday": 0, "nth": -1},
+        {
+            "name": "Juneteenth",
+            "month": 6,
+            "day": 19,
+            "observed": "nearest_weekday",
+            "first_year": 2021,
+        },
+        {
+            "name": "Independence Day",
+            "month": 7,
+            "day": 4,
+            "observed": "nearest_weekday",
+        },
+        {"name": "Labor Day", "month": 9, "weekday": 0, "nth": 1},
+        {"name": "Columbus Day", "month": 10, "weekday": 0, "nth": 2},
+        {"name": "Veterans Day", "month": 11, "day": 11, "observed": "nearest_weekday"},
+        {"name": "Thanksgiving Day", "month": 11, "weekday": 3, "nth": 4},
+        {
+            "name": "Christmas Day",
+            "month": 12,
+            "day": 25,
+            "observed": "nearest_weekday",
+        },
+    ],
+}
+
+# Holiday tables by (region, year), see get_holidays
+_holiday_tables = {}
+
+
+def get_easter_sunday(year: int) -> date:
+    """
+    Computes the date of (western) Easter Sunday with the anonymous Gregorian algorithm.
+
+    Args:
+        year (int): Year.
+
+    Returns:
+        date: Easter Sunday.
+    """
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    weekday_offset = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * weekday_offset) // 451
+    month, day = divmod(h + weekday_offset - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def get_nth_weekday(year: int, month: int, weekday: int, nth: int) -> date:
+    """
+    Computes the nth weekday of a month, e.g. the last Monday of May.
+
+    Args:
+        year (int): Year.
+        month (int): Month.
+        weekday (int): Weekday, 0 for Monday to 6 for Sunday.
+        nth (int): Occurrence, 1 for the first, -1 for the last.
+
+    Returns:
+        date: Date of the weekday.
+    """
+    if nth > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (nth - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7 + 7 * (-nth - 1))
+
+
+def get_holidays(region: str, year: int) -> list:
+    """
+    Returns the holidays of a region in a year. Each year's table is computed once per process.
+
+    Args:
+        region (str): Region code, one of HOLIDAY_REGIONS.
+        year (int): Year.
+
+    Returns:
+        list: (date, name) tuples, ordered by date. Observed dates may fall into the previous or next year.
+    """
+    if region not in HOLIDAY_REGIONS:
+        raise ValueError(
+            f"Unknown holiday region '{region}'. Supported regions are: {', '.join(HOLIDAY_REGIONS)}."
+        )
+    if (region, year) in _holiday_tables:
+        return _holiday_tables[(region, year)]
+    holidays = {}
+    observed = []
+    for rule in HOLIDAY_REGIONS[region]:
+        if year < rule.get("first_year", year):
+            continue
+        if "easter_offset" in rule:
+            day = get_easter_sunday(year) + timedelta(days=rule["easter_offset"])
+        elif "nth" in rule:
+            day = get_nth_weekday(year, rule["month"], rule["weekday"], rule["nth"])
+        else:
+            day = date(year, rule["month"], rule["day"])
+        if rule.get("observed") and day.weekday() >= 5:
+            observed.append((day, rule))
+        else:
+            holidays[day] = rule["name"]
+    # Move weekend holidays once all regular ones are known, a substitute day is never another holiday
+    for day, rule in observed:
+        if rule["observed"] == "nearest_weekday":
+            day += timedelta(days=-1 if day.weekday() == 5 else 1)
+        else:
+            day += timedelta(days=7 - day.weekday())
+            while day in holidays:
+                day += timedelta(days=1)
+        holidays[day] = f"{rule['name']} (observed)"
+    _holiday_tables[(region, year)] = sorted(holidays.items())
+    return _holiday_tables[(region, year)]
+
+
+@traced("db")
+def fill_holidays(
+    connection: ddb.DuckDBPyConnection,
+    config: UserConfig,
+    today: date,
+    region: str = None,
+) -> dict:
+    """
+    Adds a holiday entry for every holiday of a region on a work day from the user's start date up to today,
+    in a single transaction. Holidays that already have an entry (of any type) are left untouched, so filling
+    again only adds the holidays that passed since.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        config (UserConfig): User configuration.
+        today (date): Current date, the last date holidays are added for.
+        region (str): Region code, one of HOLIDAY_REGIONS, defaults to the user's holiday region.
+
+    Returns:
+        dict: Added and already existing holidays as (date formatted as YYYY-MM-DD, name) tuples.
+    """
+    region = region or config.holiday_region
+    if region is None:
+        raise ValueError(
+            "No holiday region configured. Set one in the user configuration or pass a region."
+        )
+    holidays = [
+        (day.strftime("%Y-%m-%d"), name)
+        for year in range(config.start_date.year, today.year + 2)
+        for day, name in get_holidays(region, year)
+        if day <= today and config.is_work_day(day)
+    ]
+    # Dates and user id are embedded as literals; binding query parameters
+    # makes the DuckDB client import pandas
+    existing_dates = {
+        row[0]
+        for row in connection.execute(
+            f"""
+            SELECT strftime(date, '%Y-%m-%d')
+            FROM times
+            WHERE user_id = {int(config.user_id)} AND date >= DATE '{config.start_date.strftime("%Y-%m-%d")}';
+            """
+        ).fetchall()
+    }
+    added = [holiday for holiday in holidays if holiday[0] not in existing_dates]
+    existing = [holiday for holiday in holidays if holiday[0] in existing_dates]
+    if len(added) == 0:
+        return {"added": added, "existing": existing}
+    added_dates = f"""
+        SELECT CAST(date AS DATE) AS date
+        FROM (VALUES {", ".join(f"('{day}')" for day, _ in added)}) AS holidays(date)
+    """
+    # Insert all holidays and add them to the user's balance rollups in one transaction
+    connection.execute("BEGIN TRANSACTION;")
+    try:
+        connection.execute(
+            f"""
+            INSERT INTO times (user_id, date, event_type, clock_in, clock_out, break_time_minutes, expected_total_minutes, expected_total_minutes_work_default, actual_total_minutes, day_balance_minutes, created_at, updated_at)
+            SELECT
+                {int(config.user_id)},
+                date,
+                '{HOLIDAY_EVENT_TYPE}',
+                NULL,
+                NULL,
+                NULL,
+                NULL,
+                {int(config.expected_entry_minutes)},
+                NULL,
+                NULL,
+                CURRENT_TIMESTAMP,
+                CURRENT_TIMESTAMP
+            FROM ({added_dates})
+            ORDER BY date;
+            """
+        )
+        apply_entry_inserts(connection, config.user_id, added_dates)
+        connection.execute("COMMIT;")
+    except Exception as e:
+        connection.execute("ROLLBACK;")
+        raise e
+    return {"added": added, "existing": existing}
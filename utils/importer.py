@@ -0,0 +1,195 @@
+# STANDARD LIBRARY IMPORTS
+import os
+
+# THIRD PARTY IMPORTS
+import duckdb as ddb
+
+# UTIL IMPORTS
+from utils.tracing import traced
+from utils.config import EVENT_TYPES
+from utils.rollups import apply_entry_inserts
+from utils.user_config import UserConfig
+
+# Accepted source column names (lower-cased) -> 'times' column name
+IMPORT_COLUMN_NAMES = {
+    "date": "date",
+    "event_type": "event_type",
+    "event type": "event_type",
+    "clock_in": "clock_in",
+    "clock in": "clock_in",
+    "clock_out": "clock_out",
+    "clock out": "clock_out",
+}
+
+
+def register_import_source(connection: ddb.DuckDBPyConnection, file_path: str) -> None:
+    """
+    Registers a CSV, Excel or Parquet file as the temporary 'import_source' view of the connection.
+    CSV and Parquet files are read by DuckDB's native readers, Excel files via pandas.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        file_path (str): Path of the file to import.
+
+    Returns:
+        None
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    match extension:
+        case ".csv":
+            source = connection.read_csv(file_path, header=True, all_varchar=True)
+        case ".parquet":
+            source = connection.read_parquet(file_path)
+        case ".xlsx" | ".xls":
+            # Lazy import, pandas is only needed for Excel sources
+            import pandas as pd
+
+            source = pd.read_excel(file_path, dtype=str)
+        case _:
+            raise ValueError(
+                f"Unsupported import file type '{extension}'. Supported types are .csv, .xlsx and .parquet."
+            )
+    connection.register("import_source", source)
+
+
+@traced("db")
+def import_entries(
+    connection: ddb.DuckDBPyConnection, file_path: str, config: UserConfig
+) -> dict:
+    """
+    Bulk imports entries of a user from a file into the 'times' table in a single transaction.
+
+    Rows are validated and their balances computed the same way as in add_entry, but
+    vectorized in SQL. Invalid rows and dates that already exist (in the database or
+    earlier in the file) are skipped and reported instead of aborting the import.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        file_path (str): Path of the CSV, Excel or Parquet file to import.
+        config (UserConfig): User configuration of the user the entries belong to.
+
+    Returns:
+        dict: Number of imported rows, duplicate dates and invalid rows with reasons.
+    """
+    user_id = int(config.user_id)
+    register_import_source(connection, file_path)
+    try:
+        # Map source columns to 'times' columns, missing optional columns become NULL
+        source_columns = {
+            IMPORT_COLUMN_NAMES[column.strip().lower()]: column
+            for column in connection.table("import_source").columns
+            if column.strip().lower() in IMPORT_COLUMN_NAMES
+        }
+        if "date" not in source_columns or "event_type" not in source_columns:
+            raise ValueError(
+                "Import file must contain at least a date and an event type column."
+            )
+        select_list = ", ".join(
+            (
+                f'CAST("{source_columns[column]}" AS VARCHAR) AS {column}'
+                if column in source_columns
+                else f"CAST(NULL AS VARCHAR) AS {column}"
+            )
+            for column in ["date", "event_type", "clock_in", "clock_out"]
+        )
+        # Stage, parse and validate all rows at once
+        connection.execute(
+            f"""
+            CREATE OR REPLACE TEMP TABLE import_staging AS
+            WITH source AS (
+                SELECT row_number() OVER () AS row_number, {select_list} FROM import_source
+            ),
+            parsed AS (
+                SELECT
+                    row_number,
+                    date AS raw_date,
+                    TRY_CAST(trim(date) AS DATE) AS date,
+                    trim(event_type) AS event_type,
+                    coalesce(TRY_STRPTIME(trim(clock_in), '%H:%M'), TRY_STRPTIME(trim(clock_in), '%H:%M:%S')) AS clock_in,
+                    coalesce(TRY_STRPTIME(trim(clock_out), '%H:%M'), TRY_STRPTIME(trim(clock_out), '%H:%M:%S')) AS clock_out,
+                FROM source
+            ),
+            validated AS (
+                SELECT
+                    parsed.*,
+                    CASE
+                        WHEN parsed.date IS NULL THEN 'Invalid date'
+                        WHEN parsed.date > current_date THEN 'Date is in the future'
+                        WHEN calendar.date IS NULL OR NOT calendar.is_work_day THEN 'Date is not a work day since the start date'
+                        WHEN NOT list_contains(?::VARCHAR[], parsed.event_type) THEN 'Unknown event type'
+                        WHEN parsed.event_type = 'Work' AND (parsed.clock_in IS NULL OR parsed.clock_out IS NULL) THEN 'Clock in / clock out time must be in format HH:MM'
+                        WHEN parsed.event_type = 'Work' AND parsed.clock_out <= parsed.clock_in THEN 'Clock out time must be after clock in time'
+                    END AS error,
+                FROM parsed
+                LEFT JOIN calendar ON calendar.user_id = ? AND calendar.date = parsed.date
+            )
+            SELECT
+                *,
+                -- Only valid rows count as earlier rows of the same date
+                row_number() OVER (PARTITION BY date, error IS NULL ORDER BY row_number) > 1
+                    OR date IN (SELECT date FROM times WHERE user_id = ?) AS is_duplicate,
+            FROM validated;
+            """,
+            [EVENT_TYPES, user_id, user_id],
+        )
+        invalid_rows = connection.execute(
+            "SELECT row_number, raw_date, error FROM import_staging WHERE error IS NOT NULL ORDER BY row_number;"
+        ).fetchall()
+        duplicate_dates = [
+            row[0]
+            for row in connection.execute(
+                "SELECT DISTINCT strftime(date, '%Y-%m-%d') FROM import_staging WHERE error IS NULL AND is_duplicate ORDER BY 1;"
+            ).fetchall()
+        ]
+        # Insert valid, non-duplicate rows and add them to the balance rollups in one transaction
+        connection.execute("BEGIN TRANSACTION;")
+        try:
+            imported = connection.execute(
+                """
+                INSERT INTO times (user_id, date, event_type, clock_in, clock_out, break_time_minutes, expected_total_minutes, expected_total_minutes_work_default, actual_total_minutes, day_balance_minutes, created_at, updated_at)
+                SELECT
+                    CAST(? AS INTEGER),
+                    date,
+                    event_type,
+                    CASE WHEN event_type = 'Work' THEN hour(clock_in) * 60 + minute(clock_in) END,
+                    CASE WHEN event_type = 'Work' THEN hour(clock_out) * 60 + minute(clock_out) END,
+                    CASE WHEN event_type = 'Work' THEN CAST(? AS SMALLINT) END,
+                    CASE WHEN event_type IN ('Work', 'Overtime Compensation') THEN CAST(? AS SMALLINT) END,
+                    CAST(? AS SMALLINT),
+                    CASE WHEN event_type = 'Work' THEN CAST(date_diff('minute', clock_in, clock_out) AS SMALLINT) END,
+                    CASE
+                        WHEN event_type = 'Work' THEN CAST(date_diff('minute', clock_in, clock_out) - CAST(? AS SMALLINT) AS SMALLINT)
+                        WHEN event_type = 'Overtime Compensation' THEN -CAST(? AS SMALLINT)
+                    END,
+                    CURRENT_TIMESTAMP,
+                    CURRENT_TIMESTAMP
+                FROM import_staging
+                WHERE error IS NULL AND NOT is_duplicate
+                ORDER BY date;
+                """,
+                [
+                    user_id,
+                    int(config.daily_break_minutes),
+                    int(config.expected_entry_minutes),
+                    int(config.expected_entry_minutes),
+                    int(config.expected_entry_minutes),
+                    int(config.expected_entry_minutes),
+                ],
+            ).fetchone()[0]
+            apply_entry_inserts(
+                connection,
+                user_id,
+                "SELECT date FROM import_staging WHERE error IS NULL AND NOT is_duplicate",
+            )
+            connection.execute("COMMIT;")
+        except Exception as e:
+            connection.execute("ROLLBACK;")
+            raise e
+    finally:
+        connection.execute("DROP TABLE IF EXISTS import_staging;")
+        connection.unregister("import_source")
+    return {
+        "imported": int(imported),
+        "duplicate_dates": duplicate_dates,
+        "invalid_rows": invalid_rows,
+    }
@@ -0,0 +1,313 @@
+# STANDARD LIBRARY IMPORTS
+import os
+import json
+from datetime import datetime, date
+
+# UTIL IMPORTS
+from utils.config import RES_PATH, PUNCH_JOURNAL_FILE_NAME
+
+# Punching only appends to the journal and never opens the database; duckdb and
+# the entry modules are imported by compact_journal when it is needed.
+
+PUNCH_EVENTS = ["in", "out"]
+
+
+def get_journal_path() -> str:
+    """
+    Returns the path of the punch journal.
+
+    Args:
+        None
+
+    Returns:
+        str: Path of the journal file.
+    """
+    return os.path.join(RES_PATH, PUNCH_JOURNAL_FILE_NAME)
+
+
+def lock_journal(descriptor: int) -> None:
+    """
+    Takes the exclusive lock of an open journal file, released when the descriptor is closed.
+
+    Args:
+        descriptor (int): File descriptor of the journal.
+
+    Returns:
+        None
+    """
+    # Lazy import, fcntl is only available on Unix-like systems and only needed for punching
+    try:
+        import fcntl
+    except ImportError:
+        raise ValueError("Punching requires a Unix-like operating system.")
+    fcntl.flock(descriptor, fcntl.LOCK_EX)
+
+
+def read_journal(descriptor: int, offset: int = 0) -> bytes:
+    """
+    Reads an open journal file from an offset to its end.
+
+    Args:
+        descriptor (int): File descriptor of the journal.
+        offset (int): Byte offset to start reading at.
+
+    Returns:
+        bytes: Journal contents.
+    """
+    os.lseek(descriptor, offset, os.SEEK_SET)
+    data = b""
+    while chunk := os.read(descriptor, 65536):
+        data += chunk
+    return data
+
+
+def append_punch(event: str, user_name: str = None, at: datetime = None) -> datetime:
+    """
+    Appends a punch event to the journal and flushes it to disk before returning.
+    Costs one locked append regardless of the journal size and works while another process holds the database.
+
+    Args:
+        event (str): Punch event, one of PUNCH_EVENTS.
+        user_name (str): User name, None for the only existing user.
+        at (datetime): Time of the event, defaults to now.
+
+    Returns:
+        datetime: Time of the event.
+    """
+    if event not in PUNCH_EVENTS:
+        raise ValueError(f"Punch event must be one of: {', '.join(PUNCH_EVENTS)}.")
+    at = (at or datetime.now()).replace(microsecond=0)
+    line = json.dumps({"event": event, "user": user_name, "at": at.isoformat()}) + "\n"
+    os.makedirs(RES_PATH, exist_ok=True)
+    descriptor = os.open(
+        get_journal_path(), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600
+    )
+    try:
+        # Excludes a concurrent compaction, which rewrites the journal in place
+        lock_journal(descriptor)
+        os.write(descriptor, line.encode("utf-8"))
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+    return at
+
+
+def describe_punch(event: dict) -> str:
+    """
+    Describes a punch event for messages.
+
+    Args:
+        event (dict): Punch event.
+
+    Returns:
+        str: Description, e.g. "Punch in at 2025-06-02 08:00 (Jane Doe)".
+    """
+    user = f" ({event['user']})" if event["user"] else ""
+    return f"Punch {event['event']} at {event['at'].strftime('%Y-%m-%d %H:%M')}{user}"
+
+
+def parse_journal(data: bytes) -> list:
+    """
+    Parses journal lines into punch events.
+    Lines that cannot be parsed (e.g. a line torn by a crash) are skipped.
+
+    Args:
+        data (bytes): Journal contents.
+
+    Returns:
+        list: Events as dicts with 'event', 'user' and 'at' (datetime), in journal order.
+    """
+    events = []
+    for line in data.decode("utf-8", errors="replace").splitlines():
+        try:
+            record = json.loads(line)
+            events.append(
+                {
+                    "event": record["event"],
+                    "user": record.get("user"),
+                    "at": datetime.fromisoformat(record["at"]),
+                }
+            )
+        except (ValueError, KeyError, TypeError):
+            continue
+    return events
+
+
+def pair_punches(events: list, today: date = None) -> tuple:
+    """
+    Folds punch events into work sessions per user and day.
+    Sessions of the same day are merged from the first punch in to the last punch out. A punch in without
+    punch out stays pending while it is from today, punches that cannot be paired are rejected.
+
+    Args:
+        events (list): Events as returned by parse_journal.
+        today (date): Current date, defaults to today.
+
+    Returns:
+        tuple: (sessions {(user, date formatted as YYYY-MM-DD): [first in, last out]}, pending events, rejected (event, reason) tuples).
+    """
+    today = today or date.today()
+    sessions = {}
+    pending = []
+    rejected = []
+    open_punches = {}
+    for event in sorted(events, key=lambda event: event["at"]):
+        user = event["user"]
+        open_punch = open_punches.get(user)
+        if event["event"] == "in":
+            if open_punch is not None:
+                if open_punch["at"].date() == event["at"].date():
+                    rejected.append((event, "Already punched in."))
+                    continue
+                rejected.append((open_punch, "Punched in without punching out."))
+            open_punches[user] = event
+        elif event["event"] == "out":
+            if open_punch is None:
+                rejected.append((event, "Punched out without punching in."))
+                continue
+            del open_punches[user]
+            if open_punch["at"].date() != event["at"].date():
+                rejected.append(
+                    (open_punch, "Punch in and punch out on different days.")
+                )
+                rejected.append((event, "Punch in and punch out on different days."))
+                continue
+            key = (user, open_punch["at"].strftime("%Y-%m-%d"))
+            session = sessions.setdefault(key, [open_punch["at"], event["at"]])
+            session[0] = min(session[0], open_punch["at"])
+            session[1] = max(session[1], event["at"])
+        else:
+            rejected.append((event, "Unknown punch event."))
+    # Open punches of earlier days can no longer be punched out
+    for open_punch in open_punches.values():
+        if open_punch["at"].date() < today:
+            rejected.append((open_punch, "Punched in without punching out."))
+        else:
+            pending.append(open_punch)
+    return sessions, pending, rejected
+
+
+def compact_journal(connection: any) -> dict:
+    """
+    Folds the completed work sessions of the punch journal into 'times' entries in a single transaction.
+
+    Sessions are written the same way as add_entry writes Work entries. A session on a day that already has a
+    Work entry widens that entry, e.g. when punching in again after lunch. Sessions on non-work days, on days with
+    an entry of another type or of unknown users are rejected. Pending punches stay in the journal, everything
+    else is removed once the transaction is committed. The journal is only locked while it is read and rewritten,
+    not during the transaction.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+
+    Returns:
+        dict: Number of written entries and rejected (event, reason) tuples.
+    """
+    result = {"compacted": 0, "rejected": []}
+    # Journal is usually empty -> no lock, no reads
+    if (
+        not os.path.exists(get_journal_path())
+        or os.path.getsize(get_journal_path()) == 0
+    ):
+        return result
+    from utils.rollups import ensure_rollups
+    from utils.queries import get_entry
+    from utils.entries import write_entries
+    from utils.user_config import resolve_user, get_config
+
+    # Snapshot the journal, the lock is only held for file I/O so punching never waits on the database.
+    # Only the process holding the database compacts, so the snapshot can't be compacted concurrently.
+    descriptor = os.open(get_journal_path(), os.O_RDWR)
+    try:
+        lock_journal(descriptor)
+        data = read_journal(descriptor)
+    finally:
+        os.close(descriptor)
+    sessions, pending, rejected = pair_punches(parse_journal(data))
+    ensure_rollups(connection)
+    # Resolve users once per compaction, sessions of the same user and day are merged
+    configs = {}
+    user_sessions = {}
+    for (user, session_date), (clock_in, clock_out) in sessions.items():
+        if user not in configs:
+            try:
+                configs[user] = get_config(connection, resolve_user(connection, user))
+            except ValueError as e:
+                configs[user] = e
+        if isinstance(configs[user], ValueError):
+            rejected.append(
+                ({"event": "in", "user": user, "at": clock_in}, str(configs[user]))
+            )
+            continue
+        key = (configs[user].user_id, session_date)
+        if key in user_sessions:
+            clock_in = min(clock_in, user_sessions[key][1])
+            clock_out = max(clock_out, user_sessions[key][2])
+        user_sessions[key] = [configs[user], clock_in, clock_out]
+    writes = []
+    for (_, session_date), (config, clock_in, clock_out) in sorted(
+        user_sessions.items()
+    ):
+        session_event = {"event": "in", "user": config.name, "at": clock_in}
+        if not config.is_work_day(clock_in.date()):
+            rejected.append((session_event, "Not a work day since the start date."))
+            continue
+        clock_in = clock_in.hour * 60 + clock_in.minute
+        clock_out = clock_out.hour * 60 + clock_out.minute
+        entry = get_entry(connection, config.user_id, session_date)
+        operation = "insert"
+        if entry is not None:
+            if entry["event_type"] != "Work":
+                rejected.append(
+                    (
+                        session_event,
+                        f"A {entry['event_type']} entry exists for {session_date}.",
+                    )
+                )
+                continue
+            operation = "update"
+            clock_in = min(clock_in, entry["clock_in"])
+            clock_out = max(clock_out, entry["clock_out"])
+        if clock_out <= clock_in:
+            rejected.append((session_event, "Work session shorter than a minute."))
+            continue
+        writes.append(
+            {
+                "operation": operation,
+                "date": session_date,
+                "event_type": "Work",
+                "clock_in": clock_in,
+                "clock_out": clock_out,
+                "config": config,
+            }
+        )
+    write_entries(connection, writes)
+    # Remove the snapshot once it is committed, keeping its pending punches and the punches appended since.
+    # The inode is kept, punches waiting for the lock append to this file.
+    descriptor = os.open(get_journal_path(), os.O_RDWR)
+    try:
+        lock_journal(descriptor)
+        appended = read_journal(descriptor, len(data))
+        os.ftruncate(descriptor, 0)
+        os.lseek(descriptor, 0, os.SEEK_SET)
+        os.write(
+            descriptor,
+            "".join(
+                json.dumps(
+                    {
+                        "event": event["event"],
+                        "user": event["user"],
+                        "at": event["at"].isoformat(),
+                    }
+                )
+                + "\n"
+                for event in pending
+            ).encode("utf-8")
+            + appended,
+        )
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+    result["compacted"] = len(writes)
+    result["rejected"] = rejected
+    return result
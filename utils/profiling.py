@@ -0,0 +1,85 @@
+# STANDARD LIBRARY IMPORTS
+import json
+import time
+
+# UTIL IMPORTS
+from utils.colors import bcolors
+
+
+class StartupProfiler:
+    """
+    Records wall time of consecutive startup phases.
+    Each call to lap() closes the phase that started at the previous lap.
+    """
+
+    def __init__(self, started_at: float = None) -> None:
+        """
+        Creates a new profiler.
+
+        Args:
+            started_at (float): time.perf_counter() value at which the first phase started.
+
+        Returns:
+            None
+        """
+        self._last_lap = started_at if started_at is not None else time.perf_counter()
+        self._started_at = self._last_lap
+        self.phases = {}
+
+    def lap(self, phase: str) -> None:
+        """
+        Records the time elapsed since the previous lap as the given phase.
+
+        Args:
+            phase (str): Name of the phase that just finished.
+
+        Returns:
+            None
+        """
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self._last_lap)
+        self._last_lap = now
+
+    def total(self) -> float:
+        """
+        Returns the total time since the profiler was started.
+
+        Args:
+            None
+
+        Returns:
+            float: Total time in seconds.
+        """
+        return self._last_lap - self._started_at
+
+    def report(self, as_json: bool = False) -> None:
+        """
+        Prints the per-phase wall times.
+
+        Args:
+            as_json (bool): Print machine-readable JSON instead of a table.
+
+        Returns:
+            None
+        """
+        if as_json:
+            print(
+                json.dumps(
+                    {
+                        "phases_ms": {
+                            phase: round(seconds * 1000, 3)
+                            for phase, seconds in self.phases.items()
+                        },
+                        "total_ms": round(self.total() * 1000, 3),
+                    }
+                )
+            )
+            return
+        print(f"\n{bcolors.OKCYAN}{bcolors.UNDERLINE}→ STARTUP PROFILE{bcolors.ENDC}\n")
+        for phase, seconds in self.phases.items():
+            print(
+                f"{bcolors.ORANGE}‣ {phase + ':':<22}{bcolors.ENDC}{seconds * 1000:>9.1f}ms"
+            )
+        print(
+            f"{bcolors.ORANGE}‣ {'Total:':<22}{bcolors.ENDC}{self.total() * 1000:>9.1f}ms"
+        )
@@ -0,0 +1,205 @@
+# STANDARD LIBRARY IMPORTS
+from datetime import datetime
+
+# THIRD PARTY IMPORTS
+import duckdb as ddb
+
+# UTIL IMPORTS
+from utils.tracing import traced
+
+# 'times' columns returned for an entry, in order
+ENTRY_COLUMNS = [
+    "entry_id",
+    "user_id",
+    "date",
+    "day_of_week",
+    "event_type",
+    "clock_in",
+    "clock_out",
+    "break_time_minutes",
+    "expected_total_minutes",
+    "expected_total_minutes_work_default",
+    "actual_total_minutes",
+    "day_balance_minutes",
+    "created_at",
+    "updated_at",
+]
+
+
+def build_date_conditions(
+    column: str, start_date: str = None, end_date: str = None
+) -> list:
+    """
+    Builds the conditions limiting a date column to a date range.
+
+    Args:
+        column (str): Date column, e.g. 'date' or 'calendar.date'.
+        start_date (str): Optional first date (inclusive) formatted as YYYY-MM-DD.
+        end_date (str): Optional last date (inclusive) formatted as YYYY-MM-DD.
+
+    Returns:
+        list: SQL conditions, empty if the range is open.
+    """
+    # Dates are validated and embedded as literals; binding query parameters
+    # makes the DuckDB client import pandas, which the fast CLI path avoids
+    return [
+        f"{column} {operator} DATE '{datetime.strptime(value, '%Y-%m-%d').date()}'"
+        for operator, value in [(">=", start_date), ("<=", end_date)]
+        if value
+    ]
+
+
+def build_entry_conditions(
+    user_id: int, start_date: str = None, end_date: str = None
+) -> str:
+    """
+    Builds the WHERE conditions selecting a user's entries, optionally limited to a date range.
+    Entries are stored in (user_id, date) order, so these conditions only scan the row groups of the range.
+
+    Args:
+        user_id (int): User id.
+        start_date (str): Optional first date (inclusive) formatted as YYYY-MM-DD.
+        end_date (str): Optional last date (inclusive) formatted as YYYY-MM-DD.
+
+    Returns:
+        str: SQL conditions.
+    """
+    return " AND ".join(
+        [f"user_id = {int(user_id)}"]
+        + build_date_conditions("date", start_date, end_date)
+    )
+
+
+def build_window(limit: int = None, offset: int = 0) -> str:
+    """
+    Builds the LIMIT / OFFSET clause of a windowed read.
+
+    Args:
+        limit (int): Maximum number of rows, None for all rows.
+        offset (int): Number of rows to skip.
+
+    Returns:
+        str: SQL clause, empty if the read is not windowed.
+    """
+    window = f" LIMIT {int(limit)}" if limit is not None else ""
+    return window + (f" OFFSET {int(offset)}" if offset else "")
+
+
+@traced("db")
+def count_entries(
+    connection: ddb.DuckDBPyConnection,
+    user_id: int,
+    start_date: str = None,
+    end_date: str = None,
+) -> int:
+    """
+    Counts a user's entries, optionally limited to a date range.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_id (int): User id.
+        start_date (str): Optional first date (inclusive) formatted as YYYY-MM-DD.
+        end_date (str): Optional last date (inclusive) formatted as YYYY-MM-DD.
+
+    Returns:
+        int: Number of entries.
+    """
+    return connection.execute(
+        f"SELECT count(*) FROM times WHERE {build_entry_conditions(user_id, start_date, end_date)};"
+    ).fetchone()[0]
+
+
+@traced("db")
+def get_entry_dates(
+    connection: ddb.DuckDBPyConnection,
+    user_id: int,
+    start_date: str = None,
+    end_date: str = None,
+    limit: int = None,
+    offset: int = 0,
+) -> list:
+    """
+    Returns the dates of a user's entries (newest first), without reading any other column.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_id (int): User id.
+        start_date (str): Optional first date (inclusive) formatted as YYYY-MM-DD.
+        end_date (str): Optional last date (inclusive) formatted as YYYY-MM-DD.
+        limit (int): Maximum number of dates, None for all dates.
+        offset (int): Number of (newest) dates to skip.
+
+    Returns:
+        list: Dates formatted as YYYY-MM-DD, in descending order.
+    """
+    return [
+        row[0]
+        for row in connection.execute(
+            f"SELECT strftime(date, '%Y-%m-%d') FROM times WHERE {build_entry_conditions(user_id, start_date, end_date)} ORDER BY date DESC{build_window(limit, offset)};"
+        ).fetchall()
+    ]
+
+
+@traced("db")
+def get_entry_months(connection: ddb.DuckDBPyConnection, user_id: int) -> list:
+    """
+    Returns the months that a user has entries in, with the number of entries per month.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_id (int): User id.
+
+    Returns:
+        list: (month formatted as YYYY-MM, entries) tuples, newest month first.
+    """
+    return connection.execute(
+        f"SELECT strftime(date, '%Y-%m') AS month, count(*) FROM times WHERE {build_entry_conditions(user_id)} GROUP BY month ORDER BY month DESC;"
+    ).fetchall()
+
+
+@traced("db")
+def get_entries(
+    connection: ddb.DuckDBPyConnection,
+    user_id: int,
+    start_date: str = None,
+    end_date: str = None,
+    limit: int = None,
+    offset: int = 0,
+) -> list:
+    """
+    Returns a user's entries (newest first), optionally limited to a date range and window.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_id (int): User id.
+        start_date (str): Optional first date (inclusive) formatted as YYYY-MM-DD.
+        end_date (str): Optional last date (inclusive) formatted as YYYY-MM-DD.
+        limit (int): Maximum number of entries, None for all entries.
+        offset (int): Number of (newest) entries to skip.
+
+    Returns:
+        list: Entries as dicts of ENTRY_COLUMNS, in descending date order.
+    """
+    return [
+        dict(zip(ENTRY_COLUMNS, row))
+        for row in connection.execute(
+            f"SELECT {', '.join(ENTRY_COLUMNS)} FROM times WHERE {build_entry_conditions(user_id, start_date, end_date)} ORDER BY date DESC{build_window(limit, offset)};"
+        ).fetchall()
+    ]
+
+
+@traced("db")
+def get_entry(connection: ddb.DuckDBPyConnection, user_id: int, date: str) -> dict:
+    """
+    Returns a single entry of a user (point lookup on the (user_id, date) key).
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_id (int): User id.
+        date (str): Entry date formatted as YYYY-MM-DD.
+
+    Returns:
+        dict: Entry as dict of ENTRY_COLUMNS, None if no entry exists for the date.
+    """
+    entries = get_entries(connection, user_id, date, date)
+    return entries[0] if len(entries) > 0 else None
@@ -0,0 +1,264 @@
+# THIRD PARTY IMPORTS
+import duckdb as ddb
+
+# UTIL IMPORTS
+from utils.tracing import traced
+
+ROLLUP_GRAINS = ["week", "month", "year"]
+
+
+@traced("db")
+def ensure_rollups(connection: ddb.DuckDBPyConnection) -> None:
+    """
+    Creates the per-user materialized balance tables if they don't exist.
+    When the tables are new (or were never populated), they are built once from the 'times' table.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+
+    Returns:
+        None
+    """
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS balance_total (
+            user_id INTEGER NOT NULL PRIMARY KEY,
+            entries BIGINT NOT NULL,
+            balance_minutes BIGINT NOT NULL,
+            worked_minutes BIGINT NOT NULL,
+            expected_minutes BIGINT NOT NULL,
+        );
+        """
+    )
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS balance_rollups (
+            user_id INTEGER NOT NULL,
+            grain VARCHAR NOT NULL,
+            period_start DATE NOT NULL,
+            entries BIGINT NOT NULL,
+            balance_minutes BIGINT NOT NULL,
+            worked_minutes BIGINT NOT NULL,
+            expected_minutes BIGINT NOT NULL,
+            PRIMARY KEY (user_id, grain, period_start),
+        );
+        """
+    )
+    if connection.execute("SELECT count(*) FROM balance_total;").fetchone()[0] == 0:
+        connection.execute("BEGIN TRANSACTION;")
+        try:
+            rebuild_rollups(connection)
+            connection.execute("COMMIT;")
+        except Exception as e:
+            connection.execute("ROLLBACK;")
+            raise e
+
+
+def rebuild_rollups(connection: ddb.DuckDBPyConnection, user_id: int = None) -> None:
+    """
+    Recomputes the materialized balance tables from scratch from the 'times' table.
+    Must be called inside a transaction.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_id (int): Only recompute the rows of this user, None for all users.
+
+    Returns:
+        None
+    """
+    condition = f"WHERE user_id = {int(user_id)}" if user_id is not None else ""
+    connection.execute(f"DELETE FROM balance_total {condition};")
+    connection.execute(
+        f"""
+        INSERT INTO balance_total
+        SELECT
+            user_id,
+            count(*),
+            coalesce(sum(day_balance_minutes), 0),
+            coalesce(sum(actual_total_minutes), 0),
+            coalesce(sum(expected_total_minutes), 0)
+        FROM times
+        {condition}
+        GROUP BY user_id;
+        """
+    )
+    connection.execute(f"DELETE FROM balance_rollups {condition};")
+    connection.execute(
+        f"""
+        INSERT INTO balance_rollups
+        SELECT
+            user_id,
+            grain,
+            CAST(date_trunc(grain, date) AS DATE) AS period_start,
+            count(*),
+            coalesce(sum(day_balance_minutes), 0),
+            coalesce(sum(actual_total_minutes), 0),
+            coalesce(sum(expected_total_minutes), 0)
+        FROM times, (SELECT unnest(?::VARCHAR[]) AS grain)
+        {condition}
+        GROUP BY ALL;
+        """,
+        [ROLLUP_GRAINS],
+    )
+
+
+def apply_entry_change(
+    connection: ddb.DuckDBPyConnection, user_id: int, date: str, old: tuple, new: tuple
+) -> None:
+    """
+    Applies the difference between the old and new version of an entry to the materialized balance tables.
+    Must be called inside the same transaction as the write to the 'times' table.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_id (int): User id of the entry.
+        date (str): Date of the entry formatted as YYYY-MM-DD.
+        old (tuple): (balance, worked, expected) minutes before the write, None for inserts.
+        new (tuple): (balance, worked, expected) minutes after the write.
+
+    Returns:
+        None
+    """
+    entries_delta = 0 if old is not None else 1
+    old = old if old is not None else (None, None, None)
+    balance_delta, worked_delta, expected_delta = [
+        int(new_value or 0) - int(old_value or 0)
+        for old_value, new_value in zip(old, new)
+    ]
+    connection.execute(
+        """
+        INSERT INTO balance_total
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (user_id) DO UPDATE SET
+            entries = entries + excluded.entries,
+            balance_minutes = balance_minutes + excluded.balance_minutes,
+            worked_minutes = worked_minutes + excluded.worked_minutes,
+            expected_minutes = expected_minutes + excluded.expected_minutes;
+        """,
+        [user_id, entries_delta, balance_delta, worked_delta, expected_delta],
+    )
+    connection.execute(
+        """
+        INSERT INTO balance_rollups
+        SELECT ?, grain, CAST(date_trunc(grain, CAST(? AS DATE)) AS DATE), ?, ?, ?, ?
+        FROM (SELECT unnest(?::VARCHAR[]) AS grain)
+        ON CONFLICT (user_id, grain, period_start) DO UPDATE SET
+            entries = entries + excluded.entries,
+            balance_minutes = balance_minutes + excluded.balance_minutes,
+            worked_minutes = worked_minutes + excluded.worked_minutes,
+            expected_minutes = expected_minutes + excluded.expected_minutes;
+        """,
+        [
+            user_id,
+            date,
+            entries_delta,
+            balance_delta,
+            worked_delta,
+            expected_delta,
+            ROLLUP_GRAINS,
+        ],
+    )
+
+
+def apply_entry_inserts(
+    connection: ddb.DuckDBPyConnection, user_id: int, dates_query: str
+) -> None:
+    """
+    Adds bulk inserted entries to the materialized balance tables, the set-based counterpart of apply_entry_change.
+    Must be called inside the same transaction as the inserts into the 'times' table.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_id (int): User id of the entries.
+        dates_query (str): SQL query selecting the dates of the inserted entries as a 'date' column.
+
+    Returns:
+        None
+    """
+    # Only the inserted entries are aggregated, the dates are joined inside the database
+    inserted = f"SEMI JOIN ({dates_query}) AS inserted ON inserted.date = times.date"
+    condition = f"WHERE times.user_id = {int(user_id)}"
+    connection.execute(
+        f"""
+        INSERT INTO balance_total
+        SELECT
+            user_id,
+            count(*),
+            coalesce(sum(day_balance_minutes), 0),
+            coalesce(sum(actual_total_minutes), 0),
+            coalesce(sum(expected_total_minutes), 0)
+        FROM times {inserted}
+        {condition}
+        GROUP BY user_id
+        ON CONFLICT (user_id) DO UPDATE SET
+            entries = entries + excluded.entries,
+            balance_minutes = balance_minutes + excluded.balance_minutes,
+            worked_minutes = worked_minutes + excluded.worked_minutes,
+            expected_minutes = expected_minutes + excluded.expected_minutes;
+        """
+    )
+    connection.execute(
+        f"""
+        INSERT INTO balance_rollups
+        SELECT
+            user_id,
+            grain,
+            CAST(date_trunc(grain, date) AS DATE) AS period_start,
+            count(*),
+            coalesce(sum(day_balance_minutes), 0),
+            coalesce(sum(actual_total_minutes), 0),
+            coalesce(sum(expected_total_minutes), 0)
+        FROM times {inserted}, (SELECT unnest(?::VARCHAR[]) AS grain)
+        {condition}
+        GROUP BY ALL
+        ON CONFLICT (user_id, grain, period_start) DO UPDATE SET
+            entries = entries + excluded.entries,
+            balance_minutes = balance_minutes + excluded.balance_minutes,
+            worked_minutes = worked_minutes + excluded.worked_minutes,
+            expected_minutes = expected_minutes + excluded.expected_minutes;
+        """,
+        [ROLLUP_GRAINS],
+    )
+
+
+@traced("db")
+def get_balance(
+    connection: ddb.DuckDBPyConnection,
+    user_id: int,
+    grain: str = None,
+    period_start: str = None,
+) -> dict:
+    """
+    Looks up a user's materialized balance, either in total or for a single week / month / year.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_id (int): User id.
+        grain (str): None for the total balance, otherwise one of "week", "month" or "year".
+        period_start (str): Any date within the requested period, formatted as YYYY-MM-DD.
+
+    Returns:
+        dict: Entries, balance, worked and expected minutes of the requested period.
+    """
+    if grain is None:
+        row = connection.execute(
+            f"SELECT entries, balance_minutes, worked_minutes, expected_minutes FROM balance_total WHERE user_id = {int(user_id)};"
+        ).fetchone()
+    else:
+        if grain not in ROLLUP_GRAINS:
+            raise ValueError(f"Unknown rollup grain '{grain}'.")
+        row = connection.execute(
+            """
+            SELECT entries, balance_minutes, worked_minutes, expected_minutes
+            FROM balance_rollups
+            WHERE user_id = ? AND grain = ? AND period_start = CAST(date_trunc(?, CAST(? AS DATE)) AS DATE);
+            """,
+            [user_id, grain, grain, period_start],
+        ).fetchone()
+    row = row if row is not None else (0, 0, 0, 0)
+    return {
+        "entries": int(row[0]),
+        "balance_minutes": int(row[1]),
+        "worked_minutes": int(row[2]),
+        "expected_minutes": int(row[3]),
+    }
@@ -0,0 +1,342 @@
+# THIRD PARTY IMPORTS
+import duckdb as ddb
+
+# UTIL IMPORTS
+from utils.tracing import traced
+from utils.user_config import import_legacy_config
+
+SCHEMA_VERSION_TABLE_DDL = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER NOT NULL PRIMARY KEY,
+        description VARCHAR NOT NULL,
+        applied_at TIMESTAMP NOT NULL,
+    );
+"""
+# Tables derived from 'times' that are rebuilt after a storage migration
+DERIVED_TABLES = ["balance_total", "balance_rollups", "calendar", "calendar_meta"]
+
+
+def migrate_to_v1_single_user_times(connection: ddb.DuckDBPyConnection) -> None:
+    """
+    Schema version 1: 'times' table of the single-user versions.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+
+    Returns:
+        None
+    """
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS times (
+            uuid VARCHAR NOT NULL PRIMARY KEY,
+            date DATE NOT NULL UNIQUE,
+            day_of_week VARCHAR NOT NULL,
+            event_type VARCHAR NOT NULL,
+            clock_in VARCHAR,
+            clock_out VARCHAR,
+            break_time_minutes INT,
+            expected_total_minutes INT,
+            expected_total_minutes_work_default INT,
+            actual_total_minutes INT,
+            day_balance_minutes INT,
+            created_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL,
+        );
+        """
+    )
+
+
+def migrate_to_v2_per_user_storage(connection: ddb.DuckDBPyConnection) -> None:
+    """
+    Schema version 2: 'users' table and per-user 'times' entries.
+    The legacy user_config.json becomes the first user, all existing entries are assigned
+    to that user and derived tables are dropped so that they are rebuilt per user.
+    The json file is only read here, ensure_schema retires it once the migration is committed.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+
+    Returns:
+        None
+    """
+    connection.execute(
+        """
+        CREATE SEQUENCE IF NOT EXISTS users_user_id_seq START 1;
+        CREATE TABLE IF NOT EXISTS users (
+            user_id INTEGER NOT NULL PRIMARY KEY DEFAULT nextval('users_user_id_seq'),
+            name VARCHAR NOT NULL UNIQUE,
+            start_date DATE NOT NULL,
+            weekly_work_minutes DOUBLE NOT NULL,
+            work_days VARCHAR[] NOT NULL,
+            daily_break_minutes INTEGER NOT NULL,
+            expected_daily_total_minutes DOUBLE NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL,
+        );
+        CREATE TABLE times_migrated (
+            uuid VARCHAR NOT NULL PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            date DATE NOT NULL,
+            day_of_week VARCHAR NOT NULL,
+            event_type VARCHAR NOT NULL,
+            clock_in VARCHAR,
+            clock_out VARCHAR,
+            break_time_minutes INT,
+            expected_total_minutes INT,
+            expected_total_minutes_work_default INT,
+            actual_total_minutes INT,
+            day_balance_minutes INT,
+            created_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL,
+            UNIQUE (user_id, date),
+        );
+        """
+    )
+    # Fresh databases have no entries and therefore no owner to migrate them to
+    if connection.execute("SELECT count(*) FROM times;").fetchone()[0] > 0:
+        user_id = import_legacy_config(connection, rename_file=False)
+        if user_id is None:
+            raise ValueError(
+                "Existing entries can't be migrated, the user config file of the previous version is missing."
+            )
+        connection.execute(
+            f"""
+            INSERT INTO times_migrated
+            SELECT uuid, {int(user_id)}, date, day_of_week, event_type, clock_in, clock_out, break_time_minutes, expected_total_minutes, expected_total_minutes_work_default, actual_total_minutes, day_balance_minutes, created_at, updated_at
+            FROM times;
+            """
+        )
+    connection.execute("DROP TABLE times;")
+    connection.execute("ALTER TABLE times_migrated RENAME TO times;")
+    for table_name in DERIVED_TABLES:
+        connection.execute(f"DROP TABLE IF EXISTS {table_name};")
+
+
+def migrate_to_v3_typed_storage(connection: ddb.DuckDBPyConnection) -> None:
+    """
+    Schema version 3: compact typed 'times' columns.
+    Event types are stored as ENUM, clock times as minute of the day and minute counts
+    as SMALLINT (a day has 1440 minutes), the weekday is computed from the date instead of stored.
+    Values are unchanged, so derived tables stay valid.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+
+    Returns:
+        None
+    """
+    connection.execute(
+        """
+        CREATE TYPE event_type_enum AS ENUM ('Work', 'Vacation', 'Public / Company Holiday', 'Sick Leave', 'Overtime Compensation');
+        CREATE TABLE times_typed (
+            uuid VARCHAR NOT NULL PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            date DATE NOT NULL,
+            day_of_week VARCHAR GENERATED ALWAYS AS (dayname(date)) VIRTUAL,
+            event_type event_type_enum NOT NULL,
+            clock_in SMALLINT, -- minute of the day
+            clock_out SMALLINT, -- minute of the day
+            break_time_minutes SMALLINT,
+            expected_total_minutes SMALLINT,
+            expected_total_minutes_work_default SMALLINT,
+            actual_total_minutes SMALLINT,
+            day_balance_minutes SMALLINT,
+            created_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL,
+            UNIQUE (user_id, date),
+        );
+        INSERT INTO times_typed (uuid, user_id, date, event_type, clock_in, clock_out, break_time_minutes, expected_total_minutes, expected_total_minutes_work_default, actual_total_minutes, day_balance_minutes, created_at, updated_at)
+        SELECT
+            uuid,
+            user_id,
+            date,
+            event_type,
+            hour(CAST(clock_in AS TIME)) * 60 + minute(CAST(clock_in AS TIME)),
+            hour(CAST(clock_out AS TIME)) * 60 + minute(CAST(clock_out AS TIME)),
+            break_time_minutes, expected_total_minutes, expected_total_minutes_work_default, actual_total_minutes, day_balance_minutes, created_at, updated_at
+        FROM times
+        ORDER BY user_id, date;
+        DROP TABLE times;
+        ALTER TABLE times_typed RENAME TO times;
+        """
+    )
+
+
+def migrate_to_v4_entry_keys(connection: ddb.DuckDBPyConnection) -> None:
+    """
+    Schema version 4: (user_id, date) primary key and a dense integer surrogate key.
+    Entries are only ever looked up by user and date, so the random VARCHAR uuid and its
+    index are replaced by an unindexed 'entry_id' drawn from a sequence in insertion order.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+
+    Returns:
+        None
+    """
+    entries = connection.execute("SELECT count(*) FROM times;").fetchone()[0]
+    connection.execute(
+        f"""
+        CREATE SEQUENCE times_entry_id_seq START {int(entries) + 1};
+        CREATE TABLE times_keyed (
+            entry_id INTEGER NOT NULL DEFAULT nextval('times_entry_id_seq'),
+            user_id INTEGER NOT NULL,
+            date DATE NOT NULL,
+            day_of_week VARCHAR GENERATED ALWAYS AS (dayname(date)) VIRTUAL,
+            event_type event_type_enum NOT NULL,
+            clock_in SMALLINT, -- minute of the day
+            clock_out SMALLINT, -- minute of the day
+            break_time_minutes SMALLINT,
+            expected_total_minutes SMALLINT,
+            expected_total_minutes_work_default SMALLINT,
+            actual_total_minutes SMALLINT,
+            day_balance_minutes SMALLINT,
+            created_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL,
+            PRIMARY KEY (user_id, date),
+        );
+        INSERT INTO times_keyed (entry_id, user_id, date, event_type, clock_in, clock_out, break_time_minutes, expected_total_minutes, expected_total_minutes_work_default, actual_total_minutes, day_balance_minutes, created_at, updated_at)
+        SELECT
+            row_number() OVER (ORDER BY created_at, user_id, date),
+            user_id, date, event_type, clock_in, clock_out, break_time_minutes, expected_total_minutes, expected_total_minutes_work_default, actual_total_minutes, day_balance_minutes, created_at, updated_at
+        FROM times
+        ORDER BY user_id, date;
+        DROP TABLE times;
+        ALTER TABLE times_keyed RENAME TO times;
+        """
+    )
+
+
+def migrate_to_v5_holiday_regions(connection: ddb.DuckDBPyConnection) -> None:
+    """
+    Schema version 5: optional holiday region per user, see utils/holidays.py.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+
+    Returns:
+        None
+    """
+    connection.execute("ALTER TABLE users ADD COLUMN holiday_region VARCHAR;")
+
+
+# Ordered schema migrations (version, description, migration), each applied in its own transaction.
+# Never edit a released migration, append a new one instead.
+MIGRATIONS = [
+    (1, "Single-user 'times' table", migrate_to_v1_single_user_times),
+    (2, "Per-user storage", migrate_to_v2_per_user_storage),
+    (3, "Typed storage", migrate_to_v3_typed_storage),
+    (4, "Entry keys", migrate_to_v4_entry_keys),
+    (5, "Holiday regions", migrate_to_v5_holiday_regions),
+]
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(connection: ddb.DuckDBPyConnection) -> int:
+    """
+    Returns the schema version of the database.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+
+    Returns:
+        int: Schema version, None if the database predates versioning.
+    """
+    try:
+        return (
+            connection.execute("SELECT max(version) FROM schema_version;").fetchone()[0]
+            or 0
+        )
+    except ddb.CatalogException:
+        return None
+
+
+def detect_schema_version(connection: ddb.DuckDBPyConnection) -> int:
+    """
+    Derives the schema version of a database that predates the 'schema_version' table from its tables.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+
+    Returns:
+        int: Schema version (0 for an empty database).
+    """
+    times_columns = [
+        row[0]
+        for row in connection.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_name = 'times';"
+        ).fetchall()
+    ]
+    if len(times_columns) == 0:
+        return 0
+    if "user_id" not in times_columns:
+        return 1
+    return 2
+
+
+@traced("db")
+def migrate_schema(connection: ddb.DuckDBPyConnection) -> int:
+    """
+    Upgrades the database in place to the latest schema version.
+    Each pending migration runs in its own transaction together with its 'schema_version' row,
+    so an interrupted upgrade resumes at the first migration that wasn't committed.
+    On an up-to-date database, this is a single-row read.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+
+    Returns:
+        int: Schema version before the upgrade.
+    """
+    version = get_schema_version(connection)
+    # Databases of versions before the 'schema_version' table -> record the detected version
+    if version is None:
+        version = detect_schema_version(connection)
+        connection.execute("BEGIN TRANSACTION;")
+        try:
+            connection.execute(SCHEMA_VERSION_TABLE_DDL)
+            for migration_version, description, _ in MIGRATIONS[:version]:
+                connection.execute(
+                    "INSERT INTO schema_version VALUES (?, ?, CURRENT_TIMESTAMP);",
+                    [migration_version, f"{description} (detected)"],
+                )
+            connection.execute("COMMIT;")
+        except Exception as e:
+            connection.execute("ROLLBACK;")
+            raise e
+    if version > LATEST_SCHEMA_VERSION:
+        raise ValueError(
+            f"Database schema version {version} is newer than the latest supported version {LATEST_SCHEMA_VERSION}. Please update temps."
+        )
+    for migration_version, description, migration in MIGRATIONS[version:]:
+        connection.execute("BEGIN TRANSACTION;")
+        try:
+            migration(connection)
+            connection.execute(
+                "INSERT INTO schema_version VALUES (?, ?, CURRENT_TIMESTAMP);",
+                [migration_version, description],
+            )
+            connection.execute("COMMIT;")
+        except Exception as e:
+            connection.execute("ROLLBACK;")
+            raise e
+    return version
+
+
+@traced("db")
+def ensure_schema(connection: ddb.DuckDBPyConnection) -> None:
+    """
+    Upgrades the database to the latest schema version, see migrate_schema,
+    and imports the user_config.json of an earlier version (if any).
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+
+    Returns:
+        None
+    """
+    migrate_schema(connection)
+    # Fresh database next to a user_config.json of an earlier version, or a
+    # json file that was imported by a migration and is retired now
+    import_legacy_config(connection)
@@ -6,89 +6,201 @@ import sys
 # UTIL IMPORTS
 from utils.colors import bcolors
 
+# Operations finishing faster than this are not rendered at all
+SPINNER_THRESHOLD_SECONDS = 0.15
+SPINNER_INTERVAL_SECONDS = 0.1
+SPINNER_ANIMATION = "◢◣◤◥"
 
-def loading_spinner(loading_text: str, success_text: str, failure_text: str) -> None:
+
+class SpinnerRenderer:
+    """
+    Single long-lived loading spinner for one operation at a time.
+
+    A daemon render thread is started on first use and sleeps on a condition
+    variable while no operation is running, so starting and stopping an
+    operation never spawns or joins a thread. Frames are only drawn once an
+    operation has been running for longer than the threshold, and stopping
+    wakes the render thread immediately. When the output is not a terminal,
+    nothing but failure messages is printed and no thread is started.
     """
-    Display loading spinner with text.
+
+    def __init__(
+        self,
+        threshold: float = SPINNER_THRESHOLD_SECONDS,
+        interval: float = SPINNER_INTERVAL_SECONDS,
+        stream: any = None,
+    ) -> None:
+        """
+        Creates a new, idle spinner renderer.
+
+        Args:
+            threshold (float): Seconds an operation has to run before it is rendered.
+            interval (float): Seconds between two animation frames.
+            stream (any): Output stream, defaults to sys.stdout.
+
+        Returns:
+            None
+        """
+        self._threshold = threshold
+        self._interval = interval
+        self._stream = stream or sys.stdout
+        self._condition = threading.Condition()
+        self._operation = None
+        self._thread = None
+        self.enabled = self._stream.isatty()
+
+    def start(self, loading_text: str, success_text: str, failure_text: str) -> None:
+        """
+        Starts rendering an operation, replacing the running one (if any).
+
+        Args:
+            loading_text (str): Text to display with loading spinner.
+            success_text (str): Text to display upon successful completion.
+            failure_text (str): Text to display upon failure.
+
+        Returns:
+            None
+        """
+        with self._condition:
+            self._operation = {
+                "loading_text": loading_text,
+                "success_text": success_text,
+                "failure_text": failure_text,
+                "started_at": time.perf_counter(),
+                "shown": False,
+            }
+            if self.enabled and self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._render, name="spinner", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def stop(self, success: bool) -> None:
+        """
+        Stops the running operation and prints its result.
+        Success is only printed if the operation was rendered, failures are always printed.
+
+        Args:
+            success (bool): True if successful, False if failed.
+
+        Returns:
+            None
+        """
+        with self._condition:
+            operation = self._operation
+            self._operation = None
+            self._condition.notify()
+            if operation is None:
+                return
+            if not success:
+                self._write(
+                    f"{bcolors.FAIL}✗ {operation['failure_text']}{bcolors.ENDC}",
+                    operation["shown"],
+                )
+                if not self.enabled:
+                    self._stream.write("\n")
+            elif operation["shown"]:
+                self._write(
+                    f"{bcolors.OKGREEN}✔ {operation['success_text']}{bcolors.ENDC}",
+                    True,
+                )
+            self._stream.flush()
+
+    def _write(self, text: str, overwrite: bool) -> None:
+        """
+        Writes text to the output stream, overwriting the current spinner line if requested.
+        Must be called while holding the condition lock.
+
+        Args:
+            text (str): Text to write.
+            overwrite (bool): Whether to clear the current line first.
+
+        Returns:
+            None
+        """
+        self._stream.write(("\r\033[K" if overwrite else "") + text)
+
+    def _render(self) -> None:
+        """
+        Render loop of the spinner thread.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        frame = 0
+        with self._condition:
+            while True:
+                operation = self._operation
+                # Idle -> sleep until an operation is started
+                if operation is None:
+                    self._condition.wait()
+                    continue
+                # Below threshold -> sleep until it is reached (or the operation stops)
+                remaining = (
+                    operation["started_at"] + self._threshold - time.perf_counter()
+                )
+                if remaining > 0:
+                    self._condition.wait(timeout=remaining)
+                    continue
+                operation["shown"] = True
+                self._write(
+                    f"{SPINNER_ANIMATION[frame % len(SPINNER_ANIMATION)]} {operation['loading_text']}...",
+                    True,
+                )
+                self._stream.flush()
+                frame += 1
+                self._condition.wait(timeout=self._interval)
+
+
+# Process-wide renderer, created on first use
+_renderer = None
+_renderer_lock = threading.Lock()
+
+
+def get_spinner_renderer() -> SpinnerRenderer:
+    """
+    Returns the process-wide spinner renderer.
 
     Args:
-    text (str): Text to display with loading spinner.
+        None
 
     Returns:
-    None
+        SpinnerRenderer: Spinner renderer.
     """
-    # Define loading spinner animation
-    animation = "◢◣◤◥"
-    idx = 0
-    # Get current thread
-    t = threading.current_thread()
-    # Show animation while attribute is set
-    while getattr(t, "is_loading", True):
-        # print(f"{animation[idx % len(animation)]} {loading_text}...", end="\r")
-        print(
-            f"\r{animation[idx % len(animation)]} {loading_text}...", end="", flush=True
-        )
-        idx += 1
-        time.sleep(0.1)
-    # Print success or failure text based on success status attribute
-    if getattr(t, "finished_successfully", True):
-        print(f"\r{bcolors.OKGREEN}✔ {success_text}{bcolors.ENDC}", end="", flush=True)
-    else:
-        print(f"\r{bcolors.FAIL}✗ {failure_text}{bcolors.ENDC}", end="", flush=True)
-
-
-def spawn_loading_spinner_thread(
-    loading_text: str, success_text: str, failure_text: str
-) -> threading.Thread:
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = SpinnerRenderer()
+        return _renderer
+
+
+def start_spinner(loading_text: str, success_text: str, failure_text: str) -> None:
     """
-    Spawns a new thread for the loading spinner.
+    Starts the loading spinner for an operation.
 
     Args:
-    loading_text (str): Text to display with loading spinner.
-    success_text (str): Text to display upon successful completion.
-    failure_text (str): Text to display upon failure.
+        loading_text (str): Text to display with loading spinner.
+        success_text (str): Text to display upon successful completion.
+        failure_text (str): Text to display upon failure.
 
     Returns:
-    thread (threading.Thread): Thread object for loading spinner.
+        None
     """
-    thread = None
-    try:
-        # Spawn thread with target function and arguments
-        thread = threading.Thread(
-            target=loading_spinner, args=(loading_text, success_text, failure_text)
-        )
-        # Set thread as daemon to allow for KeyboardInterrupt to stop thread
-        thread.daemon = True
-        # Set thread loading status to True to start animation
-        thread.is_loading = True
-        # Set thread success status initial value
-        thread.finished_successfully = False
-        # Start thread
-        thread.start()
-    except KeyboardInterrupt:
-        pass
-    return thread
-
-
-def terminate_loading_spinner_thread(
-    thread: threading.Thread, terminate_success: bool
-) -> None:
+    get_spinner_renderer().start(loading_text, success_text, failure_text)
+
+
+def stop_spinner(success: bool) -> None:
     """
-    Terminates the loading spinner thread and sets success status.
+    Stops the loading spinner of the running operation, if any.
 
     Args:
-    thread (threading.Thread): Thread object for loading spinner.
-    terminate_success (bool): True if successful, False if failed.
+        success (bool): True if successful, False if failed.
 
     Returns:
-    None
+        None
     """
-    try:
-        # Set thread loading status attribute to stop animation
-        thread.is_loading = False
-        # Set thread success status for conditional print of failure text
-        thread.finished_successfully = terminate_success
-        # Join thread back to main thread / end thread
-        thread.join()
-    except KeyboardInterrupt:
-        pass
+    get_spinner_renderer().stop(success)
@@ -0,0 +1,61 @@
+# THIRD PARTY IMPORTS
+import duckdb as ddb
+
+# UTIL IMPORTS
+from utils.tracing import traced
+from utils.config import EVENT_TYPES
+from utils.queries import build_entry_conditions
+
+
+@traced("db")
+def get_stats(
+    connection: ddb.DuckDBPyConnection,
+    user_id: int,
+    start_date: str = None,
+    end_date: str = None,
+) -> dict:
+    """
+    Computes a user's entry statistics with a single aggregate query over the 'times' table.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_id (int): User id.
+        start_date (str): Optional first date (inclusive) formatted as YYYY-MM-DD.
+        end_date (str): Optional last date (inclusive) formatted as YYYY-MM-DD.
+
+    Returns:
+        dict: Total entries, entries (count & percentage) by event type, total balance, worked and expected minutes.
+    """
+    # GROUP BY ROLLUP yields one row per event type plus one grand total row (event_type NULL)
+    rows = connection.execute(
+        f"""
+        SELECT
+            event_type,
+            count(*) AS entries,
+            coalesce(sum(day_balance_minutes), 0) AS balance_minutes,
+            coalesce(sum(actual_total_minutes), 0) AS worked_minutes,
+            coalesce(sum(expected_total_minutes), 0) AS expected_minutes
+        FROM times
+        WHERE {build_entry_conditions(user_id, start_date, end_date)}
+        GROUP BY ROLLUP (event_type);
+        """
+    ).fetchall()
+    totals = next((row for row in rows if row[0] is None), (None, 0, 0, 0, 0))
+    counts = {row[0]: row[1] for row in rows if row[0] is not None}
+    return {
+        "total_entries": int(totals[1]),
+        "entries_by_event_type": {
+            event_type: {
+                "count": int(counts.get(event_type, 0)),
+                "percentage": (
+                    round(counts.get(event_type, 0) / totals[1] * 100)
+                    if totals[1] > 0
+                    else 0
+                ),
+            }
+            for event_type in EVENT_TYPES
+        },
+        "total_balance_minutes": int(totals[2]),
+        "total_worked_minutes": int(totals[3]),
+        "total_expected_minutes": int(totals[4]),
+    }
@@ -0,0 +1,168 @@
+# STANDARD LIBRARY IMPORTS
+import os
+import json
+import time
+import functools
+import threading
+import contextlib
+from datetime import datetime
+
+# UTIL IMPORTS
+from utils.config import LOG_PATH
+
+TRACE_ENV_VAR = "TEMPS_TRACE"
+# Span kinds, so a slow screen can be attributed to DuckDB, file writes or the user
+SPAN_KINDS = ["db", "prompt", "file"]
+
+_enabled = os.environ.get(TRACE_ENV_VAR, "") not in ["", "0"]
+_action = "STARTUP"
+_trace_file = None
+_lock = threading.Lock()
+
+
+def enable_tracing() -> None:
+    """
+    Enables tracing for this process and (via the environment) for its worker processes.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    global _enabled
+    os.environ[TRACE_ENV_VAR] = "1"
+    _enabled = True
+
+
+def is_tracing_enabled() -> bool:
+    """
+    Returns whether tracing is enabled.
+
+    Args:
+        None
+
+    Returns:
+        bool: True if spans are recorded.
+    """
+    return _enabled
+
+
+def set_action(action: str) -> None:
+    """
+    Sets the menu action (e.g. "ENTRY_NEW") that subsequent spans are tagged with.
+
+    Args:
+        action (str): Menu action or subcommand name.
+
+    Returns:
+        None
+    """
+    global _action
+    _action = action
+
+
+def get_action() -> str:
+    """
+    Returns the menu action that spans are currently tagged with.
+
+    Args:
+        None
+
+    Returns:
+        str: Menu action or subcommand name.
+    """
+    return _action
+
+
+def write_span(record: dict) -> None:
+    """
+    Appends a span record as a JSON line to this process' trace file under LOG_PATH.
+
+    Args:
+        record (dict): Span record.
+
+    Returns:
+        None
+    """
+    global _trace_file
+    with _lock:
+        if _trace_file is None:
+            os.makedirs(LOG_PATH, exist_ok=True)
+            # One file per process, batch export workers trace in parallel
+            _trace_file = open(
+                os.path.join(
+                    LOG_PATH,
+                    f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.jsonl",
+                ),
+                "a",
+                buffering=1,
+            )
+        _trace_file.write(json.dumps(record, default=str) + "\n")
+
+
+@contextlib.contextmanager
+def span(kind: str, name: str, **attributes) -> any:
+    """
+    Times the enclosed block as a span, if tracing is enabled.
+
+    Args:
+        kind (str): Span kind, one of SPAN_KINDS.
+        name (str): Span name, e.g. the traced function.
+        **attributes: Additional attributes to record with the span.
+
+    Returns:
+        any: Context manager.
+    """
+    if not _enabled:
+        yield
+        return
+    started_at = datetime.now()
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except BaseException as e:
+        status = type(e).__name__
+        raise e
+    finally:
+        write_span(
+            {
+                "started_at": started_at.isoformat(),
+                "action": _action,
+                "kind": kind,
+                "name": name,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                "status": status,
+                "pid": os.getpid(),
+                **attributes,
+            }
+        )
+
+
+def traced(kind: str, name: str = None) -> callable:
+    """
+    Decorator that records each call of the decorated function as a span.
+
+    Args:
+        kind (str): Span kind, one of SPAN_KINDS.
+        name (str): Span name, defaults to the qualified function name.
+
+    Returns:
+        callable: Decorator.
+    """
+
+    def decorator(function: callable) -> callable:
+        span_name = name or f"{function.__module__}.{function.__qualname__}"
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            # Fast path, no context manager overhead when tracing is disabled
+            if not _enabled:
+                return function(*args, **kwargs)
+            with span(kind, span_name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,309 @@
+# STANDARD LIBRARY IMPORTS
+import os
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+
+# THIRD PARTY IMPORTS
+import duckdb as ddb
+
+# UTIL IMPORTS
+from utils.tracing import traced
+from utils.config import RES_PATH, USER_CONFIG_FILE_NAME
+
+REQUIRED_CONFIG_KEYS = [
+    "name",
+    "start_date",
+    "weekly_work_minutes",
+    "work_days",
+    "daily_break_minutes",
+]
+# 'users' columns, in the order they are selected by load_config
+USER_COLUMNS = [
+    "user_id",
+    "name",
+    "start_date",
+    "weekly_work_minutes",
+    "work_days",
+    "daily_break_minutes",
+    "expected_daily_total_minutes",
+    "holiday_region",
+    "updated_at",
+]
+# Day names in date.weekday() order, bit i of a work day mask is set for WEEKDAYS[i]
+WEEKDAYS = [
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+]
+
+
+@dataclass(frozen=True)
+class UserConfig:
+    """
+    Typed, immutable configuration of a user, as loaded from the 'users' table.
+
+    Derived values are computed once when the configuration is loaded: the
+    start date is parsed, the work days are kept as a weekday bitmask and the
+    expected daily minutes are rounded to the whole minutes entries store.
+    Stored values are kept as they are, so saving a configuration loses no
+    precision. Being immutable, a configuration can be shared (e.g. with queued
+    writes) without copying. Edits go through as_dict and save_user.
+    """
+
+    user_id: int
+    name: str
+    start_date: date
+    weekly_work_minutes: float
+    work_days: tuple
+    daily_break_minutes: int
+    expected_daily_total_minutes: float
+    expected_entry_minutes: int
+    work_day_mask: int
+    holiday_region: str
+    updated_at: datetime
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "UserConfig":
+        """
+        Builds a configuration from a 'users' row.
+
+        Args:
+            row (tuple): Values of USER_COLUMNS.
+
+        Returns:
+            UserConfig: User configuration.
+        """
+        values = dict(zip(USER_COLUMNS, row))
+        return cls(
+            user_id=int(values["user_id"]),
+            name=values["name"],
+            start_date=values["start_date"],
+            weekly_work_minutes=float(values["weekly_work_minutes"]),
+            work_days=tuple(values["work_days"]),
+            daily_break_minutes=int(values["daily_break_minutes"]),
+            expected_daily_total_minutes=float(values["expected_daily_total_minutes"]),
+            expected_entry_minutes=round(values["expected_daily_total_minutes"]),
+            work_day_mask=sum(
+                1 << index
+                for index, day in enumerate(WEEKDAYS)
+                if day in values["work_days"]
+            ),
+            holiday_region=values["holiday_region"],
+            updated_at=values["updated_at"],
+        )
+
+    def is_work_day(self, day: date) -> bool:
+        """
+        Returns whether a date is a configured work day on or after the start date.
+
+        Args:
+            day (date): Date to check.
+
+        Returns:
+            bool: True if the date is a work day.
+        """
+        return day >= self.start_date and bool(self.work_day_mask >> day.weekday() & 1)
+
+    def as_dict(self) -> dict:
+        """
+        Returns the editable form of the configuration, as created by the config prompts and saved by save_user.
+
+        Args:
+            None
+
+        Returns:
+            dict: User configuration with the start date formatted as YYYY-MM-DD.
+        """
+        return {
+            "user_id": self.user_id,
+            "name": self.name,
+            "start_date": self.start_date.strftime("%Y-%m-%d"),
+            "weekly_work_minutes": self.weekly_work_minutes,
+            "work_days": list(self.work_days),
+            "daily_break_minutes": self.daily_break_minutes,
+            "expected_daily_total_minutes": self.expected_daily_total_minutes,
+            "holiday_region": self.holiday_region,
+        }
+
+
+# Configurations by user id, revalidated against 'users.updated_at', see get_config
+_config_cache = {}
+
+
+@traced("db")
+def list_users(connection: ddb.DuckDBPyConnection) -> list:
+    """
+    Returns all users ordered by name.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+
+    Returns:
+        list: (user_id, name) tuples.
+    """
+    return connection.execute(
+        "SELECT user_id, name FROM users ORDER BY name;"
+    ).fetchall()
+
+
+def resolve_user(connection: ddb.DuckDBPyConnection, name: str = None) -> int:
+    """
+    Resolves the user to work as. Without a name, the only existing user is used.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        name (str): Optional user name, e.g. from --user or TEMPS_USER.
+
+    Returns:
+        int: User id.
+    """
+    # Matched in Python, binding query parameters makes the DuckDB client import pandas
+    users = list_users(connection)
+    if name:
+        user_ids = [user_id for user_id, user_name in users if user_name == name]
+        if len(user_ids) == 0:
+            raise ValueError(f"Unknown user '{name}'.")
+        return user_ids[0]
+    if len(users) == 0:
+        raise ValueError(
+            "No users found. Run temps without arguments once to set it up."
+        )
+    if len(users) > 1:
+        raise ValueError(
+            "Multiple users exist. Select one with --user or the TEMPS_USER environment variable."
+        )
+    return users[0][0]
+
+
+@traced("db")
+def load_config(connection: ddb.DuckDBPyConnection, user_id: int) -> UserConfig:
+    """
+    Reads the configuration of a user from the 'users' table.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_id (int): User id.
+
+    Returns:
+        UserConfig: User configuration.
+    """
+    row = connection.execute(
+        f"SELECT {', '.join(USER_COLUMNS)} FROM users WHERE user_id = {int(user_id)};"
+    ).fetchone()
+    if row is None:
+        raise ValueError(f"User {user_id} does not exist.")
+    return UserConfig.from_row(row)
+
+
+@traced("db")
+def get_config(connection: ddb.DuckDBPyConnection, user_id: int) -> UserConfig:
+    """
+    Returns the configuration of a user, built once and only rebuilt after the user was updated.
+    Long-lived processes use this instead of load_config.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        user_id (int): User id.
+
+    Returns:
+        UserConfig: User configuration.
+    """
+    row = connection.execute(
+        f"SELECT updated_at FROM users WHERE user_id = {int(user_id)};"
+    ).fetchone()
+    if row is None:
+        raise ValueError(f"User {user_id} does not exist.")
+    config = _config_cache.get(int(user_id))
+    if config is None or config.updated_at != row[0]:
+        config = load_config(connection, user_id)
+        _config_cache[int(user_id)] = config
+    return config
+
+
+@traced("db")
+def save_user(connection: ddb.DuckDBPyConnection, config: dict) -> int:
+    """
+    Saves a user configuration. Configurations with a 'user_id' update that user, all others create a new user.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        config (dict): User configuration to save.
+
+    Returns:
+        int: User id.
+    """
+    columns = {
+        "name": config["name"],
+        "start_date": config["start_date"],
+        "weekly_work_minutes": float(config["weekly_work_minutes"]),
+        "work_days": list(config["work_days"]),
+        "daily_break_minutes": int(config["daily_break_minutes"]),
+        "expected_daily_total_minutes": float(config["expected_daily_total_minutes"]),
+    }
+    # Legacy json configs have no holiday region and are imported before schema version 5
+    if "holiday_region" in config:
+        columns["holiday_region"] = config["holiday_region"]
+    if config.get("user_id") is not None:
+        connection.execute(
+            f"""
+            UPDATE users
+            SET
+                {", ".join(f"{column} = ?" for column in columns)},
+                updated_at = CURRENT_TIMESTAMP
+            WHERE user_id = ?;
+            """,
+            list(columns.values()) + [int(config["user_id"])],
+        )
+        return int(config["user_id"])
+    return connection.execute(
+        f"""
+        INSERT INTO users ({", ".join(columns)}, created_at, updated_at)
+        VALUES ({", ".join("?" for _ in columns)}, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+        RETURNING user_id;
+        """,
+        list(columns.values()),
+    ).fetchone()[0]
+
+
+def import_legacy_config(
+    connection: ddb.DuckDBPyConnection, rename_file: bool = True
+) -> int:
+    """
+    Imports the user_config.json of a single-user installation as a user.
+    Once imported, the file is renamed to user_config.json.migrated and no longer read.
+
+    Args:
+        connection (ddb.DuckDBPyConnection): Connection to the DuckDB database.
+        rename_file (bool): Whether to rename the json file after importing it.
+
+    Returns:
+        int: User id of the imported user, None if there is no json file.
+    """
+    file_path = os.path.join(RES_PATH, USER_CONFIG_FILE_NAME)
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, "r") as f:
+        config = json.load(f)
+    # Check if all required fields are present in the config
+    if not all(key in config for key in REQUIRED_CONFIG_KEYS):
+        raise ValueError(
+            "User config file is missing required fields. Please delete the config file and re-launch the program."
+        )
+    config.setdefault(
+        "expected_daily_total_minutes",
+        config["weekly_work_minutes"] / len(config["work_days"])
+        + config["daily_break_minutes"],
+    )
+    # Re-running the import (e.g. after an interrupted rename) must not duplicate the user
+    existing = [
+        user_id for user_id, name in list_users(connection) if name == config["name"]
+    ]
+    user_id = existing[0] if len(existing) > 0 else save_user(connection, config)
+    if rename_file:
+        os.replace(file_path, file_path + ".migrated")
+    return user_id
@@ -0,0 +1,189 @@
+# STANDARD LIBRARY IMPORTS
+import queue
+import threading
+import traceback
+
+# UTIL IMPORTS
+from utils.db import DatabaseSession
+from utils.entries import write_entries
+from utils.user_config import UserConfig
+
+# Maximum number of queued writes applied in a single transaction
+WRITE_BATCH_SIZE = 100
+
+
+class EntryWriter:
+    """
+    Write-behind queue for entry inserts and updates.
+
+    Validated writes are queued by the prompt loop and applied by a single
+    daemon writer thread on its own cursor of the database session, so the
+    next prompt never waits on a transaction. Whatever has queued up while a
+    transaction ran is applied as one batch in the next transaction. If a
+    batch fails, its writes are retried one by one, so a single bad write
+    neither loses nor blocks the others; failed writes are collected for the
+    prompt loop to report. Reads have to flush the queue first to see
+    their own writes.
+    """
+
+    def __init__(
+        self, session: DatabaseSession, batch_size: int = WRITE_BATCH_SIZE
+    ) -> None:
+        """
+        Creates a new, idle entry writer.
+
+        Args:
+            session (DatabaseSession): Database session to write to.
+            batch_size (int): Maximum number of writes per transaction.
+
+        Returns:
+            None
+        """
+        self._session = session
+        self._batch_size = batch_size
+        self._queue = queue.Queue()
+        self._failures = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(
+        self,
+        operation: str,
+        date: str,
+        event_type: str,
+        clock_in: str,
+        clock_out: str,
+        config: UserConfig,
+    ) -> None:
+        """
+        Queues an entry write and returns immediately.
+
+        Args:
+            operation (str): "insert" for new entries, "update" for existing entries.
+            date (str): Entry date formatted as YYYY-MM-DD.
+            event_type (str): Event type, one of EVENT_TYPES.
+            clock_in (str): Clock in time formatted as HH:MM (Work entries only).
+            clock_out (str): Clock out time formatted as HH:MM (Work entries only).
+            config (UserConfig): User configuration of the user the entry belongs to.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="entry-writer", daemon=True
+                )
+                self._thread.start()
+        self._queue.put(
+            {
+                "operation": operation,
+                "date": date,
+                "event_type": event_type,
+                "clock_in": clock_in,
+                "clock_out": clock_out,
+                "config": config,
+            }
+        )
+
+    def flush(self) -> None:
+        """
+        Blocks until all queued writes have been applied (or have failed).
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self._queue.join()
+
+    def pop_failures(self) -> list:
+        """
+        Returns and clears the writes that failed since the last call.
+
+        Args:
+            None
+
+        Returns:
+            list: (write, error message, traceback) tuples, in the order the writes failed.
+        """
+        with self._lock:
+            failures = self._failures
+            self._failures = []
+            return failures
+
+    def _run(self) -> None:
+        """
+        Loop of the writer thread.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        while True:
+            # Wait for a write, then take whatever else has queued up meanwhile
+            batch = [self._queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._apply(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _apply(self, batch: list) -> None:
+        """
+        Applies a batch of writes in one transaction, falling back to one transaction per write.
+
+        Args:
+            batch (list): Queued writes.
+
+        Returns:
+            None
+        """
+        try:
+            connection = self._session.cursor()
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        try:
+            try:
+                write_entries(connection, batch)
+                return
+            except Exception as e:
+                if len(batch) == 1:
+                    self._fail(batch, e)
+                    return
+            # Isolate the failing write(s), the others are still applied
+            for write in batch:
+                try:
+                    write_entries(connection, [write])
+                except Exception as e:
+                    self._fail([write], e)
+        finally:
+            connection.close()
+
+    def _fail(self, writes: list, error: Exception) -> None:
+        """
+        Records failed writes for the prompt loop to report.
+
+        Args:
+            writes (list): Writes that failed.
+            error (Exception): Error they failed with.
+
+        Returns:
+            None
+        """
+        details = "".join(
+            traceback.format_exception(type(error), error, error.__traceback__)
+        )
+        with self._lock:
+            self._failures.extend(
+                (write, f"{type(error).__name__}: {error}", details) for write in writes
+            )